@@ -0,0 +1,87 @@
+"""partition expenses and income by user_id hash
+
+Revision ID: 004
+Revises: 003
+Create Date: 2024-12-12 12:00:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '004'
+down_revision = '003'
+branch_labels = None
+depends_on = None
+
+PARTITIONS = 16
+
+# table -> (column definitions, indexed columns)
+TABLES = {
+    'expenses': (
+        """
+        id VARCHAR(36) NOT NULL,
+        user_id VARCHAR(36) NOT NULL REFERENCES users(id),
+        amount NUMERIC(12, 2) NOT NULL,
+        currency VARCHAR(3),
+        category VARCHAR(100) NOT NULL,
+        merchant VARCHAR(255) NOT NULL,
+        description TEXT,
+        expense_date DATE NOT NULL,
+        source VARCHAR(50),
+        source_id VARCHAR(255),
+        created_at TIMESTAMP,
+        updated_at TIMESTAMP,
+        PRIMARY KEY (id, user_id)
+        """,
+        ['user_id', 'category', 'expense_date'],
+    ),
+    'income': (
+        """
+        id VARCHAR(36) NOT NULL,
+        user_id VARCHAR(36) NOT NULL REFERENCES users(id),
+        amount NUMERIC(12, 2) NOT NULL,
+        currency VARCHAR(3),
+        source VARCHAR(255) NOT NULL,
+        category VARCHAR(100),
+        description TEXT,
+        income_date DATE NOT NULL,
+        created_at TIMESTAMP,
+        updated_at TIMESTAMP,
+        PRIMARY KEY (id, user_id)
+        """,
+        ['user_id', 'income_date'],
+    ),
+}
+
+
+def _rebuild(table: str, columns: str, indexes: list, partitioned: bool) -> None:
+    """Recreate a table (optionally hash-partitioned) and copy its rows over."""
+    op.execute(f'ALTER TABLE {table} RENAME TO {table}_old')
+    for column in indexes:
+        op.execute(f'DROP INDEX IF EXISTS ix_{table}_{column}')
+
+    if partitioned:
+        op.execute(f'CREATE TABLE {table} ({columns}) PARTITION BY HASH (user_id)')
+        for remainder in range(PARTITIONS):
+            op.execute(
+                f'CREATE TABLE {table}_p{remainder} PARTITION OF {table} '
+                f'FOR VALUES WITH (modulus {PARTITIONS}, remainder {remainder})'
+            )
+    else:
+        op.execute(f'CREATE TABLE {table} ({columns.replace("PRIMARY KEY (id, user_id)", "PRIMARY KEY (id)")})')
+
+    op.execute(f'INSERT INTO {table} SELECT * FROM {table}_old')
+    op.execute(f'DROP TABLE {table}_old')
+
+    for column in indexes:
+        op.create_index(f'ix_{table}_{column}', table, [column])
+
+
+def upgrade() -> None:
+    for table, (columns, indexes) in TABLES.items():
+        _rebuild(table, columns, indexes, partitioned=True)
+
+
+def downgrade() -> None:
+    for table, (columns, indexes) in TABLES.items():
+        _rebuild(table, columns, indexes, partitioned=False)
@@ -0,0 +1,41 @@
+"""store money columns as bigint cents
+
+Revision ID: 005
+Revises: 004
+Create Date: 2024-12-13 12:00:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '005'
+down_revision = '004'
+branch_labels = None
+depends_on = None
+
+MONEY_COLUMNS = [
+    ('expenses', 'amount'),
+    ('income', 'amount'),
+    ('bills', 'amount'),
+    ('goals', 'target_amount'),
+    ('goals', 'current_amount'),
+    ('accounts', 'current_balance'),
+    ('payments', 'amount'),
+    ('subscriptions', 'amount'),
+]
+
+
+def upgrade() -> None:
+    for table, column in MONEY_COLUMNS:
+        op.execute(
+            f'ALTER TABLE {table} ALTER COLUMN {column} TYPE BIGINT '
+            f'USING round({column} * 100)::bigint'
+        )
+
+
+def downgrade() -> None:
+    for table, column in MONEY_COLUMNS:
+        op.execute(
+            f'ALTER TABLE {table} ALTER COLUMN {column} TYPE NUMERIC(12, 2) '
+            f'USING ({column}::numeric / 100)'
+        )
@@ -0,0 +1,47 @@
+"""stamp created/updated timestamps server-side
+
+Revision ID: 006
+Revises: 005
+Create Date: 2024-12-14 12:00:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '006'
+down_revision = '005'
+branch_labels = None
+depends_on = None
+
+TIMESTAMP_COLUMNS = [
+    ('users', 'created_at'),
+    ('users', 'updated_at'),
+    ('expenses', 'created_at'),
+    ('expenses', 'updated_at'),
+    ('income', 'created_at'),
+    ('income', 'updated_at'),
+    ('subscriptions', 'created_at'),
+    ('subscriptions', 'updated_at'),
+    ('bills', 'created_at'),
+    ('bills', 'updated_at'),
+    ('goals', 'created_at'),
+    ('goals', 'updated_at'),
+    ('documents', 'created_at'),
+    ('documents', 'updated_at'),
+    ('payments', 'created_at'),
+    ('accounts', 'created_at'),
+    ('accounts', 'last_updated'),
+]
+
+
+def upgrade() -> None:
+    for table, column in TIMESTAMP_COLUMNS:
+        op.execute(
+            f"ALTER TABLE {table} ALTER COLUMN {column} "
+            f"SET DEFAULT timezone('utc', now())"
+        )
+
+
+def downgrade() -> None:
+    for table, column in TIMESTAMP_COLUMNS:
+        op.execute(f'ALTER TABLE {table} ALTER COLUMN {column} DROP DEFAULT')
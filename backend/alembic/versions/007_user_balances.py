@@ -0,0 +1,100 @@
+"""keep per-user balance totals in a trigger-maintained table
+
+Revision ID: 007
+Revises: 006
+Create Date: 2024-12-15 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '007'
+down_revision = '006'
+branch_labels = None
+depends_on = None
+
+MONEY_TABLES = ['income', 'expenses']
+
+TRACK_USER_BALANCE = """
+CREATE OR REPLACE FUNCTION track_user_balance() RETURNS trigger
+LANGUAGE plpgsql AS $$
+DECLARE
+    is_income BOOLEAN := TG_ARGV[0] = 'income';
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        INSERT INTO user_balances AS b (user_id, total_income, total_expenses)
+        VALUES (
+            OLD.user_id,
+            CASE WHEN is_income THEN -OLD.amount ELSE 0 END,
+            CASE WHEN is_income THEN 0 ELSE -OLD.amount END
+        )
+        ON CONFLICT (user_id) DO UPDATE SET
+            total_income = b.total_income + EXCLUDED.total_income,
+            total_expenses = b.total_expenses + EXCLUDED.total_expenses;
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        INSERT INTO user_balances AS b (user_id, total_income, total_expenses)
+        VALUES (
+            NEW.user_id,
+            CASE WHEN is_income THEN NEW.amount ELSE 0 END,
+            CASE WHEN is_income THEN 0 ELSE NEW.amount END
+        )
+        ON CONFLICT (user_id) DO UPDATE SET
+            total_income = b.total_income + EXCLUDED.total_income,
+            total_expenses = b.total_expenses + EXCLUDED.total_expenses;
+    END IF;
+    RETURN NULL;
+END
+$$
+"""
+
+
+def upgrade() -> None:
+    # init_db (create_all) may already have created the table, possibly
+    # without the triggers, so only create it when missing
+    if not sa.inspect(op.get_bind()).has_table('user_balances'):
+        op.create_table(
+            'user_balances',
+            sa.Column('user_id', sa.String(length=36), nullable=False),
+            sa.Column('total_income', sa.BigInteger(), nullable=False, server_default='0'),
+            sa.Column('total_expenses', sa.BigInteger(), nullable=False, server_default='0'),
+            sa.PrimaryKeyConstraint('user_id'),
+            sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        )
+
+    # Block writes until the triggers exist and the totals are backfilled,
+    # so no row is counted twice or missed. The backfill overwrites any
+    # totals already in the table with the true sums
+    op.execute('LOCK TABLE income, expenses IN SHARE MODE')
+    op.execute(TRACK_USER_BALANCE)
+    for table in MONEY_TABLES:
+        op.execute(f'DROP TRIGGER IF EXISTS {table}_user_balance ON {table}')
+        op.execute(
+            f"CREATE TRIGGER {table}_user_balance "
+            f"AFTER INSERT OR UPDATE OF amount, user_id OR DELETE ON {table} "
+            f"FOR EACH ROW EXECUTE FUNCTION track_user_balance('{table}')"
+        )
+
+    op.execute("""
+        INSERT INTO user_balances (user_id, total_income, total_expenses)
+        SELECT u.id,
+               COALESCE(i.total, 0),
+               COALESCE(e.total, 0)
+        FROM users u
+        LEFT JOIN (SELECT user_id, SUM(amount) AS total FROM income GROUP BY user_id) i
+            ON i.user_id = u.id
+        LEFT JOIN (SELECT user_id, SUM(amount) AS total FROM expenses GROUP BY user_id) e
+            ON e.user_id = u.id
+        WHERE i.total IS NOT NULL OR e.total IS NOT NULL
+        ON CONFLICT (user_id) DO UPDATE SET
+            total_income = EXCLUDED.total_income,
+            total_expenses = EXCLUDED.total_expenses
+    """)
+
+
+def downgrade() -> None:
+    for table in MONEY_TABLES:
+        op.execute(f'DROP TRIGGER IF EXISTS {table}_user_balance ON {table}')
+    op.execute('DROP FUNCTION IF EXISTS track_user_balance()')
+    op.drop_table('user_balances')
@@ -9,12 +9,10 @@ from fastapi.responses import JSONResponse
 import logging
 
 from src.config.settings import settings
+from src.config.logging import configure_logging
 
 # Configure logging
-logging.basicConfig(
-    level=logging.INFO if not settings.debug else logging.DEBUG,
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-)
+configure_logging(level=logging.INFO if not settings.debug else logging.DEBUG)
 logger = logging.getLogger(__name__)
 
 
@@ -44,7 +42,7 @@ async def lifespan(app: FastAPI):
     try:
         from src.infrastructure.database.qdrant_client import qdrant_client
         qdrant_client.connect()
-        qdrant_client.ensure_collection()
+        await qdrant_client.ensure_collection()
         logger.info("✅ Qdrant vector database connected")
     except Exception as e:
         logger.warning(f"⚠️ Qdrant not available: {e}")
@@ -89,13 +87,39 @@ async def lifespan(app: FastAPI):
     
     try:
         from src.infrastructure.database.qdrant_client import qdrant_client
-        qdrant_client.disconnect()
+        await qdrant_client.disconnect()
     except:
         pass
     
     try:
         from src.infrastructure.database.neo4j_client import neo4j_driver
-        neo4j_driver.disconnect()
+        await neo4j_driver.disconnect()
+    except:
+        pass
+    
+    try:
+        from src.infrastructure.llm.llm_factory import llm_factory
+        from src.infrastructure.llm._http import close_shared_client
+        await llm_factory.close()
+        await close_shared_client()
+    except:
+        pass
+    
+    try:
+        from src.interfaces.api.routes.auth import close_google_client
+        await close_google_client()
+    except:
+        pass
+    
+    try:
+        from src.application.services.document_service import shutdown_process_pool
+        shutdown_process_pool()
+    except:
+        pass
+    
+    try:
+        from src.application.services.analytics_service import shutdown_thread_pool
+        shutdown_thread_pool()
     except:
         pass
     
@@ -0,0 +1,129 @@
+"""
+Analytics Service
+Spending aggregation over integer cents with NumPy (and Numba when installed)
+"""
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+from typing import Any, Dict, List, Optional, Sequence
+from datetime import date
+import asyncio
+
+import numpy as np
+from sqlalchemy import BigInteger, select, func, type_coerce
+
+from src.infrastructure.database.postgres import async_session_factory
+from src.infrastructure.database.types import Cents, from_cents
+from src.domain.models import Income, Expense
+
+try:
+    from numba import njit
+except ImportError:  # optional: JIT-compiled grouping, np.bincount otherwise
+    njit = None
+
+# Summaries over more rows than this are aggregated on a worker thread so
+# the event loop keeps serving other requests (the Numba kernel is nogil)
+INLINE_AGGREGATE_MAX_ROWS = 10_000
+
+_thread_pool: Optional[ThreadPoolExecutor] = None
+
+
+def _get_thread_pool() -> ThreadPoolExecutor:
+    """Get the aggregation thread pool, created on first use."""
+    global _thread_pool
+    if _thread_pool is None:
+        _thread_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="analytics")
+    return _thread_pool
+
+
+def shutdown_thread_pool():
+    """Shut down the aggregation thread pool; called at application shutdown."""
+    global _thread_pool
+    if _thread_pool is not None:
+        _thread_pool.shutdown(cancel_futures=True)
+        _thread_pool = None
+
+
+if njit is not None:
+    @njit(cache=True, nogil=True)
+    def sum_by_group(cents: np.ndarray, group_ids: np.ndarray, n_groups: int) -> np.ndarray:
+        """Sum int64 cents per group id (0 .. n_groups-1)."""
+        # Serial on purpose: a prange loop would race on out[group_ids[i]]
+        out = np.zeros(n_groups, dtype=np.int64)
+        for i in range(cents.size):
+            out[group_ids[i]] += cents[i]
+        return out
+else:
+    def sum_by_group(cents: np.ndarray, group_ids: np.ndarray, n_groups: int) -> np.ndarray:
+        """Sum int64 cents per group id (0 .. n_groups-1)."""
+        # bincount sums in float64, exact for totals below 2**53 cents
+        totals = np.bincount(group_ids, weights=cents, minlength=n_groups)
+        return np.rint(totals).astype(np.int64)
+
+
+def group_totals(cents: np.ndarray, labels: List[str]) -> Dict[str, Decimal]:
+    """Total cents per label, dict-encoding the labels to dense int32 ids."""
+    index: Dict[str, int] = {}
+    group_ids = np.fromiter(
+        (index.setdefault(label, len(index)) for label in labels),
+        dtype=np.int32,
+        count=len(labels),
+    )
+    totals = sum_by_group(cents, group_ids, len(index))
+    return {label: from_cents(totals[i]) for label, i in index.items()}
+
+
+def summarize(rows: Sequence[Sequence[Any]], income_cents: int) -> Dict:
+    """Spending summary from (cents, category, merchant) rows."""
+    cents = np.fromiter((row[0] for row in rows), dtype=np.int64, count=len(rows))
+    spent_cents = Cents(int(cents.sum()))
+    
+    return {
+        "total_spent": from_cents(spent_cents),
+        "total_income": from_cents(income_cents),
+        "net": from_cents(income_cents - spent_cents),
+        "by_category": group_totals(cents, [row[1] for row in rows]),
+        "by_merchant": group_totals(cents, [row[2] for row in rows]),
+        "trends": [],
+    }
+
+
+class AnalyticsService:
+    """Spending analytics computed from expense and income records."""
+    
+    @staticmethod
+    async def get_spending_summary(
+        user_id: str,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+    ) -> Dict:
+        """
+        Get spending totals with per-category and per-merchant breakdowns.
+        
+        Amounts are read as the raw BIGINT cents behind the Money column
+        and aggregated as int64; Decimals are only built for the result.
+        """
+        expense_query = select(
+            type_coerce(Expense.amount, BigInteger),
+            Expense.category,
+            Expense.merchant,
+        ).where(Expense.user_id == user_id)
+        income_query = select(
+            func.coalesce(func.sum(type_coerce(Income.amount, BigInteger)), 0)
+        ).where(Income.user_id == user_id)
+        
+        if start_date:
+            expense_query = expense_query.where(Expense.expense_date >= start_date)
+            income_query = income_query.where(Income.income_date >= start_date)
+        if end_date:
+            expense_query = expense_query.where(Expense.expense_date <= end_date)
+            income_query = income_query.where(Income.income_date <= end_date)
+        
+        async with async_session_factory() as session:
+            rows = (await session.execute(expense_query)).all()
+            income_cents = Cents(int((await session.execute(income_query)).scalar()))
+        
+        if len(rows) <= INLINE_AGGREGATE_MAX_ROWS:
+            return summarize(rows, income_cents)
+        
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_get_thread_pool(), summarize, rows, income_cents)
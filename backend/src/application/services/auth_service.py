@@ -6,6 +6,7 @@ from datetime import datetime, timedelta
 from typing import Optional, Dict, Any
 import uuid
 
+from cachetools import TTLCache
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from sqlalchemy import select
@@ -22,6 +23,10 @@ pwd_context = CryptContext(
     bcrypt__ident="2b"
 )
 
+# User records by ID; profiles change rarely, so a short TTL keeps
+# authenticated requests off the database
+_user_cache: TTLCache = TTLCache(maxsize=50_000, ttl=30)
+
 
 class AuthService:
     """Service for authentication operations."""
@@ -220,6 +225,7 @@ class AuthService:
             
             user.last_login_at = datetime.utcnow()
             await session.commit()
+            _user_cache.pop(user.id, None)
             
             return {
                 "id": user.id,
@@ -231,7 +237,11 @@ class AuthService:
             }
     
     async def get_user_by_id(self, user_id: str) -> Optional[Dict[str, Any]]:
-        """Get user by ID."""
+        """Get user by ID (cached for a few seconds)."""
+        cached = _user_cache.get(user_id)
+        if cached is not None:
+            return dict(cached)
+        
         from src.infrastructure.database.postgres import async_session_factory
         from src.domain.models.user import User
         
@@ -244,7 +254,7 @@ class AuthService:
             if not user:
                 return None
             
-            return {
+            record = {
                 "id": user.id,
                 "email": user.email,
                 "name": user.name,
@@ -253,6 +263,8 @@ class AuthService:
                 "gmail_connected": bool(user.google_refresh_token),
                 "created_at": user.created_at.isoformat() if user.created_at else None,
             }
+            _user_cache[user_id] = record
+            return dict(record)
     
     async def refresh_access_token(self, refresh_token: str) -> Optional[str]:
         """Refresh access token using refresh token."""
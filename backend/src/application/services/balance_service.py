@@ -2,16 +2,16 @@
 Balance Service - Single Source of Truth
 Centralized balance calculation with Redis caching
 """
-from decimal import Decimal
 from typing import Dict, Optional
 from datetime import date, datetime
-import json
+import orjson
 
-from sqlalchemy import select, func
+from sqlalchemy import BigInteger, Select, select, func, type_coerce
 
 from src.infrastructure.database.postgres import async_session_factory
 from src.infrastructure.database.redis_client import redis_client
-from src.domain.models import Income, Expense
+from src.domain.models import Income, Expense, UserBalance
+from src.infrastructure.database.types import Cents, from_cents
 
 
 class BalanceService:
@@ -53,68 +53,90 @@ class BalanceService:
         # Try cache first
         if use_cache:
             try:
-                cached = await redis_client.get(cache_key)
+                cached = await redis_client.get_bytes(cache_key)
                 if cached:
-                    # Parse cached JSON
-                    if isinstance(cached, str):
-                        return json.loads(cached)
-                    return cached
+                    result = orjson.loads(cached)
+                    result["cached"] = True
+                    return result
             except Exception:
                 pass  # Cache miss or error, continue to database
         
-        # Calculate from database
+        # All-time totals are a primary-key lookup on the trigger-maintained
+        # user_balances row; date ranges sum both tables in one round trip.
+        # Amounts stay integer cents until the result is built
+        if start_date is None and end_date is None:
+            totals_query = select(
+                UserBalance.total_income.label("income"),
+                UserBalance.total_expenses.label("expenses"),
+            ).where(UserBalance.user_id == user_id)
+        else:
+            totals_query = BalanceService._range_totals_query(user_id, start_date, end_date)
+        
         async with async_session_factory() as session:
-            # Build income query
-            income_query = select(func.sum(Income.amount)).where(
-                Income.user_id == user_id
-            )
-            if start_date:
-                income_query = income_query.where(Income.income_date >= start_date)
-            if end_date:
-                income_query = income_query.where(Income.income_date <= end_date)
-            
-            income_result = await session.execute(income_query)
-            total_income = income_result.scalar() or Decimal("0")
-            
-            # Build expense query
-            expense_query = select(func.sum(Expense.amount)).where(
-                Expense.user_id == user_id
-            )
-            if start_date:
-                expense_query = expense_query.where(Expense.expense_date >= start_date)
-            if end_date:
-                expense_query = expense_query.where(Expense.expense_date <= end_date)
-            
-            expense_result = await session.execute(expense_query)
-            total_expenses = expense_result.scalar() or Decimal("0")
-            
-            # Calculate balance
-            balance = total_income - total_expenses
-            
-            # Build result
-            result = {
-                "balance": float(balance),
-                "total_income": float(total_income),
-                "total_expenses": float(total_expenses),
-                "currency": "USD",
-                "calculated_at": datetime.utcnow().isoformat(),
-                "start_date": start_date.isoformat() if start_date else None,
-                "end_date": end_date.isoformat() if end_date else None,
-                "cached": False,
-            }
-            
-            # Cache result
-            if use_cache:
-                try:
-                    await redis_client.set(
-                        cache_key,
-                        json.dumps(result),
-                        ex=BalanceService.CACHE_TTL
-                    )
-                except Exception:
-                    pass  # Cache write failed, but we have the result
-            
-            return result
+            totals = (await session.execute(totals_query)).one_or_none()
+            if totals is None:
+                # No user_balances row: either nothing was recorded yet or the
+                # balance triggers are not installed (migration 007 not run),
+                # so sum the tables rather than report a zero balance
+                totals = (
+                    await session.execute(BalanceService._range_totals_query(user_id, None, None))
+                ).one()
+        
+        total_income = Cents(int(totals.income))
+        total_expenses = Cents(int(totals.expenses))
+        
+        # Calculate balance
+        balance = Cents(total_income - total_expenses)
+        
+        # Build result
+        result = {
+            "balance": float(from_cents(balance)),
+            "total_income": float(from_cents(total_income)),
+            "total_expenses": float(from_cents(total_expenses)),
+            "currency": "USD",
+            "calculated_at": datetime.utcnow().isoformat(),
+            "start_date": start_date.isoformat() if start_date else None,
+            "end_date": end_date.isoformat() if end_date else None,
+            "cached": False,
+        }
+        
+        # Cache result
+        if use_cache:
+            try:
+                await redis_client.set_bytes(
+                    cache_key,
+                    orjson.dumps(result),
+                    expire=BalanceService.CACHE_TTL
+                )
+            except Exception:
+                pass  # Cache write failed, but we have the result
+        
+        return result
+    
+    @staticmethod
+    def _range_totals_query(
+        user_id: str,
+        start_date: Optional[date],
+        end_date: Optional[date],
+    ) -> Select:
+        """Income and expense cent totals within a date range, as one SELECT."""
+        income_query = select(
+            func.coalesce(func.sum(type_coerce(Income.amount, BigInteger)), 0)
+        ).where(Income.user_id == user_id)
+        expense_query = select(
+            func.coalesce(func.sum(type_coerce(Expense.amount, BigInteger)), 0)
+        ).where(Expense.user_id == user_id)
+        if start_date:
+            income_query = income_query.where(Income.income_date >= start_date)
+            expense_query = expense_query.where(Expense.expense_date >= start_date)
+        if end_date:
+            income_query = income_query.where(Income.income_date <= end_date)
+            expense_query = expense_query.where(Expense.expense_date <= end_date)
+        
+        return select(
+            income_query.scalar_subquery().label("income"),
+            expense_query.scalar_subquery().label("expenses"),
+        )
     
     @staticmethod
     async def invalidate_cache(user_id: str):
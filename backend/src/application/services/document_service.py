@@ -2,8 +2,11 @@
 Document Processing Service
 Handles document upload, text extraction, chunking, and vector storage
 """
-from typing import Optional, List, Dict, Any, BinaryIO
+from typing import Optional, List, Dict, Any, BinaryIO, Tuple
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 from datetime import datetime
+import asyncio
 import uuid
 import os
 import tempfile
@@ -15,8 +18,204 @@ from docx import Document as DocxDocument
 import pandas as pd
 import openpyxl
 
+try:
+    import pypdfium2 as pdfium
+except ImportError:  # optional: native pdfium text extraction, PyPDF2 otherwise
+    pdfium = None
+
 from src.config.settings import settings
 
+# Files up to this size are parsed inline; larger ones go to the process pool
+# so CPU-bound parsing does not stall the event loop
+INLINE_EXTRACT_MAX_BYTES = 256 * 1024
+
+_process_pool: Optional[ProcessPoolExecutor] = None
+
+
+def _get_process_pool() -> ProcessPoolExecutor:
+    """Get the extraction process pool, created on first use."""
+    global _process_pool
+    if _process_pool is None:
+        _process_pool = ProcessPoolExecutor(max_workers=os.cpu_count())
+    return _process_pool
+
+
+def shutdown_process_pool():
+    """Shut down the extraction process pool; called at application shutdown."""
+    global _process_pool
+    if _process_pool is not None:
+        _process_pool.shutdown(cancel_futures=True)
+        _process_pool = None
+
+
+def _extract_text(file_path: str, content_type: str) -> str:
+    """Extract text from different file types."""
+    
+    # PDF
+    if content_type == "application/pdf":
+        return _extract_pdf_text(file_path)
+    
+    # DOCX
+    elif content_type == "application/vnd.openxmlformats-officedocument.wordprocessingml.document":
+        return _extract_docx_text(file_path)
+    
+    # Excel
+    elif content_type in [
+        "application/vnd.ms-excel",
+        "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+    ]:
+        return _extract_excel_text(file_path)
+    
+    # CSV
+    elif content_type == "text/csv":
+        return _extract_csv_text(file_path)
+    
+    # Plain text
+    elif content_type == "text/plain":
+        return Path(file_path).read_text(encoding="utf-8", errors="ignore")
+    
+    else:
+        raise ValueError(f"Unsupported content type: {content_type}")
+
+
+def _extract_pdf_text(file_path: str) -> str:
+    """Extract text from PDF (pdfium when installed, PyPDF2 otherwise)."""
+    text_parts = []
+    
+    try:
+        if pdfium is not None:
+            for page_num, text in enumerate(_iter_pdfium_pages(file_path)):
+                if text:
+                    text_parts.append(f"--- Page {page_num + 1} ---\n{text}")
+            return "\n\n".join(text_parts)
+        
+        pdf_reader = PyPDF2.PdfReader(file_path)
+        
+        for page_num in range(len(pdf_reader.pages)):
+            page = pdf_reader.pages[page_num]
+            text = page.extract_text()
+            if text:
+                text_parts.append(f"--- Page {page_num + 1} ---\n{text}")
+        
+        return "\n\n".join(text_parts)
+        
+    except Exception as e:
+        raise ValueError(f"Failed to extract PDF text: {str(e)}")
+
+
+def _iter_pdfium_pages(file_path: str):
+    """Yield each page's text using pdfium's C++ text layer."""
+    pdf = pdfium.PdfDocument(file_path)
+    try:
+        for page in pdf:
+            textpage = page.get_textpage()
+            try:
+                yield textpage.get_text_bounded()
+            finally:
+                textpage.close()
+                page.close()
+    finally:
+        pdf.close()
+
+
+def _extract_docx_text(file_path: str) -> str:
+    """Extract text from DOCX."""
+    try:
+        doc = DocxDocument(file_path)
+        paragraphs = [p.text for p in doc.paragraphs if p.text.strip()]
+        return "\n\n".join(paragraphs)
+        
+    except Exception as e:
+        raise ValueError(f"Failed to extract DOCX text: {str(e)}")
+
+
+def _extract_excel_text(file_path: str) -> str:
+    """Extract text from Excel file."""
+    try:
+        # Try pandas first
+        df = pd.read_excel(file_path, sheet_name=None)
+        
+        text_parts = []
+        for sheet_name, sheet_df in df.items():
+            text_parts.append(f"=== Sheet: {sheet_name} ===")
+            text_parts.append(sheet_df.to_string(index=False))
+        
+        return "\n\n".join(text_parts)
+        
+    except Exception as e:
+        raise ValueError(f"Failed to extract Excel text: {str(e)}")
+
+
+def _extract_csv_text(file_path: str) -> str:
+    """Extract text from CSV."""
+    try:
+        df = pd.read_csv(file_path)
+        return df.to_string(index=False)
+        
+    except Exception as e:
+        raise ValueError(f"Failed to extract CSV text: {str(e)}")
+
+
+def chunk_text(
+    text: str,
+    chunk_size: int = 1000,
+    overlap: int = 200,
+) -> List[str]:
+    """
+    Split text into overlapping chunks for vector storage.
+    
+    Args:
+        text: Full text content
+        chunk_size: Maximum characters per chunk
+        overlap: Overlap between chunks
+    
+    Returns:
+        List of text chunks
+    """
+    chunks = []
+    start = 0
+    text_length = len(text)
+    
+    while start < text_length:
+        end = start + chunk_size
+        
+        # Try to break at sentence boundary
+        if end < text_length:
+            # Look for sentence ending
+            for punct in [". ", ".\n", "! ", "?\n"]:
+                last_punct = text.rfind(punct, start, end)
+                if last_punct > start + chunk_size // 2:
+                    end = last_punct + 1
+                    break
+        
+        chunk = text[start:end].strip()
+        if chunk:
+            chunks.append(chunk)
+        
+        start = end - overlap
+    
+    return chunks
+
+
+@lru_cache(maxsize=1)
+def _query_embeddings_cache():
+    """Embeddings cache for search queries, keyed by the embedding model."""
+    from src.infrastructure.cache import EmbeddingsCache
+    from src.infrastructure.llm.huggingface_client import EMBEDDING_MODEL
+    return EmbeddingsCache(model=EMBEDDING_MODEL)
+
+
+def extract_and_chunk(file_path: str, content_type: str) -> Tuple[str, List[str]]:
+    """
+    Extract a file's text and split it into chunks.
+    
+    Pure CPU work on a path, so it can run in a worker process.
+    """
+    text = _extract_text(file_path, content_type)
+    if not text or len(text.strip()) < 10:
+        raise ValueError("Could not extract meaningful text from document")
+    return text, chunk_text(text)
+
 
 class DocumentService:
     """Service for document processing and management."""
@@ -30,6 +229,17 @@ class DocumentService:
         "text/csv": ".csv",
     }
     
+    # Leading bytes of the binary formats (DOCX/XLSX are ZIP, XLS is OLE2)
+    MAGIC_BYTES = {
+        "application/vnd.openxmlformats-officedocument.wordprocessingml.document": b"PK\x03\x04",
+        "application/vnd.ms-excel": b"\xd0\xcf\x11\xe0",
+        "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet": b"PK\x03\x04",
+    }
+    
+    # Holds no clients (those are module-level singletons), so one
+    # instance per request is just a user_id
+    __slots__ = ("user_id",)
+    
     def __init__(self, user_id: str):
         self.user_id = user_id
     
@@ -37,41 +247,55 @@ class DocumentService:
         """Check if file type is supported."""
         return content_type in self.SUPPORTED_TYPES
     
+    def has_valid_signature(self, content_type: str, head: bytes) -> bool:
+        """
+        Check a file's leading bytes against its declared type.
+        
+        Binary formats must start with their magic number; text formats
+        must not contain NUL bytes.
+        """
+        if content_type == "application/pdf":
+            # Readers accept up to 1KB of junk before the header
+            return b"%PDF-" in head[:1024]
+        magic = self.MAGIC_BYTES.get(content_type)
+        if magic is None:
+            return b"\x00" not in head
+        return head.startswith(magic)
+    
     async def process_document(
         self,
-        file_content: bytes,
+        file_path: str,
         filename: str,
         content_type: str,
         description: Optional[str] = None,
     ) -> Dict[str, Any]:
         """
-        Process uploaded document:
+        Process an uploaded document saved at file_path:
         1. Extract text
         2. Chunk text
         3. Generate embeddings
         4. Store in Qdrant
         5. Save metadata to PostgreSQL
+        
+        Steps 1-2 run in a worker process unless the file is small.
         """
         if not self.is_supported(content_type):
             raise ValueError(f"Unsupported file type: {content_type}")
         
         document_id = str(uuid.uuid4())
+        file_size = os.path.getsize(file_path)
         
-        # Extract text based on file type
-        text_content = await self._extract_text(
-            file_content,
-            content_type,
-            filename
-        )
-        
-        if not text_content or len(text_content.strip()) < 10:
-            raise ValueError("Could not extract meaningful text from document")
-        
-        # Chunk text for vector storage
-        chunks = self._chunk_text(text_content)
+        # Extract text based on file type and chunk it for vector storage
+        if file_size <= INLINE_EXTRACT_MAX_BYTES:
+            text_content, chunks = extract_and_chunk(file_path, content_type)
+        else:
+            loop = asyncio.get_running_loop()
+            text_content, chunks = await loop.run_in_executor(
+                _get_process_pool(), extract_and_chunk, file_path, content_type
+            )
         
         # Generate embeddings and store in Qdrant
-        await self._store_embeddings(
+        await self.store_embeddings(
             document_id=document_id,
             chunks=chunks,
             filename=filename,
@@ -82,7 +306,7 @@ class DocumentService:
             document_id=document_id,
             filename=filename,
             content_type=content_type,
-            file_size=len(file_content),
+            file_size=file_size,
             chunk_count=len(chunks),
             description=description,
         )
@@ -94,157 +318,26 @@ class DocumentService:
             "document_id": document_id,
             "filename": filename,
             "content_type": content_type,
-            "file_size": len(file_content),
+            "file_size": file_size,
             "chunk_count": len(chunks),
             "text_length": len(text_content),
             "financial_data": financial_data,
             "status": "ready",
         }
     
-    async def _extract_text(
-        self,
-        file_content: bytes,
-        content_type: str,
-        filename: str,
-    ) -> str:
-        """Extract text from different file types."""
-        
-        # PDF
-        if content_type == "application/pdf":
-            return await self._extract_pdf_text(file_content)
-        
-        # DOCX
-        elif content_type == "application/vnd.openxmlformats-officedocument.wordprocessingml.document":
-            return await self._extract_docx_text(file_content)
-        
-        # Excel
-        elif content_type in [
-            "application/vnd.ms-excel",
-            "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-        ]:
-            return await self._extract_excel_text(file_content, filename)
-        
-        # CSV
-        elif content_type == "text/csv":
-            return await self._extract_csv_text(file_content)
-        
-        # Plain text
-        elif content_type == "text/plain":
-            return file_content.decode("utf-8", errors="ignore")
-        
-        else:
-            raise ValueError(f"Unsupported content type: {content_type}")
-    
-    async def _extract_pdf_text(self, file_content: bytes) -> str:
-        """Extract text from PDF."""
-        import io
-        
-        text_parts = []
-        pdf_file = io.BytesIO(file_content)
-        
-        try:
-            pdf_reader = PyPDF2.PdfReader(pdf_file)
-            
-            for page_num in range(len(pdf_reader.pages)):
-                page = pdf_reader.pages[page_num]
-                text = page.extract_text()
-                if text:
-                    text_parts.append(f"--- Page {page_num + 1} ---\n{text}")
-            
-            return "\n\n".join(text_parts)
-            
-        except Exception as e:
-            raise ValueError(f"Failed to extract PDF text: {str(e)}")
-    
-    async def _extract_docx_text(self, file_content: bytes) -> str:
-        """Extract text from DOCX."""
-        import io
-        
-        try:
-            doc = DocxDocument(io.BytesIO(file_content))
-            paragraphs = [p.text for p in doc.paragraphs if p.text.strip()]
-            return "\n\n".join(paragraphs)
-            
-        except Exception as e:
-            raise ValueError(f"Failed to extract DOCX text: {str(e)}")
-    
-    async def _extract_excel_text(self, file_content: bytes, filename: str) -> str:
-        """Extract text from Excel file."""
-        import io
-        
-        try:
-            # Try pandas first
-            df = pd.read_excel(io.BytesIO(file_content), sheet_name=None)
-            
-            text_parts = []
-            for sheet_name, sheet_df in df.items():
-                text_parts.append(f"=== Sheet: {sheet_name} ===")
-                text_parts.append(sheet_df.to_string(index=False))
-            
-            return "\n\n".join(text_parts)
-            
-        except Exception as e:
-            raise ValueError(f"Failed to extract Excel text: {str(e)}")
-    
-    async def _extract_csv_text(self, file_content: bytes) -> str:
-        """Extract text from CSV."""
-        import io
-        
-        try:
-            df = pd.read_csv(io.BytesIO(file_content))
-            return df.to_string(index=False)
-            
-        except Exception as e:
-            raise ValueError(f"Failed to extract CSV text: {str(e)}")
-    
-    def _chunk_text(
-        self,
-        text: str,
-        chunk_size: int = 1000,
-        overlap: int = 200,
-    ) -> List[str]:
-        """
-        Split text into overlapping chunks for vector storage.
-        
-        Args:
-            text: Full text content
-            chunk_size: Maximum characters per chunk
-            overlap: Overlap between chunks
-        
-        Returns:
-            List of text chunks
-        """
-        chunks = []
-        start = 0
-        text_length = len(text)
-        
-        while start < text_length:
-            end = start + chunk_size
-            
-            # Try to break at sentence boundary
-            if end < text_length:
-                # Look for sentence ending
-                for punct in [". ", ".\n", "! ", "?\n"]:
-                    last_punct = text.rfind(punct, start, end)
-                    if last_punct > start + chunk_size // 2:
-                        end = last_punct + 1
-                        break
-            
-            chunk = text[start:end].strip()
-            if chunk:
-                chunks.append(chunk)
-            
-            start = end - overlap
-        
-        return chunks
-    
-    async def _store_embeddings(
+    async def store_embeddings(
         self,
         document_id: str,
         chunks: List[str],
         filename: str,
+        start_index: int = 0,
     ) -> None:
-        """Generate embeddings and store in Qdrant."""
+        """
+        Generate embeddings and store in Qdrant.
+        
+        start_index is the document-wide index of chunks[0], for callers
+        storing a document one batch of chunks at a time.
+        """
         from src.infrastructure.database.qdrant_client import qdrant_client
         from src.infrastructure.llm.huggingface_client import huggingface_client
         
@@ -255,23 +348,21 @@ class DocumentService:
             raise ValueError("Failed to generate embeddings")
         
         # Store in Qdrant
-        points = []
-        for i, (chunk, embedding) in enumerate(zip(chunks, embeddings)):
-            points.append({
-                "id": f"{document_id}_{i}",
-                "vector": embedding,
-                "payload": {
-                    "document_id": document_id,
-                    "user_id": self.user_id,
-                    "filename": filename,
-                    "chunk_index": i,
-                    "text": chunk,
-                    "created_at": datetime.utcnow().isoformat(),
-                }
+        ids = []
+        payloads = []
+        for i, chunk in enumerate(chunks, start_index):
+            ids.append(f"{document_id}_{i}")
+            payloads.append({
+                "document_id": document_id,
+                "user_id": self.user_id,
+                "filename": filename,
+                "chunk_index": i,
+                "text": chunk,
+                "created_at": datetime.utcnow().isoformat(),
             })
         
         # Batch upsert to Qdrant
-        qdrant_client.upsert_batch(points)
+        await qdrant_client.upsert_vectors(ids, embeddings, payloads)
     
     async def _save_metadata(
         self,
@@ -296,7 +387,6 @@ class DocumentService:
                 chunk_count=chunk_count,
                 description=description,
                 status="ready",
-                created_at=datetime.utcnow(),
             )
             
             session.add(document)
@@ -341,28 +431,45 @@ class DocumentService:
         
         return financial_data
     
+    async def embed_query(self, query: str) -> List[float]:
+        """Get the embedding of a search query (cached in Redis for a day)."""
+        return await _query_embeddings_cache().get_or_compute(query, self._embed_query)
+    
+    async def _embed_query(self, query: str) -> List[float]:
+        """Generate the embedding of a search query."""
+        from src.infrastructure.llm.huggingface_client import huggingface_client
+        
+        embeddings = await huggingface_client.embeddings([query])
+        
+        if not embeddings or not embeddings[0]:
+            raise ValueError("Failed to generate query embedding")
+        
+        return embeddings[0]
+    
     async def search_documents(
         self,
         query: str,
         top_k: int = 5,
+        query_vector: Optional[List[float]] = None,
+        document_id: Optional[str] = None,
     ) -> List[Dict[str, Any]]:
-        """Search user's documents using semantic search."""
+        """
+        Search user's documents using semantic search (query_vector if precomputed).
+        
+        document_id restricts the search to one document inside Qdrant.
+        """
         from src.infrastructure.database.qdrant_client import qdrant_client
-        from src.infrastructure.llm.huggingface_client import huggingface_client
         
         # Generate query embedding
-        embeddings = await huggingface_client.embeddings([query])
-        
-        if not embeddings or not embeddings[0]:
-            raise ValueError("Failed to generate query embedding")
-        
-        query_vector = embeddings[0]
+        if query_vector is None:
+            query_vector = await self.embed_query(query)
         
         # Search Qdrant with user filter
-        results = qdrant_client.search(
+        results = await qdrant_client.search(
             query_vector=query_vector,
             top_k=top_k,
-            filter_conditions={"user_id": self.user_id},
+            user_id=self.user_id,
+            document_id=document_id,
         )
         
         return results
@@ -451,7 +558,7 @@ class DocumentService:
                 return False
             
             # Delete from Qdrant
-            qdrant_client.delete_by_filter({"document_id": document_id})
+            await qdrant_client.delete_by_document(document_id)
             
             # Delete from PostgreSQL
             await session.execute(
@@ -24,13 +24,13 @@ class IntentRouter:
         Creates the base structure for intent routing.
         """
         # Create constraints
-        self.driver.execute_write("""
+        await self.driver.execute_write("""
             CREATE CONSTRAINT IF NOT EXISTS FOR (i:Intent) REQUIRE i.name IS UNIQUE
         """)
-        self.driver.execute_write("""
+        await self.driver.execute_write("""
             CREATE CONSTRAINT IF NOT EXISTS FOR (t:Tool) REQUIRE t.name IS UNIQUE
         """)
-        self.driver.execute_write("""
+        await self.driver.execute_write("""
             CREATE CONSTRAINT IF NOT EXISTS FOR (a:API) REQUIRE a.name IS UNIQUE
         """)
         
@@ -162,7 +162,7 @@ class IntentRouter:
         ]
         
         for mapping in intent_tool_mappings:
-            self.driver.execute_write("""
+            await self.driver.execute_write("""
                 MERGE (i:Intent {name: $intent})
                 SET i.description = $description
                 WITH i
@@ -175,7 +175,7 @@ class IntentRouter:
             })
             
             if mapping.get("api"):
-                self.driver.execute_write("""
+                await self.driver.execute_write("""
                     MATCH (t:Tool {name: $tool})
                     MERGE (a:API {name: $api})
                     MERGE (t)-[:CALLS]->(a)
@@ -184,7 +184,7 @@ class IntentRouter:
                     "api": mapping["api"],
                 })
     
-    def get_tool_for_intent(self, intent: str) -> Optional[Dict[str, Any]]:
+    async def get_tool_for_intent(self, intent: str) -> Optional[Dict[str, Any]]:
         """
         Get the tool associated with an intent.
         
@@ -196,7 +196,7 @@ class IntentRouter:
         RETURN t.name as tool_name, i.description as description,
                collect(a.name) as apis
         """
-        results = self.driver.execute_read(query, {"intent": intent})
+        results = await self.driver.execute_read(query, {"intent": intent})
         return results[0] if results else None
     
     def classify_intent(self, message: str) -> str:
@@ -275,7 +275,7 @@ class IntentRouter:
         
         return best_intent or "general_query"
     
-    def get_all_intents(self) -> List[Dict[str, Any]]:
+    async def get_all_intents(self) -> List[Dict[str, Any]]:
         """Get all registered intents with their tools."""
         query = """
         MATCH (i:Intent)
@@ -284,7 +284,7 @@ class IntentRouter:
                collect(t.name) as tools
         ORDER BY i.name
         """
-        return self.driver.execute_read(query)
+        return await self.driver.execute_read(query)
 
 
 # Global intent router instance
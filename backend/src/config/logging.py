@@ -0,0 +1,39 @@
+"""
+Logging Configuration
+Non-blocking root logger: records are queued and written by a background thread
+"""
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
+import atexit
+import logging
+import queue
+
+LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+
+_listener: Optional[QueueListener] = None
+
+
+def configure_logging(level: int = logging.INFO, fmt: str = LOG_FORMAT) -> None:
+    """
+    Route all log records through a QueueHandler.
+    
+    Coroutines only enqueue records; a QueueListener thread does the
+    formatting and the blocking stream write. Safe to call more than once.
+    """
+    global _listener
+    if _listener is not None:
+        return
+    
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(logging.Formatter(fmt))
+    
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    _listener = QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    _listener.start()
+    atexit.register(_listener.stop)  # flush queued records on exit
+    
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+    root.addHandler(QueueHandler(log_queue))
+    root.setLevel(level)
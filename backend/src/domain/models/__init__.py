@@ -8,6 +8,7 @@ from .document import Document
 from .payment import Payment
 from .income import Income
 from .account import Account
+from .user_balance import UserBalance
 
 __all__ = [
     "User",
@@ -18,5 +19,6 @@ __all__ = [
     "Document",
     "Payment",
     "Income",
-    "Account"
+    "Account",
+    "UserBalance",
 ]
@@ -4,10 +4,11 @@ SQLAlchemy model for user account/balance tracking
 """
 from datetime import datetime
 from decimal import Decimal
-from sqlalchemy import Column, String, Numeric, DateTime, ForeignKey
+from sqlalchemy import Column, String, DateTime, ForeignKey
 from sqlalchemy.orm import relationship
 
 from src.infrastructure.database.postgres import Base
+from src.infrastructure.database.types import Money, UTC_NOW
 
 
 class Account(Base):
@@ -22,14 +23,14 @@ class Account(Base):
     account_type = Column(String(50), default="checking")  # checking, savings, credit_card, cash
     currency = Column(String(3), default="USD")
     
-    current_balance = Column(Numeric(12, 2), default=0, nullable=False)
+    current_balance = Column(Money, default=0, nullable=False)
     
     # Timestamps
-    last_updated = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
-    created_at = Column(DateTime, default=datetime.utcnow)
+    last_updated = Column(DateTime, server_default=UTC_NOW, onupdate=datetime.utcnow)
+    created_at = Column(DateTime, server_default=UTC_NOW)
     
     # Relationships
     user = relationship("User", back_populates="accounts")
     
-    def __repr__(self):
+    def __repr__(self) -> str:
         return f"<Account(id={self.id}, name={self.name}, balance={self.current_balance})>"
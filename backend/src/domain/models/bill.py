@@ -4,10 +4,11 @@ SQLAlchemy model for bill tracking
 """
 from datetime import datetime, date
 from decimal import Decimal
-from sqlalchemy import Column, String, Numeric, Date, DateTime, Boolean, ForeignKey
+from sqlalchemy import Column, String, Date, DateTime, Boolean, ForeignKey
 from sqlalchemy.orm import relationship
 
 from src.infrastructure.database.postgres import Base
+from src.infrastructure.database.types import Money, UTC_NOW
 
 
 class Bill(Base):
@@ -19,7 +20,7 @@ class Bill(Base):
     user_id = Column(String(36), ForeignKey("users.id"), nullable=False, index=True)
     
     name = Column(String(255), nullable=False)
-    amount = Column(Numeric(12, 2), nullable=False)
+    amount = Column(Money, nullable=False)
     currency = Column(String(3), default="USD")
     
     due_date = Column(Date, nullable=False, index=True)
@@ -30,11 +31,11 @@ class Bill(Base):
     paid_at = Column(DateTime, nullable=True)
     
     # Timestamps
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(DateTime, server_default=UTC_NOW)
+    updated_at = Column(DateTime, server_default=UTC_NOW, onupdate=datetime.utcnow)
     
     # Relationships
     user = relationship("User", back_populates="bills")
     
-    def __repr__(self):
+    def __repr__(self) -> str:
         return f"<Bill(id={self.id}, name={self.name}, due_date={self.due_date})>"
@@ -8,6 +8,7 @@ from sqlalchemy.orm import relationship
 import uuid
 
 from src.infrastructure.database.postgres import Base
+from src.infrastructure.database.types import UTC_NOW
 
 
 class Document(Base):
@@ -26,11 +27,11 @@ class Document(Base):
     description = Column(Text, nullable=True)
     status = Column(String(20), default="processing")  # processing, ready, failed
     
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(DateTime, server_default=UTC_NOW, nullable=False)
+    updated_at = Column(DateTime, server_default=UTC_NOW, onupdate=datetime.utcnow)
     
     # Relationship
     user = relationship("User", back_populates="documents")
     
-    def __repr__(self):
+    def __repr__(self) -> str:
         return f"<Document {self.filename} ({self.status})>"
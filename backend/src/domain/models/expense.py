@@ -4,21 +4,26 @@ SQLAlchemy model for expense tracking
 """
 from datetime import datetime, date
 from decimal import Decimal
-from sqlalchemy import Column, String, Numeric, Date, DateTime, Text, ForeignKey
+from sqlalchemy import Column, String, Date, DateTime, Text, ForeignKey
 from sqlalchemy.orm import relationship
 
-from src.infrastructure.database.postgres import Base
+from src.infrastructure.database.postgres import Base, hash_partitions
+from src.infrastructure.database.types import Money, UTC_NOW
 
 
 class Expense(Base):
     """Expense model for tracking user expenses."""
     
     __tablename__ = "expenses"
+    # Hash-partitioned by owner: every history query filters by user_id,
+    # so each lookup only touches one partition's index.
+    __table_args__ = {"postgresql_partition_by": "HASH (user_id)"}
     
     id = Column(String(36), primary_key=True)
-    user_id = Column(String(36), ForeignKey("users.id"), nullable=False, index=True)
+    # Partition key must be part of the primary key
+    user_id = Column(String(36), ForeignKey("users.id"), primary_key=True, index=True)
     
-    amount = Column(Numeric(12, 2), nullable=False)
+    amount = Column(Money, nullable=False)
     currency = Column(String(3), default="USD")
     category = Column(String(100), nullable=False, index=True)
     merchant = Column(String(255), nullable=False)
@@ -31,11 +36,14 @@ class Expense(Base):
     source_id = Column(String(255), nullable=True)  # email_id, transaction_id, etc.
     
     # Timestamps
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(DateTime, server_default=UTC_NOW)
+    updated_at = Column(DateTime, server_default=UTC_NOW, onupdate=datetime.utcnow)
     
     # Relationships
     user = relationship("User", back_populates="expenses")
     
-    def __repr__(self):
+    def __repr__(self) -> str:
         return f"<Expense(id={self.id}, amount={self.amount}, merchant={self.merchant})>"
+
+
+hash_partitions(Expense.__table__)
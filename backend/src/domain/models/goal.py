@@ -4,10 +4,11 @@ SQLAlchemy model for financial goals
 """
 from datetime import datetime, date
 from decimal import Decimal
-from sqlalchemy import Column, String, Numeric, Date, DateTime, Boolean, ForeignKey
+from sqlalchemy import Column, String, Date, DateTime, Boolean, ForeignKey
 from sqlalchemy.orm import relationship
 
 from src.infrastructure.database.postgres import Base
+from src.infrastructure.database.types import Money, UTC_NOW
 
 
 class Goal(Base):
@@ -19,8 +20,8 @@ class Goal(Base):
     user_id = Column(String(36), ForeignKey("users.id"), nullable=False, index=True)
     
     name = Column(String(255), nullable=False)
-    target_amount = Column(Numeric(12, 2), nullable=False)
-    current_amount = Column(Numeric(12, 2), default=0)
+    target_amount = Column(Money, nullable=False)
+    current_amount = Column(Money, default=0)
     currency = Column(String(3), default="USD")
     
     category = Column(String(100), nullable=True)
@@ -30,8 +31,8 @@ class Goal(Base):
     completed_at = Column(DateTime, nullable=True)
     
     # Timestamps
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(DateTime, server_default=UTC_NOW)
+    updated_at = Column(DateTime, server_default=UTC_NOW, onupdate=datetime.utcnow)
     
     # Relationships
     user = relationship("User", back_populates="goals")
@@ -39,9 +40,10 @@ class Goal(Base):
     @property
     def progress_percent(self) -> float:
         """Calculate progress percentage."""
-        if self.target_amount == 0:
+        target: float = float(self.target_amount or 0)
+        if target == 0:
             return 0.0
-        return float(self.current_amount / self.target_amount * 100)
+        return float(self.current_amount or 0) / target * 100
     
-    def __repr__(self):
+    def __repr__(self) -> str:
         return f"<Goal(id={self.id}, name={self.name}, progress={self.progress_percent:.1f}%)>"
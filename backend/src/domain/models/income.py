@@ -4,21 +4,25 @@ SQLAlchemy model for income tracking
 """
 from datetime import datetime, date
 from decimal import Decimal
-from sqlalchemy import Column, String, Numeric, Date, DateTime, Text, ForeignKey
+from sqlalchemy import Column, String, Date, DateTime, Text, ForeignKey
 from sqlalchemy.orm import relationship
 
-from src.infrastructure.database.postgres import Base
+from src.infrastructure.database.postgres import Base, hash_partitions
+from src.infrastructure.database.types import Money, UTC_NOW
 
 
 class Income(Base):
     """Income model for tracking user income."""
     
     __tablename__ = "income"
+    # Hash-partitioned by owner, same layout as expenses
+    __table_args__ = {"postgresql_partition_by": "HASH (user_id)"}
     
     id = Column(String(36), primary_key=True)
-    user_id = Column(String(36), ForeignKey("users.id"), nullable=False, index=True)
+    # Partition key must be part of the primary key
+    user_id = Column(String(36), ForeignKey("users.id"), primary_key=True, index=True)
     
-    amount = Column(Numeric(12, 2), nullable=False)
+    amount = Column(Money, nullable=False)
     currency = Column(String(3), default="USD")
     source = Column(String(255), nullable=False)  # salary, freelance, investment, etc.
     category = Column(String(100), nullable=True)
@@ -27,11 +31,14 @@ class Income(Base):
     income_date = Column(Date, nullable=False, index=True)
     
     # Timestamps
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(DateTime, server_default=UTC_NOW)
+    updated_at = Column(DateTime, server_default=UTC_NOW, onupdate=datetime.utcnow)
     
     # Relationships
     user = relationship("User", back_populates="income")
     
-    def __repr__(self):
+    def __repr__(self) -> str:
         return f"<Income(id={self.id}, amount={self.amount}, source={self.source})>"
+
+
+hash_partitions(Income.__table__)
@@ -4,10 +4,11 @@ SQLAlchemy model for Stripe payment records
 """
 from datetime import datetime
 from decimal import Decimal
-from sqlalchemy import Column, String, Numeric, DateTime, ForeignKey
+from sqlalchemy import Column, String, DateTime, ForeignKey
 from sqlalchemy.orm import relationship
 
 from src.infrastructure.database.postgres import Base
+from src.infrastructure.database.types import Money, UTC_NOW
 
 
 class Payment(Base):
@@ -24,7 +25,7 @@ class Payment(Base):
     stripe_subscription_id = Column(String(255), nullable=True)
     
     # Payment details
-    amount = Column(Numeric(12, 2), nullable=False)
+    amount = Column(Money, nullable=False)
     currency = Column(String(3), default="USD")
     status = Column(String(50), nullable=False)  # succeeded, failed, pending, refunded
     
@@ -32,7 +33,7 @@ class Payment(Base):
     description = Column(String(500), nullable=True)
     
     # Timestamps
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, server_default=UTC_NOW)
     
-    def __repr__(self):
+    def __repr__(self) -> str:
         return f"<Payment(id={self.id}, amount={self.amount}, status={self.status})>"
@@ -4,10 +4,11 @@ SQLAlchemy model for recurring subscriptions
 """
 from datetime import datetime, date
 from decimal import Decimal
-from sqlalchemy import Column, String, Numeric, Date, DateTime, Boolean, ForeignKey
+from sqlalchemy import Column, String, Date, DateTime, Boolean, ForeignKey
 from sqlalchemy.orm import relationship
 
 from src.infrastructure.database.postgres import Base
+from src.infrastructure.database.types import Money, UTC_NOW
 
 
 class Subscription(Base):
@@ -19,7 +20,7 @@ class Subscription(Base):
     user_id = Column(String(36), ForeignKey("users.id"), nullable=False, index=True)
     
     name = Column(String(255), nullable=False)
-    amount = Column(Numeric(12, 2), nullable=False)
+    amount = Column(Money, nullable=False)
     currency = Column(String(3), default="USD")
     
     billing_cycle = Column(String(20), nullable=False)  # daily, weekly, monthly, yearly
@@ -31,12 +32,12 @@ class Subscription(Base):
     is_active = Column(Boolean, default=True)
     
     # Timestamps
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(DateTime, server_default=UTC_NOW)
+    updated_at = Column(DateTime, server_default=UTC_NOW, onupdate=datetime.utcnow)
     canceled_at = Column(DateTime, nullable=True)
     
     # Relationships
     user = relationship("User", back_populates="subscriptions")
     
-    def __repr__(self):
+    def __repr__(self) -> str:
         return f"<Subscription(id={self.id}, name={self.name}, amount={self.amount})>"
@@ -0,0 +1,86 @@
+"""
+User Balance Model
+Per-user income and expense totals kept current by database triggers
+"""
+from sqlalchemy import BigInteger, Column, DDL, ForeignKey, String, event
+
+from src.infrastructure.database.postgres import Base
+from .expense import Expense
+from .income import Income
+
+
+class UserBalance(Base):
+    """
+    All-time income and expense totals of a user, in cents.
+    
+    Rows are maintained by AFTER row triggers on income and expenses, so
+    reading a balance is a primary-key lookup instead of a SUM over the
+    user's history. Never written by the application.
+    """
+    
+    __tablename__ = "user_balances"
+    
+    user_id = Column(String(36), ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    total_income = Column(BigInteger, nullable=False, default=0, server_default="0")
+    total_expenses = Column(BigInteger, nullable=False, default=0, server_default="0")
+    
+    def __repr__(self) -> str:
+        return (
+            f"<UserBalance(user_id={self.user_id}, income={self.total_income}, "
+            f"expenses={self.total_expenses})>"
+        )
+
+
+# Adds a row's amount to its owner's totals; TG_ARGV[0] names the source
+# table, since on partitions TG_TABLE_NAME is the partition (income_p3).
+# A row moved between partitions fires DELETE then INSERT, never UPDATE.
+TRACK_USER_BALANCE = DDL("""
+CREATE OR REPLACE FUNCTION track_user_balance() RETURNS trigger
+LANGUAGE plpgsql AS $$
+DECLARE
+    is_income BOOLEAN := TG_ARGV[0] = 'income';
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        INSERT INTO user_balances AS b (user_id, total_income, total_expenses)
+        VALUES (
+            OLD.user_id,
+            CASE WHEN is_income THEN -OLD.amount ELSE 0 END,
+            CASE WHEN is_income THEN 0 ELSE -OLD.amount END
+        )
+        ON CONFLICT (user_id) DO UPDATE SET
+            total_income = b.total_income + EXCLUDED.total_income,
+            total_expenses = b.total_expenses + EXCLUDED.total_expenses;
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        INSERT INTO user_balances AS b (user_id, total_income, total_expenses)
+        VALUES (
+            NEW.user_id,
+            CASE WHEN is_income THEN NEW.amount ELSE 0 END,
+            CASE WHEN is_income THEN 0 ELSE NEW.amount END
+        )
+        ON CONFLICT (user_id) DO UPDATE SET
+            total_income = b.total_income + EXCLUDED.total_income,
+            total_expenses = b.total_expenses + EXCLUDED.total_expenses;
+    END IF;
+    RETURN NULL;
+END
+$$
+""")
+
+
+def track_balance(table) -> None:
+    """Create the balance trigger on a money table right after the table itself."""
+    event.listen(table, "after_create", TRACK_USER_BALANCE.execute_if(dialect="postgresql"))
+    event.listen(
+        table,
+        "after_create",
+        DDL(
+            f"CREATE TRIGGER {table.name}_user_balance "
+            f"AFTER INSERT OR UPDATE OF amount, user_id OR DELETE ON {table.name} "
+            f"FOR EACH ROW EXECUTE FUNCTION track_user_balance('{table.name}')"
+        ).execute_if(dialect="postgresql"),
+    )
+
+
+track_balance(Income.__table__)
+track_balance(Expense.__table__)
@@ -0,0 +1,5 @@
+"""MoneyMind Cache Package"""
+from .embeddings_cache import EmbeddingsCache
+from .query_cache import QueryCache, query_cache
+
+__all__ = ["EmbeddingsCache", "QueryCache", "query_cache"]
@@ -0,0 +1,55 @@
+"""
+Embeddings Cache
+Redis-backed cache of text embeddings, stored as raw float32 bytes
+"""
+from typing import Awaitable, Callable, List
+import hashlib
+import logging
+
+import numpy as np
+
+from src.infrastructure.database.redis_client import redis_client
+
+logger = logging.getLogger(__name__)
+
+
+class EmbeddingsCache:
+    """
+    Caches embeddings by model and text digest.
+    
+    Vectors are stored as float32 bytes under emb:{model}:{blake2b(text)}.
+    Redis errors fall back to computing the embedding.
+    """
+    
+    def __init__(self, model: str, ttl: int = 86400):
+        self.model = model
+        self.ttl = ttl
+    
+    def _key(self, text: str) -> str:
+        digest = hashlib.blake2b(text.encode(), digest_size=16).hexdigest()
+        return f"emb:{self.model}:{digest}"
+    
+    async def get_or_compute(
+        self,
+        text: str,
+        compute: Callable[[str], Awaitable[List[float]]],
+    ) -> List[float]:
+        """Get the cached embedding of text, computing and storing it on a miss."""
+        key = self._key(text)
+        try:
+            cached = await redis_client.get_bytes(key)
+        except Exception as e:
+            logger.warning(f"Embeddings cache read failed: {e}")
+            cached = None
+        
+        if cached is not None:
+            return np.frombuffer(cached, dtype=np.float32).tolist()
+        
+        vector = await compute(text)
+        try:
+            await redis_client.set_bytes(
+                key, np.asarray(vector, dtype=np.float32).tobytes(), expire=self.ttl
+            )
+        except Exception as e:
+            logger.warning(f"Embeddings cache write failed: {e}")
+        return vector
@@ -0,0 +1,108 @@
+"""
+Document Query Cache
+Per-process cache of answers to document queries (exact and semantic)
+"""
+from collections import deque
+from typing import Any, Deque, Hashable, List, Optional, Tuple
+import hashlib
+import time
+
+import numpy as np
+from cachetools import TTLCache
+
+
+class QueryCache:
+    """
+    Two-level cache for document query answers.
+    
+    The exact level is keyed on the user, document scope, normalized query
+    and top_k. The semantic level keeps the most recent query embeddings
+    per process and reuses an answer when a new query's embedding has
+    cosine similarity >= threshold with a cached one.
+    """
+    
+    def __init__(
+        self,
+        maxsize: int = 1000,
+        ttl: float = 300,
+        semantic_size: int = 64,
+        threshold: float = 0.95,
+    ):
+        self._ttl = ttl
+        self._threshold = threshold
+        self._exact: TTLCache = TTLCache(maxsize=maxsize, ttl=ttl)
+        # (user_id, scope, top_k, unit vector, expires_at, value)
+        self._recent: Deque[Tuple[str, Optional[str], int, np.ndarray, float, Any]] = deque(
+            maxlen=semantic_size
+        )
+    
+    @staticmethod
+    def key(user_id: str, scope: Optional[str], query: str, top_k: int) -> Hashable:
+        """Build the exact-match key; case and whitespace are normalized."""
+        normalized = " ".join(query.lower().split())
+        digest = hashlib.blake2b(normalized.encode(), digest_size=16).digest()
+        return (user_id, scope, digest, top_k)
+    
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Get an exactly matching cached answer."""
+        return self._exact.get(key)
+    
+    def set(self, key: Hashable, value: Any):
+        """Cache an answer under an exact key."""
+        self._exact[key] = value
+    
+    def get_similar(
+        self,
+        user_id: str,
+        scope: Optional[str],
+        top_k: int,
+        vector: List[float],
+    ) -> Optional[Any]:
+        """Get the answer of a recent query with a near-identical embedding."""
+        if not self._recent:
+            return None
+        
+        unit = _unit(vector)
+        now = time.monotonic()
+        for entry_user, entry_scope, entry_top_k, entry_vector, expires_at, value in self._recent:
+            if (
+                entry_user == user_id
+                and entry_scope == scope
+                and entry_top_k == top_k
+                and expires_at > now
+                and float(np.dot(unit, entry_vector)) >= self._threshold
+            ):
+                return value
+        return None
+    
+    def add_similar(
+        self,
+        user_id: str,
+        scope: Optional[str],
+        top_k: int,
+        vector: List[float],
+        value: Any,
+    ):
+        """Remember an answer for semantic lookups."""
+        self._recent.append(
+            (user_id, scope, top_k, _unit(vector), time.monotonic() + self._ttl, value)
+        )
+    
+    def invalidate_user(self, user_id: str):
+        """Drop every cached answer for a user (e.g. after their documents change)."""
+        for key in [key for key in self._exact.keys() if key[0] == user_id]:
+            self._exact.pop(key, None)
+        kept = [entry for entry in self._recent if entry[0] != user_id]
+        self._recent.clear()
+        self._recent.extend(kept)
+
+
+def _unit(vector: List[float]) -> np.ndarray:
+    """Normalize a vector to unit length, so a dot product is the cosine."""
+    array = np.asarray(vector, dtype=np.float32)
+    norm = np.linalg.norm(array)
+    return array / norm if norm else array
+
+
+# Global query cache instance
+query_cache = QueryCache()
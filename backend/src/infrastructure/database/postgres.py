@@ -3,6 +3,7 @@ PostgreSQL Database Connection
 SQLAlchemy async engine and session management
 """
 from typing import AsyncGenerator
+from sqlalchemy import DDL, Table, event
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
 from sqlalchemy.orm import declarative_base
 
@@ -13,8 +14,11 @@ engine = create_async_engine(
     settings.database_url,
     echo=settings.debug,
     pool_pre_ping=True,
-    pool_size=10,
-    max_overflow=20,
+    pool_size=settings.database_pool_size,
+    max_overflow=settings.database_max_overflow,
+    # Fail fast when the pool is exhausted instead of queueing for 30s
+    pool_timeout=settings.database_pool_timeout,
+    pool_recycle=settings.database_pool_recycle,
 )
 
 # Session factory
@@ -29,6 +33,26 @@ async_session_factory = async_sessionmaker(
 # Base class for all models
 Base = declarative_base()
 
+# Number of hash partitions for per-user history tables (expenses, income)
+HASH_PARTITIONS = 16
+
+
+def hash_partitions(table: Table, modulus: int = HASH_PARTITIONS) -> None:
+    """
+    Create the hash partitions of a partitioned table right after the
+    parent is created, so init_db()/create_all() yields an insertable table.
+    """
+    for remainder in range(modulus):
+        event.listen(
+            table,
+            "after_create",
+            DDL(
+                f"CREATE TABLE IF NOT EXISTS {table.name}_p{remainder} "
+                f"PARTITION OF {table.name} "
+                f"FOR VALUES WITH (modulus {modulus}, remainder {remainder})"
+            ).execute_if(dialect="postgresql"),
+        )
+
 
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
     """
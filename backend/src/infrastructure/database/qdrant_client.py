@@ -2,8 +2,10 @@
 Qdrant Vector Database Client
 For document embeddings and semantic search
 """
+from functools import lru_cache
+import asyncio
 from typing import Optional, List, Dict, Any
-from qdrant_client import QdrantClient
+from qdrant_client import AsyncQdrantClient
 from qdrant_client.http.models import (
     Distance,
     VectorParams,
@@ -11,66 +13,144 @@ from qdrant_client.http.models import (
     Filter,
     FieldCondition,
     MatchValue,
+    QuantizationSearchParams,
+    ScalarQuantization,
+    ScalarQuantizationConfig,
+    ScalarType,
+    SearchParams,
 )
 
 from src.config.settings import settings
 
 
+@lru_cache(maxsize=4096)
+def _build_filter(
+    user_id: Optional[str] = None,
+    document_id: Optional[str] = None,
+) -> Optional[Filter]:
+    """
+    Build (and memoize) the payload filter for a user/document scope.
+    
+    Returned filters are shared between calls and must not be mutated.
+    """
+    conditions = []
+    
+    if user_id:
+        conditions.append(
+            FieldCondition(key="user_id", match=MatchValue(value=user_id))
+        )
+    
+    if document_id:
+        conditions.append(
+            FieldCondition(key="document_id", match=MatchValue(value=document_id))
+        )
+    
+    return Filter(must=conditions) if conditions else None
+
+
+# Searches score candidates on the in-RAM int8 vectors, then rescore the
+# best (top_k * oversampling) against the full-precision originals
+_SEARCH_PARAMS = SearchParams(
+    quantization=QuantizationSearchParams(rescore=True, oversampling=2.0),
+)
+
+# Payload fields returned with search hits; user_id and created_at are only
+# needed for filtering and stay on the server
+SEARCH_PAYLOAD_FIELDS = ["document_id", "filename", "chunk_index", "text"]
+
+
 class QdrantVectorClient:
     """Qdrant client wrapper for vector operations."""
     
     def __init__(self):
-        self._client: Optional[QdrantClient] = None
+        self._client: Optional[AsyncQdrantClient] = None
         self.collection_name = settings.qdrant_collection
         self.vector_size = 384  # Default for sentence-transformers
     
     def connect(self):
         """Initialize Qdrant client."""
-        self._client = QdrantClient(url=settings.qdrant_url)
+        self._client = AsyncQdrantClient(
+            url=settings.qdrant_url,
+            prefer_grpc=settings.qdrant_prefer_grpc,
+            grpc_port=settings.qdrant_grpc_port,
+            timeout=settings.qdrant_timeout,
+        )
+    
+    @property
+    def is_connected(self) -> bool:
+        """Whether connect() has been called."""
+        return self._client is not None
     
-    def disconnect(self):
+    async def disconnect(self):
         """Close Qdrant client."""
         if self._client:
-            self._client.close()
+            await self._client.close()
     
     @property
-    def client(self) -> QdrantClient:
+    def client(self) -> AsyncQdrantClient:
         """Get Qdrant client instance."""
         if not self._client:
             raise RuntimeError("Qdrant not connected. Call connect() first.")
         return self._client
     
-    def ensure_collection(self, vector_size: int = 384):
-        """Create collection if it doesn't exist."""
-        collections = self.client.get_collections().collections
+    async def ensure_collection(self, vector_size: int = 384):
+        """
+        Create collection if it doesn't exist.
+        
+        Full-precision vectors are kept on disk and int8 scalar-quantized
+        copies in RAM (about 4x less memory per point).
+        """
+        collections = (await self.client.get_collections()).collections
         exists = any(c.name == self.collection_name for c in collections)
         
         if not exists:
-            self.client.create_collection(
+            await self.client.create_collection(
                 collection_name=self.collection_name,
                 vectors_config=VectorParams(
                     size=vector_size,
                     distance=Distance.COSINE,
+                    on_disk=True,
+                ),
+                quantization_config=ScalarQuantization(
+                    scalar=ScalarQuantizationConfig(
+                        type=ScalarType.INT8,
+                        always_ram=True,
+                    ),
                 ),
             )
     
-    def upsert_vectors(
+    async def upsert_vectors(
         self,
         ids: List[str],
         vectors: List[List[float]],
         payloads: List[Dict[str, Any]],
     ):
-        """Upsert vectors into collection."""
+        """
+        Upsert vectors into collection.
+        
+        Points are sent in batches of settings.qdrant_upsert_batch_size,
+        concurrently when settings.qdrant_parallel_upserts is set.
+        """
         points = [
             PointStruct(id=id_, vector=vector, payload=payload)
             for id_, vector, payload in zip(ids, vectors, payloads)
         ]
-        self.client.upsert(
-            collection_name=self.collection_name,
-            points=points,
-        )
+        size = settings.qdrant_upsert_batch_size
+        batches = [
+            self.client.upsert(
+                collection_name=self.collection_name,
+                points=points[start:start + size],
+            )
+            for start in range(0, len(points), size)
+        ]
+        
+        if settings.qdrant_parallel_upserts:
+            await asyncio.gather(*batches)
+        else:
+            for batch in batches:
+                await batch
     
-    def search(
+    async def search(
         self,
         query_vector: List[float],
         top_k: int = 5,
@@ -78,25 +158,15 @@ class QdrantVectorClient:
         document_id: Optional[str] = None,
     ) -> List[Dict[str, Any]]:
         """Search for similar vectors."""
-        filter_conditions = []
-        
-        if user_id:
-            filter_conditions.append(
-                FieldCondition(key="user_id", match=MatchValue(value=user_id))
-            )
-        
-        if document_id:
-            filter_conditions.append(
-                FieldCondition(key="document_id", match=MatchValue(value=document_id))
-            )
-        
-        query_filter = Filter(must=filter_conditions) if filter_conditions else None
+        query_filter = _build_filter(user_id, document_id)
         
-        results = self.client.search(
+        results = await self.client.search(
             collection_name=self.collection_name,
             query_vector=query_vector,
             limit=top_k,
             query_filter=query_filter,
+            search_params=_SEARCH_PARAMS,
+            with_payload=SEARCH_PAYLOAD_FIELDS,
         )
         
         return [
@@ -108,18 +178,11 @@ class QdrantVectorClient:
             for hit in results
         ]
     
-    def delete_by_document(self, document_id: str):
+    async def delete_by_document(self, document_id: str):
         """Delete all vectors for a document."""
-        self.client.delete(
+        await self.client.delete(
             collection_name=self.collection_name,
-            points_selector=Filter(
-                must=[
-                    FieldCondition(
-                        key="document_id",
-                        match=MatchValue(value=document_id),
-                    )
-                ]
-            ),
+            points_selector=_build_filter(document_id=document_id),
         )
 
 
@@ -2,12 +2,139 @@
 Redis Client
 Connection pool and pub/sub messaging
 """
-from typing import Optional
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+import asyncio
+import hashlib
+import math
+import socket
 import redis.asyncio as redis
 from redis.asyncio import Redis
+from redis.client import NEVER_DECODE
+from redis._parsers import _AsyncHiredisParser
 
 from src.config.settings import settings
 
+# Probe idle connections after 30s so dead peers are dropped before use
+# (the TCP_KEEP* constants are Linux-only; other platforms use OS defaults)
+_KEEPALIVE_OPTIONS = {
+    getattr(socket, opt): value
+    for opt, value in (("TCP_KEEPIDLE", 30), ("TCP_KEEPINTVL", 10), ("TCP_KEEPCNT", 3))
+    if hasattr(socket, opt)
+}
+
+# HSET + EXPIRE as one atomic server-side call: KEYS[1]=key, ARGV=[ttl, k1, v1, ...]
+_SET_SESSION_LUA = """
+redis.call('HSET', KEYS[1], unpack(ARGV, 2))
+return redis.call('EXPIRE', KEYS[1], ARGV[1])
+"""
+
+
+class _PublishBatcher:
+    """
+    Coalesces concurrent PUBLISH calls into pipelined flushes.
+    
+    Messages arriving within max_delay of each other (up to batch_size)
+    are sent to Redis in one pipeline instead of one round-trip each.
+    """
+    
+    def __init__(self, client: Redis, batch_size: int, max_delay: float):
+        self._client = client
+        self._batch_size = batch_size
+        self._max_delay = max_delay
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._task: Optional[asyncio.Task] = None
+    
+    def start(self):
+        """Start the background flush loop."""
+        self._task = asyncio.create_task(self._run())
+    
+    async def stop(self):
+        """Stop the flush loop and fail any messages still queued."""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        
+        while not self._queue.empty():
+            _, _, future = self._queue.get_nowait()
+            if not future.done():
+                future.set_exception(RuntimeError("Redis publisher stopped"))
+    
+    async def publish(self, channel: str, message: str) -> int:
+        """Queue a message and wait for its PUBLISH reply."""
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((channel, message, future))
+        return await future
+    
+    async def _collect(self) -> List[Tuple[str, str, asyncio.Future]]:
+        """Wait for one message, then gather more until size or time limit."""
+        batch = [await self._queue.get()]
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self._max_delay
+        
+        while len(batch) < self._batch_size:
+            if not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+                continue
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        
+        return batch
+    
+    async def _run(self):
+        while True:
+            batch = await self._collect()
+            try:
+                async with self._client.pipeline(transaction=False) as pipe:
+                    for channel, message, _ in batch:
+                        pipe.publish(channel, message)
+                    results = await pipe.execute()
+            except Exception as e:
+                for _, _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            
+            for (_, _, future), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
+
+
+class _BloomFilter:
+    """
+    Fixed-size Bloom filter over strings.
+    
+    Never reports a present item as absent; reports an absent item as
+    present with roughly error_rate probability up to capacity items.
+    """
+    
+    def __init__(self, capacity: int = 100_000, error_rate: float = 0.001):
+        self._size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self._hashes = max(1, round(self._size / capacity * math.log(2)))
+        self._bits = bytearray((self._size + 7) // 8)
+    
+    def _positions(self, item: str) -> Iterator[int]:
+        # Double hashing: k positions from two 64-bit halves of one digest
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return ((h1 + i * h2) % self._size for i in range(self._hashes))
+    
+    def add(self, item: str):
+        for pos in self._positions(item):
+            self._bits[pos >> 3] |= 1 << (pos & 7)
+    
+    def __contains__(self, item: str) -> bool:
+        return all(self._bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(item))
+
 
 class RedisClient:
     """Redis client wrapper with connection pool."""
@@ -15,18 +142,49 @@ class RedisClient:
     def __init__(self):
         self._pool: Optional[redis.ConnectionPool] = None
         self._client: Optional[Redis] = None
+        self._publisher: Optional[_PublishBatcher] = None
+        self._session_bloom: Optional[_BloomFilter] = None
+        self._set_session_script = None
     
     async def connect(self):
         """Initialize Redis connection pool."""
         self._pool = redis.ConnectionPool.from_url(
             settings.redis_url,
-            max_connections=20,
+            max_connections=settings.redis_pool_size,
             decode_responses=True,
+            # RESP3 replies parsed in C; fails loudly if hiredis is missing
+            protocol=3,
+            parser_class=_AsyncHiredisParser,
+            socket_keepalive=True,
+            socket_keepalive_options=_KEEPALIVE_OPTIONS,
+            health_check_interval=30,
+            retry_on_timeout=True,
         )
         self._client = redis.Redis(connection_pool=self._pool)
+        # Runs via EVALSHA; redis-py reloads the script on NOSCRIPT
+        self._set_session_script = self._client.register_script(_SET_SESSION_LUA)
+        self._publisher = _PublishBatcher(
+            self._client,
+            batch_size=settings.redis_publish_batch_size,
+            max_delay=settings.redis_publish_max_delay_ms / 1000,
+        )
+        self._publisher.start()
+        
+        if settings.redis_session_bloom:
+            await self._load_session_bloom()
+    
+    async def _load_session_bloom(self):
+        """Seed the session Bloom filter from the sessions already in Redis."""
+        bloom = _BloomFilter()
+        async for key in self._client.scan_iter(match="session:*", count=1000):
+            bloom.add(key[len("session:"):])
+        self._session_bloom = bloom
     
     async def disconnect(self):
         """Close Redis connections."""
+        if self._publisher:
+            await self._publisher.stop()
+            self._publisher = None
         if self._client:
             await self._client.close()
         if self._pool:
@@ -48,9 +206,38 @@ class RedisClient:
         """Set value in cache with expiration."""
         await self.client.set(key, value, ex=expire)
     
-    async def delete(self, key: str):
-        """Delete key from cache."""
-        await self.client.delete(key)
+    async def get_bytes(self, key: str) -> Optional[bytes]:
+        """Get a binary value, bypassing the pool's response decoding."""
+        return await self.client.execute_command("GET", key, **{NEVER_DECODE: True})
+    
+    async def set_bytes(self, key: str, value: bytes, expire: int = 3600):
+        """Set a binary value with expiration."""
+        await self.client.set(key, value, ex=expire)
+    
+    async def delete(self, key: str) -> int:
+        """Delete key from cache; returns the number of keys removed."""
+        return await self.client.delete(key)
+    
+    async def mget(self, keys: List[str]) -> List[Optional[str]]:
+        """Get multiple values in one round-trip."""
+        if not keys:
+            return []
+        return await self.client.mget(keys)
+    
+    async def mset(self, mapping: Dict[str, str], expire: int = 3600):
+        """Set multiple values with expiration in one round-trip."""
+        if not mapping:
+            return
+        async with self.client.pipeline(transaction=False) as pipe:
+            for key, value in mapping.items():
+                pipe.set(key, value, ex=expire)
+            await pipe.execute()
+    
+    async def delete_many(self, keys: Iterable[str]):
+        """Delete multiple keys; memory is reclaimed server-side in the background."""
+        keys = list(keys)
+        if keys:
+            await self.client.unlink(*keys)
     
     async def delete_pattern(self, pattern: str):
         """Delete all keys matching a pattern."""
@@ -58,33 +245,54 @@ class RedisClient:
         async for key in self.client.scan_iter(match=pattern):
             keys.append(key)
         
-        if keys:
-            await self.client.delete(*keys)
+        await self.delete_many(keys)
     
     async def get_client(self) -> Optional[Redis]:
         """Get the underlying Redis client for advanced operations."""
         return self._client
     
+    # List operations
+    async def push_capped(self, key: str, value: str, max_length: int, expire: int = 3600):
+        """Append to a list, keep only its last max_length items and refresh its TTL."""
+        async with self.client.pipeline(transaction=False) as pipe:
+            pipe.rpush(key, value)
+            pipe.ltrim(key, -max_length, -1)
+            pipe.expire(key, expire)
+            await pipe.execute()
+    
+    async def get_list(self, key: str) -> List[str]:
+        """Get all items of a list."""
+        return await self.client.lrange(key, 0, -1)
+    
     # Session operations
     async def get_session(self, session_id: str) -> Optional[dict]:
         """Get session data."""
+        # Known-absent ids are answered locally without a round-trip
+        if self._session_bloom is not None and session_id not in self._session_bloom:
+            return None
         data = await self.client.hgetall(f"session:{session_id}")
         return data if data else None
     
     async def set_session(self, session_id: str, data: dict, expire: int = 86400):
         """Store session data."""
         key = f"session:{session_id}"
-        await self.client.hset(key, mapping=data)
-        await self.client.expire(key, expire)
+        args = [expire]
+        for field, value in data.items():
+            args.extend((field, value))
+        await self._set_session_script(keys=[key], args=args)
+        if self._session_bloom is not None:
+            self._session_bloom.add(session_id)
     
     async def delete_session(self, session_id: str):
         """Delete session."""
         await self.client.delete(f"session:{session_id}")
     
     # Pub/Sub operations
-    async def publish(self, channel: str, message: str):
-        """Publish message to channel."""
-        await self.client.publish(channel, message)
+    async def publish(self, channel: str, message: str) -> int:
+        """Publish message to channel (batched with concurrent publishes)."""
+        if self._publisher:
+            return await self._publisher.publish(channel, message)
+        return await self.client.publish(channel, message)
     
     def subscribe(self, channel: str):
         """Subscribe to channel."""
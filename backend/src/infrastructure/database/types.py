@@ -0,0 +1,51 @@
+"""
+Custom Column Types
+SQLAlchemy type decorators shared by the domain models
+"""
+from decimal import Decimal, ROUND_HALF_UP
+from typing import NewType, Optional, Union
+
+from sqlalchemy import BigInteger, text
+from sqlalchemy.types import TypeDecorator
+
+CENT = Decimal("0.01")
+
+# Integer minor units; aggregate money as Cents (int64) and convert to
+# Decimal only when building a response
+Cents = NewType("Cents", int)
+
+# Server-side UTC timestamp for naive DateTime columns
+UTC_NOW = text("timezone('utc', now())")
+
+
+def to_cents(value: Union[Decimal, float, int, str]) -> Cents:
+    """Convert an amount to integer cents, rounding half up."""
+    cents = (Decimal(str(value)) * 100).quantize(Decimal("1"), rounding=ROUND_HALF_UP)
+    return Cents(int(cents))
+
+
+def from_cents(cents: int) -> Decimal:
+    """Convert integer cents to a two-place Decimal."""
+    return (Decimal(int(cents)) / 100).quantize(CENT)
+
+
+class Money(TypeDecorator):
+    """
+    Monetary amount stored as BIGINT minor units (cents).
+    
+    The ORM still sees Decimal values with two decimal places, so
+    application code is unchanged while Postgres aggregates on int8.
+    """
+    
+    impl = BigInteger
+    cache_ok = True
+    
+    def process_bind_param(self, value, dialect) -> Optional[int]:
+        if value is None:
+            return None
+        return to_cents(value)
+    
+    def process_result_value(self, value, dialect) -> Optional[Decimal]:
+        if value is None:
+            return None
+        return from_cents(value)
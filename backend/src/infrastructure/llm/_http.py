@@ -0,0 +1,26 @@
+"""
+Shared LLM HTTP Client
+One HTTP/2-capable connection pool for all LLM providers
+"""
+import httpx
+
+# HTTP/2 is used where the server negotiates it (TLS endpoints such as the
+# HuggingFace API); plain http://localhost Ollama stays on keep-alive HTTP/1.1.
+# Limits/http2 must be set on the transport when one is passed.
+shared_async_client = httpx.AsyncClient(
+    timeout=httpx.Timeout(120.0, connect=10.0),
+    transport=httpx.AsyncHTTPTransport(
+        http2=True,
+        retries=2,
+        limits=httpx.Limits(
+            max_keepalive_connections=40,
+            max_connections=100,
+            keepalive_expiry=30.0,
+        ),
+    ),
+)
+
+
+async def close_shared_client():
+    """Close the shared client; called once at application shutdown."""
+    await shared_async_client.aclose()
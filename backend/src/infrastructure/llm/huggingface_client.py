@@ -2,10 +2,90 @@
 HuggingFace Inference API Client
 Cloud LLM integration via HuggingFace
 """
-from typing import Optional, AsyncIterator, List, Dict, Any
-import httpx
+from typing import Optional, AsyncIterator, Awaitable, Callable, List, Dict, Any, Tuple
+import asyncio
+import orjson
 
 from src.config.settings import settings
+from ._http import shared_async_client
+from .llm_parse import format_instruction_prompt
+
+EMBEDDING_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+
+
+class _EmbeddingBatcher:
+    """
+    Coalesces concurrent single-text embedding calls into batched POSTs.
+    
+    Texts arriving within max_delay of each other (up to batch_size) are
+    embedded in one inference request instead of one round-trip each.
+    """
+    
+    def __init__(
+        self,
+        embed: Callable[[List[str]], Awaitable[List[List[float]]]],
+        batch_size: int,
+        max_delay: float,
+    ):
+        self._embed = embed
+        self._batch_size = batch_size
+        self._max_delay = max_delay
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+    
+    async def embed(self, text: str) -> List[float]:
+        """Queue a text and wait for its embedding."""
+        loop = asyncio.get_running_loop()
+        # Started lazily, and restarted if called from a new event loop
+        # (e.g. Celery tasks running asyncio.run per task)
+        if self._task is None or self._loop is not loop or self._task.done():
+            self._queue = asyncio.Queue()
+            self._loop = loop
+            self._task = loop.create_task(self._run(self._queue))
+        
+        future = loop.create_future()
+        self._queue.put_nowait((text, future))
+        return await future
+    
+    async def _collect(self, queue: asyncio.Queue) -> List[Tuple[str, asyncio.Future]]:
+        """Wait for one text, then gather more until size or time limit."""
+        batch = [await queue.get()]
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self._max_delay
+        
+        while len(batch) < self._batch_size:
+            if not queue.empty():
+                batch.append(queue.get_nowait())
+                continue
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        
+        return batch
+    
+    async def _run(self, queue: asyncio.Queue):
+        while True:
+            batch = await self._collect(queue)
+            try:
+                vectors = await self._embed([text for text, _ in batch])
+                if len(vectors) != len(batch):
+                    raise ValueError(
+                        f"Expected {len(batch)} embeddings, got {len(vectors)}"
+                    )
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            
+            for (_, future), vector in zip(batch, vectors):
+                if not future.done():
+                    future.set_result(vector)
 
 
 class HuggingFaceClient:
@@ -15,28 +95,34 @@ class HuggingFaceClient:
         self.api_token = api_token or settings.huggingface_api_token
         self.model = model or settings.huggingface_model
         self.base_url = "https://api-inference.huggingface.co/models"
-        self._client = httpx.AsyncClient(timeout=120.0)
+        self._client = shared_async_client
+        self._headers = {
+            "Authorization": f"Bearer {self.api_token}",
+            "Content-Type": "application/json",
+        }
+        self._embedding_batcher = _EmbeddingBatcher(
+            self._post_embeddings,
+            batch_size=settings.hf_embedding_batch_size,
+            max_delay=settings.hf_embedding_max_delay_ms / 1000,
+        )
     
     async def close(self):
-        """Close HTTP client."""
-        await self._client.aclose()
+        """No-op: the shared HTTP client is closed at application shutdown."""
     
     @property
     def headers(self) -> Dict[str, str]:
         """Get request headers."""
-        return {
-            "Authorization": f"Bearer {self.api_token}",
-            "Content-Type": "application/json",
-        }
+        return self._headers
     
-    async def is_available(self) -> bool:
+    async def is_available(self, timeout: float = 2.0) -> bool:
         """Check if API is available."""
         if not self.api_token:
             return False
         try:
             response = await self._client.get(
                 f"{self.base_url}/{self.model}",
-                headers=self.headers,
+                headers=self._headers,
+                timeout=timeout,
             )
             return response.status_code in [200, 503]  # 503 = model loading
         except Exception:
@@ -62,16 +148,49 @@ class HuggingFaceClient:
         
         response = await self._client.post(
             f"{self.base_url}/{self.model}",
-            headers=self.headers,
-            json=payload,
+            headers=self._headers,
+            content=orjson.dumps(payload),
         )
         response.raise_for_status()
         
-        result = response.json()
+        result = orjson.loads(response.content)
         if isinstance(result, list) and len(result) > 0:
             return result[0].get("generated_text", "")
         return ""
     
+    async def generate_stream(
+        self,
+        prompt: str,
+        max_new_tokens: int = 512,
+        temperature: float = 0.7,
+        top_p: float = 0.95,
+    ) -> AsyncIterator[str]:
+        """Generate completion with streaming (server-sent events)."""
+        payload = {
+            "inputs": prompt,
+            "stream": True,
+            "parameters": {
+                "max_new_tokens": max_new_tokens,
+                "temperature": temperature,
+                "top_p": top_p,
+                "return_full_text": False,
+            }
+        }
+        
+        async with self._client.stream(
+            "POST",
+            f"{self.base_url}/{self.model}",
+            headers=self._headers,
+            content=orjson.dumps(payload),
+        ) as response:
+            response.raise_for_status()
+            async for line in response.aiter_lines():
+                if not line.startswith("data:"):
+                    continue
+                token = orjson.loads(line[5:]).get("token") or {}
+                if token.get("text") and not token.get("special"):
+                    yield token["text"]
+    
     async def chat(
         self,
         messages: List[Dict[str, str]],
@@ -80,44 +199,64 @@ class HuggingFaceClient:
     ) -> str:
         """Chat completion using instruction format."""
         # Format messages as prompt
-        prompt = self._format_messages(messages)
+        prompt = format_instruction_prompt(messages)
         return await self.generate(
             prompt=prompt,
             max_new_tokens=max_new_tokens,
             temperature=temperature,
         )
     
-    def _format_messages(self, messages: List[Dict[str, str]]) -> str:
-        """Format messages for instruction-tuned models."""
-        formatted = []
-        
-        for msg in messages:
-            role = msg.get("role", "user")
-            content = msg.get("content", "")
-            
-            if role == "system":
-                formatted.append(f"<s>[INST] {content}")
-            elif role == "user":
-                if formatted:
-                    formatted.append(f"[INST] {content} [/INST]")
-                else:
-                    formatted.append(f"<s>[INST] {content} [/INST]")
-            elif role == "assistant":
-                formatted.append(f"{content}</s>")
-        
-        return "\n".join(formatted)
+    async def chat_stream(
+        self,
+        messages: List[Dict[str, str]],
+        max_new_tokens: int = 512,
+        temperature: float = 0.7,
+    ) -> AsyncIterator[str]:
+        """Chat completion with streaming."""
+        prompt = format_instruction_prompt(messages)
+        async for token in self.generate_stream(
+            prompt=prompt,
+            max_new_tokens=max_new_tokens,
+            temperature=temperature,
+        ):
+            yield token
     
     async def embeddings(self, texts: List[str]) -> List[List[float]]:
-        """Generate embeddings for texts."""
-        embedding_model = "sentence-transformers/all-MiniLM-L6-v2"
+        """
+        Generate embeddings for texts.
+        
+        Single-text calls are batched with other concurrent callers;
+        multi-text calls are split into batches of hf_embedding_batch_size
+        sent concurrently (at most hf_embedding_concurrency at a time).
+        """
+        if len(texts) == 1:
+            return [await self._embedding_batcher.embed(texts[0])]
+        
+        size = settings.hf_embedding_batch_size
+        if len(texts) <= size:
+            return await self._post_embeddings(texts)
         
+        semaphore = asyncio.Semaphore(settings.hf_embedding_concurrency)
+        
+        async def post_batch(batch: List[str]) -> List[List[float]]:
+            async with semaphore:
+                return await self._post_embeddings(batch)
+        
+        results = await asyncio.gather(*[
+            post_batch(texts[start:start + size])
+            for start in range(0, len(texts), size)
+        ])
+        return [vector for batch in results for vector in batch]
+    
+    async def _post_embeddings(self, texts: List[str]) -> List[List[float]]:
+        """POST one embeddings request for a list of texts."""
         response = await self._client.post(
-            f"{self.base_url}/{embedding_model}",
-            headers=self.headers,
-            json={"inputs": texts},
+            f"{self.base_url}/{EMBEDDING_MODEL}",
+            headers=self._headers,
+            content=orjson.dumps({"inputs": texts}),
         )
         response.raise_for_status()
-        return response.json()
+        return orjson.loads(response.content)
 
 
 # Global HuggingFace client instance
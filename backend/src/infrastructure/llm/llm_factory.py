@@ -4,11 +4,26 @@ Abstraction layer with actual tool calling support
 """
 from typing import Optional, AsyncIterator, List, Dict, Any
 from enum import Enum
-import json
+import asyncio
+import hashlib
+import logging
+from cachetools import TTLCache
+import orjson
 
 from src.config.settings import settings
 from .ollama_client import OllamaClient, ollama_client
 from .huggingface_client import HuggingFaceClient, huggingface_client
+from .llm_parse import format_tool_descriptions, parse_tool_call_from_response
+
+logger = logging.getLogger(__name__)
+
+# Seconds to wait for a provider health probe at startup
+PROBE_TIMEOUT = 2.0
+
+# Deterministic (temperature ~0) chat responses are reused for identical prompts
+RESPONSE_CACHE_SIZE = 512
+RESPONSE_CACHE_TTL = 300  # seconds
+CACHEABLE_TEMPERATURE = 0.01
 
 
 class LLMProvider(str, Enum):
@@ -26,28 +41,46 @@ class LLMFactory:
         self._huggingface = huggingface_client
         self._active_provider: Optional[LLMProvider] = None
         self._initialized = False
+        self._init_lock = asyncio.Lock()
+        self._response_cache: TTLCache = TTLCache(
+            maxsize=RESPONSE_CACHE_SIZE, ttl=RESPONSE_CACHE_TTL
+        )
     
     async def initialize(self):
         """Initialize and detect available providers."""
         if self._initialized:
             return
         
-        # Check Ollama first (preferred for local inference)
-        if await self._ollama.is_available():
-            self._active_provider = LLMProvider.OLLAMA
-            print("✅ Using Ollama for LLM inference")
-        elif await self._huggingface.is_available():
-            self._active_provider = LLMProvider.HUGGINGFACE
-            print("✅ Using HuggingFace for LLM inference")
-        else:
-            print("⚠️ No LLM provider available - using fallback responses")
-        
-        self._initialized = True
+        # Concurrent first callers wait here instead of probing again
+        async with self._init_lock:
+            if self._initialized:
+                return
+            
+            # Probe both providers concurrently; Ollama is still preferred
+            ollama_ok, hf_ok = await asyncio.gather(
+                asyncio.wait_for(self._ollama.is_available(), PROBE_TIMEOUT),
+                asyncio.wait_for(self._huggingface.is_available(), PROBE_TIMEOUT),
+                return_exceptions=True,
+            )
+            
+            if ollama_ok is True:
+                self._active_provider = LLMProvider.OLLAMA
+                logger.info("✅ Using Ollama for LLM inference")
+            elif hf_ok is True:
+                self._active_provider = LLMProvider.HUGGINGFACE
+                logger.info("✅ Using HuggingFace for LLM inference")
+            else:
+                logger.warning("⚠️ No LLM provider available - using fallback responses")
+            
+            self._initialized = True
     
     async def close(self):
         """Close all clients."""
-        await self._ollama.close()
-        await self._huggingface.close()
+        await asyncio.gather(
+            self._ollama.close(),
+            self._huggingface.close(),
+            return_exceptions=True,
+        )
     
     @property
     def provider(self) -> Optional[LLMProvider]:
@@ -64,8 +97,16 @@ class LLMFactory:
         messages: List[Dict[str, str]],
         provider: LLMProvider = LLMProvider.AUTO,
         temperature: float = 0.7,
+        cache_control: bool = True,
     ) -> str:
-        """Chat completion using available provider."""
+        """
+        Chat completion using available provider.
+        
+        Collects chat_stream() so streaming and non-streaming callers share
+        one code path. Near-deterministic calls (temperature <= 0.01) are
+        served from a short-lived response cache; pass cache_control=False
+        to bypass it.
+        """
         if not self._initialized:
             await self.initialize()
         
@@ -73,18 +114,66 @@ class LLMFactory:
             provider = self._active_provider
         
         if provider == LLMProvider.OLLAMA:
-            return await self._ollama.chat(
-                messages=messages,
-                temperature=temperature,
-            )
+            client = self._ollama
         elif provider == LLMProvider.HUGGINGFACE:
-            return await self._huggingface.chat(
+            client = self._huggingface
+        else:
+            # Fallback: simple response based on last message
+            return self._generate_fallback_response(messages)
+        
+        key = None
+        if cache_control and temperature <= CACHEABLE_TEMPERATURE:
+            key = self._response_cache_key(provider, client.model, temperature, messages)
+            cached = self._response_cache.get(key)
+            if cached is not None:
+                return cached
+        
+        response = "".join([
+            token
+            async for token in self.chat_stream(
                 messages=messages,
+                provider=provider,
                 temperature=temperature,
             )
+        ])
+        if key is not None:
+            self._response_cache[key] = response
+        return response
+    
+    @staticmethod
+    def _response_cache_key(
+        provider: LLMProvider,
+        model: str,
+        temperature: float,
+        messages: List[Dict[str, str]],
+    ) -> bytes:
+        """SHA-256 of provider, model, temperature and the serialized messages."""
+        prefix = f"{provider.value}|{model}|{temperature}|".encode()
+        return hashlib.sha256(prefix + orjson.dumps(messages)).digest()
+    
+    async def chat_stream(
+        self,
+        messages: List[Dict[str, str]],
+        provider: LLMProvider = LLMProvider.AUTO,
+        temperature: float = 0.7,
+    ) -> AsyncIterator[str]:
+        """Chat completion streamed token by token from the available provider."""
+        if not self._initialized:
+            await self.initialize()
+        
+        if provider == LLMProvider.AUTO:
+            provider = self._active_provider
+        
+        if provider == LLMProvider.OLLAMA:
+            stream = self._ollama.chat_stream(messages=messages, temperature=temperature)
+        elif provider == LLMProvider.HUGGINGFACE:
+            stream = self._huggingface.chat_stream(messages=messages, temperature=temperature)
         else:
-            # Fallback: simple response based on last message
-            return self._generate_fallback_response(messages)
+            yield self._generate_fallback_response(messages)
+            return
+        
+        async for token in stream:
+            yield token
     
     async def chat_with_tools(
         self,
@@ -118,28 +207,24 @@ class LLMFactory:
     ) -> Dict[str, Any]:
         """Ollama chat with tool calling."""
         try:
-            # Format messages for Ollama
-            formatted_messages = []
-            for msg in messages:
-                role = msg.get("role", "user")
-                content = msg.get("content", "")
-                
-                if role == "tool":
-                    # Convert tool results to assistant context
-                    formatted_messages.append({
-                        "role": "user",
-                        "content": f"Tool result: {content}"
-                    })
-                else:
-                    formatted_messages.append({
-                        "role": role,
-                        "content": content
-                    })
+            # Format messages for Ollama: only rebuild the list when some
+            # message is a tool result or carries extra keys (e.g. tool_calls)
+            if any(len(msg) != 2 or msg.get("role") == "tool" for msg in messages):
+                # Tool results are converted to user-visible context
+                formatted_messages = [
+                    {"role": "user", "content": f"Tool result: {msg.get('content', '')}"}
+                    if msg.get("role") == "tool"
+                    else {"role": msg.get("role", "user"), "content": msg.get("content", "")}
+                    for msg in messages
+                ]
+            else:
+                formatted_messages = messages
             
             # Add tool descriptions to system prompt
-            tool_desc = self._format_tool_descriptions(tools)
-            if formatted_messages and formatted_messages[0]["role"] == "system":
-                formatted_messages[0]["content"] += f"\n\nAvailable tools:\n{tool_desc}"
+            tool_desc = format_tool_descriptions(tools)
+            formatted_messages = self._append_to_system_prompt(
+                formatted_messages, f"\n\nAvailable tools:\n{tool_desc}"
+            )
             
             # Get response
             response = await self._ollama.chat(
@@ -148,7 +233,7 @@ class LLMFactory:
             )
             
             # Try to parse tool calls from response
-            tool_calls = self._parse_tool_call_from_response(response, tools)
+            tool_calls = parse_tool_call_from_response(response, tools)
             if tool_calls:
                 return {
                     "content": "",
@@ -158,6 +243,7 @@ class LLMFactory:
             return {"content": response}
             
         except Exception as e:
+            logger.exception("Ollama tool-calling chat failed")
             return {"content": f"Error: {str(e)}"}
     
     async def _huggingface_chat_with_tools(
@@ -168,17 +254,12 @@ class LLMFactory:
     ) -> Dict[str, Any]:
         """HuggingFace chat with tool calling."""
         try:
-            # Format for HuggingFace
-            formatted_messages = []
-            for msg in messages:
-                role = msg.get("role", "user")
-                content = msg.get("content", "")
-                formatted_messages.append({"role": role, "content": content})
-            
-            # Add tool descriptions
-            tool_desc = self._format_tool_descriptions(tools)
-            if formatted_messages and formatted_messages[0]["role"] == "system":
-                formatted_messages[0]["content"] += f"\n\nYou have these tools:\n{tool_desc}"
+            # The prompt formatter only reads role/content, so the caller's
+            # messages are used as-is
+            tool_desc = format_tool_descriptions(tools)
+            formatted_messages = self._append_to_system_prompt(
+                messages, f"\n\nYou have these tools:\n{tool_desc}"
+            )
             
             response = await self._huggingface.chat(
                 messages=formatted_messages,
@@ -186,7 +267,7 @@ class LLMFactory:
             )
             
             # Parse tool calls
-            tool_calls = self._parse_tool_call_from_response(response, tools)
+            tool_calls = parse_tool_call_from_response(response, tools)
             if tool_calls:
                 return {
                     "content": "",
@@ -196,405 +277,19 @@ class LLMFactory:
             return {"content": response}
             
         except Exception as e:
+            logger.exception("HuggingFace tool-calling chat failed")
             return {"content": f"Error: {str(e)}"}
     
-    def _format_tool_descriptions(self, tools: List[Dict[str, Any]]) -> str:
-        """Format tool descriptions for prompt injection."""
-        lines = []
-        for tool in tools:
-            func = tool.get("function", {})
-            name = func.get("name", "unknown")
-            desc = func.get("description", "")
-            params = func.get("parameters", {})
-            
-            param_str = ", ".join(params.get("properties", {}).keys())
-            lines.append(f"- {name}({param_str}): {desc[:100]}")
-        
-        return "\n".join(lines[:15])  # Limit to 15 tools in prompt
-    
-    def _parse_tool_call_from_response(
-        self,
-        response: str,
-        tools: List[Dict[str, Any]],
-    ) -> Optional[List[Dict[str, Any]]]:
-        """
-        Parse tool calls from LLM response.
-        
-        Looks for patterns like:
-        - Tool: tool_name(arg1=value1, arg2=value2)
-        - I'll use tool_name with {"arg": "value"}
-        - <tool_call>{"name": "...", "args": {...}}</tool_call>
-        
-        Returns a list of tool calls to support multiple intents in one message.
-        """
-        import re
-        
-        response_lower = response.lower()
-        tool_names = [t["function"]["name"] for t in tools]
-        tool_calls = []
-        
-        # Check for JSON tool call format
-        json_pattern = r'\{[^{}]*"name"\s*:\s*"(\w+)"[^{}]*"args"\s*:\s*(\{[^{}]*\})[^{}]*\}'
-        json_match = re.search(json_pattern, response)
-        if json_match:
-            try:
-                name = json_match.group(1)
-                args = json.loads(json_match.group(2))
-                if name in tool_names:
-                    return [{
-                        "id": f"call_{name}",
-                        "function": {
-                            "name": name,
-                            "arguments": args,
-                        }
-                    }]
-            except:
-                pass
-        
-        # Check for function call pattern: tool_name(args)
-        for tool_name in tool_names:
-            pattern = rf'{tool_name}\s*\(([^)]*)\)'
-            match = re.search(pattern, response, re.IGNORECASE)
-            if match:
-                args_str = match.group(1)
-                args = self._parse_args_string(args_str)
-                return [{
-                    "id": f"call_{tool_name}",
-                    "function": {
-                        "name": tool_name,
-                        "arguments": args,
-                    }
-                }]
-        
-        # Check for intent keywords - support multiple intents
-        intent_to_tool = {
-            "subscription": "create_subscription",
-            "subscribe": "create_subscription",
-            "recurring fee": "create_subscription",
-            "monthly fee": "create_subscription",
-            "bill": "create_bill",
-            "payment": "create_bill",
-            "due": "create_bill",
-            "convert": "convert_currency",
-            "exchange": "convert_currency",
-            "currency": "convert_currency",
-            "stock": "get_stock_price",
-            "price of": "get_stock_price",
-            "expense": "create_expense",
-            "spent": "create_expense",
-            "bought": "create_expense",
-            "goal": "create_goal",
-            "save for": "create_goal",
-            "spending": "get_spending_by_category",
-            "chart": "generate_chart",
-            "balance": "get_balance",
-            "how much": "get_balance",
-            "income": "create_income",
-            "salary": "create_income",
-            "earned": "create_income",
-        }
-        
-        # Track which tools we've added to avoid duplicates
-        added_tools = set()
-        
-        # For multi-intent messages (e.g., "subscription AND bill")
-        # Split by "and" to process each part separately
-        if " and " in response_lower:
-            parts = response.split(" and ")
-        else:
-            parts = [response]
-        
-        for part in parts:
-            part_lower = part.lower()
-            for keyword, tool_name in intent_to_tool.items():
-                if keyword in part_lower and tool_name in tool_names and tool_name not in added_tools:
-                    # Extract potential arguments from context
-                    args = self._extract_args_from_context(part, tool_name)
-                    if args:
-                        tool_calls.append({
-                            "id": f"call_{tool_name}_{len(tool_calls)}",
-                            "function": {
-                                "name": tool_name,
-                                "arguments": args,
-                            }
-                        })
-                        added_tools.add(tool_name)
-                        break  # Move to next part after finding a match
-        
-        return tool_calls if tool_calls else None
-    
-    def _parse_relative_date(self, text: str) -> Optional[str]:
-        """Parse relative date expressions to YYYY-MM-DD format."""
-        from datetime import date, timedelta
-        import re
-        
-        today = date.today()
-        text_lower = text.lower()
-        
-        # "tomorrow"
-        if "tomorrow" in text_lower:
-            return (today + timedelta(days=1)).strftime('%Y-%m-%d')
-        
-        # "next week"
-        if "next week" in text_lower:
-            return (today + timedelta(weeks=1)).strftime('%Y-%m-%d')
-        
-        # "in X days" or "X days later" or "X days from now"
-        days_match = re.search(r'(\d+)\s*days?\s*(?:later|from now)?', text_lower)
-        if days_match:
-            days = int(days_match.group(1))
-            return (today + timedelta(days=days)).strftime('%Y-%m-%d')
-        
-        # "in X weeks" or "X weeks later" or "X week later"
-        weeks_match = re.search(r'(\d+)\s*weeks?\s*(?:later|from now)?', text_lower)
-        if weeks_match:
-            weeks = int(weeks_match.group(1))
-            return (today + timedelta(weeks=weeks)).strftime('%Y-%m-%d')
-        
-        # "next month"
-        if "next month" in text_lower:
-            next_month = today.replace(day=1)
-            if today.month == 12:
-                next_month = next_month.replace(year=today.year + 1, month=1)
-            else:
-                next_month = next_month.replace(month=today.month + 1)
-            return next_month.strftime('%Y-%m-%d')
-        
-        return None
-    
-    def _parse_args_string(self, args_str: str) -> Dict[str, Any]:
-        """Parse arguments from string like 'arg1=value1, arg2=value2'."""
-        args = {}
-        for part in args_str.split(","):
-            if "=" in part:
-                key, value = part.split("=", 1)
-                key = key.strip()
-                value = value.strip().strip('"\'')
-                try:
-                    args[key] = float(value)
-                except ValueError:
-                    args[key] = value
-        return args
-    
-    def _extract_args_from_context(self, text: str, tool_name: str) -> Optional[Dict[str, Any]]:
-        """Extract arguments from natural language context."""
-        import re
-        
-        text_lower = text.lower()
-        
-        if tool_name == "convert_currency":
-            # Look for patterns like "100 USD to EUR"
-            pattern = r'(\d+(?:\.\d+)?)\s*([a-zA-Z]{3})\s*(?:to|into)\s*([a-zA-Z]{3})'
-            match = re.search(pattern, text, re.IGNORECASE)
-            if match:
-                return {
-                    "amount": float(match.group(1)),
-                    "from_currency": match.group(2).upper(),
-                    "to_currency": match.group(3).upper(),
-                }
-        
-        elif tool_name == "get_stock_price":
-            # Look for stock symbols
-            symbols = re.findall(r'\b([A-Z]{1,5})\b', text.upper())
-            common_stocks = ["AAPL", "GOOGL", "MSFT", "TSLA", "AMZN", "META", "NVDA", "AMD"]
-            for sym in symbols:
-                if sym in common_stocks:
-                    return {"symbol": sym}
-        
-        elif tool_name == "create_expense":
-            # Improved expense parsing
-            amount_match = re.search(r'(\d+(?:\.\d+)?)\s*(?:usd|dollars?|\$|฿|thb|eur|€)?', text_lower)
-            if not amount_match:
-                return None
-            
-            amount = float(amount_match.group(1))
-            
-            # Extract currency
-            currency = "USD"
-            currency_match = re.search(r'(?:usd|dollars?|\$|฿|thb|eur|€)', text_lower)
-            if currency_match:
-                curr_text = currency_match.group(0)
-                if curr_text in ['฿', 'thb']:
-                    currency = "THB"
-                elif curr_text in ['€', 'eur']:
-                    currency = "EUR"
-                else:
-                    currency = "USD"
-            
-            # Extract merchant name - look for common patterns
-            merchant = "Unknown"
-            
-            # Pattern 1: "spent $X at MERCHANT"
-            at_match = re.search(r'(?:spent|paid|bought).*?(?:at|from)\s+([A-Za-z][A-Za-z0-9\s&\'.-]+?)(?:\s+for|\s+on|\s+in|$)', text, re.IGNORECASE)
-            if at_match:
-                merchant = at_match.group(1).strip()
-            else:
-                # Pattern 2: "MERCHANT $X" or "$X MERCHANT"
-                # Look for capitalized words near the amount
-                words = text.split()
-                amount_idx = -1
-                for i, word in enumerate(words):
-                    if re.search(r'\d+(?:\.\d+)?', word):
-                        amount_idx = i
-                        break
-                
-                if amount_idx >= 0:
-                    # Check words around the amount
-                    for offset in [-2, -1, 1, 2]:
-                        idx = amount_idx + offset
-                        if 0 <= idx < len(words):
-                            word = words[idx]
-                            # Skip common words
-                            if word.lower() not in ['spent', 'paid', 'bought', 'at', 'for', 'on', 'the', 'a', 'an', 'in', 'to', 'from', '$', '฿', '€']:
-                                # Clean the word
-                                clean_word = re.sub(r'[^\w\s&\'-]', '', word)
-                                if clean_word and len(clean_word) > 1:
-                                    merchant = clean_word.title()
-                                    break
-            
-            # Extract category - look for common expense categories
-            category = "other"
-            category_keywords = {
-                "food": ["food", "restaurant", "lunch", "dinner", "breakfast", "meal", "eat", "cafe", "coffee"],
-                "transport": ["uber", "taxi", "bus", "train", "gas", "fuel", "parking", "transport"],
-                "shopping": ["shopping", "store", "mall", "amazon", "bought", "purchase"],
-                "entertainment": ["movie", "cinema", "game", "concert", "show", "entertainment"],
-                "bills": ["bill", "utility", "electric", "water", "internet", "phone"],
-                "groceries": ["grocery", "groceries", "supermarket", "market"],
-                "health": ["doctor", "hospital", "pharmacy", "medicine", "health"],
-            }
-            
-            for cat, keywords in category_keywords.items():
-                if any(kw in text_lower for kw in keywords):
-                    category = cat
-                    break
-            
-            # Return parsed expense data
-            return {
-                "amount": amount,
-                "merchant": merchant,
-                "category": category,
-                "currency": currency,
-            }
-        
-        elif tool_name == "create_subscription":
-            # Pattern: "$50 gym subscription" or "gym subscription for $50"
-            from datetime import date
-            
-            amount_match = re.search(r'(\d+(?:\.\d+)?)\s*(?:\$|usd|dollars?)?', text_lower)
-            if not amount_match:
-                # Try with $ before the number
-                amount_match = re.search(r'\$\s*(\d+(?:\.\d+)?)', text_lower)
-            if not amount_match:
-                return None
-            
-            amount = float(amount_match.group(1))
-            
-            # Extract name - look for subscription keywords
-            name = "Subscription"
-            name_patterns = [
-                r'(\w+)\s+subscription',  # "gym subscription"
-                r'subscribe\s+(?:to\s+)?(\w+)',  # "subscribe to netflix"
-                r'(\w+)\s+for\s+\$?\d+',  # "netflix for $15"
-            ]
-            for pattern in name_patterns:
-                match = re.search(pattern, text_lower)
-                if match:
-                    name = match.group(1).title()
-                    break
-            
-            # Detect billing cycle
-            billing_cycle = "monthly"  # default
-            if any(w in text_lower for w in ["weekly", "every week", "per week"]):
-                billing_cycle = "weekly"
-            elif any(w in text_lower for w in ["yearly", "annual", "per year"]):
-                billing_cycle = "yearly"
-            elif any(w in text_lower for w in ["daily", "every day", "per day"]):
-                billing_cycle = "daily"
-            
-            # Get next billing date
-            next_billing_date = self._parse_relative_date(text) or date.today().strftime('%Y-%m-%d')
-            
-            return {
-                "name": name,
-                "amount": amount,
-                "billing_cycle": billing_cycle,
-                "next_billing_date": next_billing_date,
-            }
-        
-        elif tool_name == "create_bill":
-            # Pattern: "$40 bill to pay in 1 week" or "electric bill $100"
-            from datetime import date
-            
-            amount_match = re.search(r'(\d+(?:\.\d+)?)\s*(?:\$|usd|dollars?)?', text_lower)
-            if not amount_match:
-                # Try with $ before the number
-                amount_match = re.search(r'\$\s*(\d+(?:\.\d+)?)', text_lower)
-            if not amount_match:
-                return None
-            
-            amount = float(amount_match.group(1))
-            
-            # Extract name
-            name = "Bill"
-            bill_patterns = [
-                r'(\w+)\s+bill',  # "electric bill"
-                r'bill\s+(?:for\s+)?(\w+)',  # "bill for rent"
-            ]
-            for pattern in bill_patterns:
-                match = re.search(pattern, text_lower)
-                if match:
-                    extracted = match.group(1)
-                    # Skip common non-name words
-                    if extracted not in ['a', 'the', '40', '50', 'my', 'to', 'be', 'and']:
-                        name = extracted.title()
-                        break
-            
-            # Get due date
-            due_date = self._parse_relative_date(text) or date.today().strftime('%Y-%m-%d')
-            
-            # Check if recurring
-            is_recurring = any(w in text_lower for w in ["recurring", "monthly", "every month", "each month"])
-            
-            return {
-                "name": name,
-                "amount": amount,
-                "due_date": due_date,
-                "is_recurring": is_recurring,
-            }
-        
-        elif tool_name == "create_income":
-            # Pattern: "add $5000 salary" or "received $1000 from freelance"
-            amount_match = re.search(r'(\d+(?:\.\d+)?)\s*(?:\$|usd|dollars?)?', text_lower)
-            if not amount_match:
-                amount_match = re.search(r'\$\s*(\d+(?:\.\d+)?)', text_lower)
-            if not amount_match:
-                return None
-            
-            amount = float(amount_match.group(1))
-            
-            # Extract source
-            source = "Income"
-            source_keywords = {
-                "salary": ["salary", "paycheck", "wages"],
-                "freelance": ["freelance", "contract", "gig"],
-                "investment": ["investment", "dividend", "interest"],
-                "bonus": ["bonus"],
-                "rental": ["rent", "rental"],
-            }
-            
-            for src, keywords in source_keywords.items():
-                if any(kw in text_lower for kw in keywords):
-                    source = src.title()
-                    break
-            
-            return {
-                "amount": amount,
-                "source": source,
-            }
-        
-        # No args extracted for this tool
-        return None
+    @staticmethod
+    def _append_to_system_prompt(
+        messages: List[Dict[str, Any]],
+        suffix: str,
+    ) -> List[Dict[str, Any]]:
+        """Return messages with suffix added to a leading system prompt (copy-on-write)."""
+        if not messages or messages[0].get("role") != "system":
+            return messages
+        first = messages[0]
+        return [{**first, "content": first.get("content", "") + suffix}, *messages[1:]]
     
     def _parse_intent_fallback(
         self,
@@ -605,7 +300,7 @@ class LLMFactory:
         last_message = messages[-1].get("content", "") if messages else ""
         
         # Parse tool calls from user message
-        tool_calls = self._parse_tool_call_from_response(last_message, tools)
+        tool_calls = parse_tool_call_from_response(last_message, tools)
         if tool_calls:
             return {
                 "content": "",
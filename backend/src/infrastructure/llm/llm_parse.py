@@ -0,0 +1,679 @@
+"""
+LLM Response Parsing
+Tool-call parsing and prompt formatting helpers shared by the LLM clients
+"""
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+from datetime import date, timedelta
+from functools import lru_cache
+import re
+import orjson
+
+try:
+    import re2 as regex
+except ImportError:  # optional: linear-time engine, stdlib re otherwise
+    regex = re
+
+try:
+    import ahocorasick
+except ImportError:  # optional: fall back to per-keyword substring checks
+    ahocorasick = None
+
+# Patterns used by the response parsers, compiled once at import. RE2 (when
+# installed) matches in linear time, so odd LLM output cannot backtrack.
+_CONVERT_RE = regex.compile(r'(?i)(\d+(?:\.\d+)?)\s*([a-zA-Z]{3})\s*(?:to|into)\s*([a-zA-Z]{3})')
+_TICKER_RE = regex.compile(r'\b([A-Za-z]{1,5})\b')
+_AMOUNT_RE = regex.compile(r'(\d+(?:\.\d+)?)')
+_CURRENCY_RE = regex.compile(r'(?:usd|dollars?|\$|฿|thb|eur|€)')
+_MERCHANT_AT_RE = regex.compile(r"(?i)(?:spent|paid|bought).*?(?:at|from)\s+([A-Za-z][A-Za-z0-9\s&'.-]+?)(?:\s+for|\s+on|\s+in|$)")
+_NUMBER_RE = regex.compile(r'\d+(?:\.\d+)?')
+_NON_WORD_RE = re.compile(r"[^\w\s&'-]")  # stdlib: keeps Unicode letters
+_REL_DAYS_WEEKS_RE = regex.compile(r'(\d+)\s*(days?|weeks?)\s*(?:later|from now)?')
+# Name patterns use stdlib re: RE2's \w is ASCII-only ("müller bill" -> "ller")
+_SUBSCRIPTION_NAME_RES = (
+    re.compile(r'(\w+)\s+subscription'),  # "gym subscription", "café subscription"
+    re.compile(r'subscribe\s+(?:to\s+)?(\w+)'),  # "subscribe to netflix"
+    re.compile(r'(\w+)\s+for\s+\$?\d+'),  # "netflix for $15"
+)
+_BILL_NAME_RES = (
+    re.compile(r'(\w+)\s+bill'),  # "electric bill", "müller bill"
+    re.compile(r'bill\s+(?:for\s+)?(\w+)'),  # "bill for rent"
+)
+
+# Tools whose arguments need an amount; the message is rejected without one
+_AMOUNT_TOOLS = frozenset({"create_expense", "create_subscription", "create_bill", "create_income"})
+
+_COMMON_STOCKS = frozenset({"AAPL", "GOOGL", "MSFT", "TSLA", "AMZN", "META", "NVDA", "AMD"})
+_MERCHANT_STOPWORDS = frozenset({
+    "spent", "paid", "bought", "at", "for", "on", "the", "a", "an", "in", "to", "from", "$", "฿", "€",
+})
+_BILL_NAME_STOPWORDS = frozenset({"a", "the", "40", "50", "my", "to", "be", "and"})
+
+# Keyword -> tool, checked in order (first hit per message part wins)
+_INTENT_TO_TOOL = (
+    ("subscription", "create_subscription"),
+    ("subscribe", "create_subscription"),
+    ("recurring fee", "create_subscription"),
+    ("monthly fee", "create_subscription"),
+    ("bill", "create_bill"),
+    ("payment", "create_bill"),
+    ("due", "create_bill"),
+    ("convert", "convert_currency"),
+    ("exchange", "convert_currency"),
+    ("currency", "convert_currency"),
+    ("stock", "get_stock_price"),
+    ("price of", "get_stock_price"),
+    ("expense", "create_expense"),
+    ("spent", "create_expense"),
+    ("bought", "create_expense"),
+    ("goal", "create_goal"),
+    ("save for", "create_goal"),
+    ("spending", "get_spending_by_category"),
+    ("chart", "generate_chart"),
+    ("balance", "get_balance"),
+    ("how much", "get_balance"),
+    ("income", "create_income"),
+    ("salary", "create_income"),
+    ("earned", "create_income"),
+)
+_INTENT_KEYWORDS = frozenset(keyword for keyword, _ in _INTENT_TO_TOOL)
+
+_CATEGORY_KEYWORDS: Tuple[Tuple[str, Tuple[str, ...]], ...] = (
+    ("food", ("food", "restaurant", "lunch", "dinner", "breakfast", "meal", "eat", "cafe", "coffee")),
+    ("transport", ("uber", "taxi", "bus", "train", "gas", "fuel", "parking", "transport")),
+    ("shopping", ("shopping", "store", "mall", "amazon", "bought", "purchase")),
+    ("entertainment", ("movie", "cinema", "game", "concert", "show", "entertainment")),
+    ("bills", ("bill", "utility", "electric", "water", "internet", "phone")),
+    ("groceries", ("grocery", "groceries", "supermarket", "market")),
+    ("health", ("doctor", "hospital", "pharmacy", "medicine", "health")),
+)
+
+_SOURCE_KEYWORDS: Tuple[Tuple[str, Tuple[str, ...]], ...] = (
+    ("salary", ("salary", "paycheck", "wages")),
+    ("freelance", ("freelance", "contract", "gig")),
+    ("investment", ("investment", "dividend", "interest")),
+    ("bonus", ("bonus",)),
+    ("rental", ("rent", "rental")),
+)
+
+
+def _group_automaton(groups: Tuple[Tuple[str, Tuple[str, ...]], ...]) -> Any:
+    """
+    Build an automaton mapping each keyword to the index of its group.
+    
+    A keyword listed in several groups keeps the earliest one.
+    Returns None when pyahocorasick is not installed.
+    """
+    if ahocorasick is None:
+        return None
+    
+    keyword_to_group: Dict[str, int] = {}
+    for index, (_, keywords) in enumerate(groups):
+        for keyword in keywords:
+            keyword_to_group.setdefault(keyword, index)
+    
+    automaton = ahocorasick.Automaton()
+    for keyword, index in keyword_to_group.items():
+        automaton.add_word(keyword, index)
+    automaton.make_automaton()
+    return automaton
+
+
+def _first_group(
+    automaton: Any,
+    groups: Tuple[Tuple[str, Tuple[str, ...]], ...],
+    text_lower: str,
+) -> Optional[str]:
+    """Name of the first group (in declaration order) with a keyword in the text."""
+    if automaton is None:
+        for name, keywords in groups:
+            if any(kw in text_lower for kw in keywords):
+                return name
+        return None
+    
+    best = min((index for _, index in automaton.iter(text_lower)), default=None)
+    return None if best is None else groups[best][0]
+
+
+_CATEGORY_AUTOMATON = _group_automaton(_CATEGORY_KEYWORDS)
+_SOURCE_AUTOMATON = _group_automaton(_SOURCE_KEYWORDS)
+
+# (tools list, rendered descriptions) from the last format_tool_descriptions call
+_last_tool_descriptions: Tuple[Optional[List[Dict[str, Any]]], str] = (None, "")
+
+# (tools list, tool names) from the last _tool_names call
+_last_tool_names: Tuple[Optional[List[Dict[str, Any]]], Tuple[str, ...]] = (None, ())
+
+
+@lru_cache(maxsize=32)
+def _tool_call_patterns(tool_names: Tuple[str, ...]) -> Dict[str, "re.Pattern[str]"]:
+    """Compile the `tool_name(args)` pattern for each tool in a tool set."""
+    return {
+        name: regex.compile(rf'(?i){re.escape(name)}\s*\(([^)]*)\)')
+        for name in tool_names
+    }
+
+
+@lru_cache(maxsize=32)
+def _keyword_automaton(tool_names: Tuple[str, ...]) -> Any:
+    """
+    Build one Aho-Corasick automaton over a tool set's names and intent keywords.
+    
+    Returns None when pyahocorasick is not installed.
+    """
+    if ahocorasick is None:
+        return None
+    
+    automaton = ahocorasick.Automaton()
+    for name in tool_names:
+        automaton.add_word(name.lower(), ("tool", name))
+    for index, (keyword, tool_name) in enumerate(_INTENT_TO_TOOL):
+        if tool_name in tool_names:
+            automaton.add_word(keyword, ("intent", index))
+    automaton.make_automaton()
+    return automaton
+
+
+@lru_cache(maxsize=8)
+def _render_tools(tools_key: Tuple[Tuple[str, str, Tuple[str, ...]], ...]) -> str:
+    """Render (name, description, param names) tuples into the tool prompt block."""
+    return "\n".join(
+        f"- {name}({', '.join(params)}): {desc[:100]}"
+        for name, desc, params in tools_key
+    )
+
+
+def _scan_keywords(
+    automaton: Any,
+    text_lower: str,
+) -> Tuple[Set[str], List[Tuple[int, int, int]]]:
+    """
+    Scan lowercased text once for tool names and intent keywords.
+    
+    Returns the tool names seen and each intent hit as
+    (start, end, index into `_INTENT_TO_TOOL`).
+    """
+    tool_hits: Set[str] = set()
+    intent_hits: List[Tuple[int, int, int]] = []
+    for last, (kind, value) in automaton.iter(text_lower):
+        if kind == "tool":
+            tool_hits.add(value)
+        else:
+            end = last + 1
+            intent_hits.append((end - len(_INTENT_TO_TOOL[value][0]), end, value))
+    return tool_hits, intent_hits
+
+
+def _intents_between(
+    intent_hits: List[Tuple[int, int, int]],
+    start: int,
+    end: int,
+) -> List[Tuple[str, str]]:
+    """Matched (keyword, tool) pairs within [start, end), in `_INTENT_TO_TOOL` priority order."""
+    indexes = {index for hit_start, hit_end, index in intent_hits if hit_start >= start and hit_end <= end}
+    return [_INTENT_TO_TOOL[i] for i in sorted(indexes)]
+
+
+def format_tool_descriptions(tools: List[Dict[str, Any]]) -> str:
+    """
+    Format tool descriptions for prompt injection.
+    
+    The last list rendered is remembered by identity (a reference is held,
+    so its id cannot be reused); the agent passes the same cached schema
+    list every turn. Other lists go through the content-keyed cache.
+    """
+    global _last_tool_descriptions
+    last_tools, last_text = _last_tool_descriptions
+    if last_tools is tools:
+        return last_text
+    
+    tools_key: List[Tuple[str, str, Tuple[str, ...]]] = []
+    for tool in tools[:15]:  # Limit to 15 tools in prompt
+        func = tool.get("function", {})
+        tools_key.append((
+            func.get("name", "unknown"),
+            func.get("description", ""),
+            tuple(func.get("parameters", {}).get("properties", {}).keys()),
+        ))
+    text = _render_tools(tuple(tools_key))
+    _last_tool_descriptions = (tools, text)
+    return text
+
+
+def format_instruction_prompt(messages: List[Dict[str, str]]) -> str:
+    """Format chat messages as an [INST] prompt for instruction-tuned models."""
+    formatted: List[str] = []
+    
+    for msg in messages:
+        role = msg.get("role", "user")
+        content = msg.get("content", "")
+        
+        if role == "system":
+            formatted.append(f"<s>[INST] {content}")
+        elif role == "user":
+            if formatted:
+                formatted.append(f"[INST] {content} [/INST]")
+            else:
+                formatted.append(f"<s>[INST] {content} [/INST]")
+        elif role == "assistant":
+            formatted.append(f"{content}</s>")
+    
+    return "\n".join(formatted)
+
+
+def _iter_json_objects(text: str) -> Iterator[str]:
+    """
+    Yield every brace-balanced {...} slice of text, innermost first.
+    
+    A linear scan with a stack of open-brace offsets; braces inside JSON
+    strings (escapes respected) are ignored. An object that never closes
+    may have swallowed later objects into a bogus string, e.g. the stray
+    quote in '{ 12.5 " goal {"name": "get_balance", "args": {}}', so the
+    scan then restarts at the next brace after its start.
+    """
+    seen: Set[Tuple[int, int]] = set()
+    start = 0
+    while start >= 0:
+        opens: List[int] = []
+        in_string = escaped = False
+        for i in range(start, len(text)):
+            ch = text[i]
+            if in_string:
+                if escaped:
+                    escaped = False
+                elif ch == "\\":
+                    escaped = True
+                elif ch == '"':
+                    in_string = False
+            elif ch == "{":
+                opens.append(i)
+            elif ch == "}":
+                if opens:
+                    span = (opens.pop(), i + 1)
+                    if span not in seen:
+                        seen.add(span)
+                        yield text[span[0]:span[1]]
+            elif ch == '"' and opens:
+                # Quotes only matter inside an object; prose quotes are skipped
+                in_string = True
+        start = text.find("{", opens[0] + 1) if opens else -1
+
+
+def parse_tool_call_from_response(
+    response: str,
+    tools: List[Dict[str, Any]],
+) -> Optional[List[Dict[str, Any]]]:
+    """
+    Parse tool calls from LLM response.
+    
+    Looks for patterns like:
+    - Tool: tool_name(arg1=value1, arg2=value2)
+    - I'll use tool_name with {"arg": "value"}
+    - <tool_call>{"name": "...", "args": {...}}</tool_call>
+    
+    Returns a list of tool calls to support multiple intents in one message.
+    """
+    return parse_tool_calls_batch([response], tools)[0]
+
+
+def _tool_names(tools: List[Dict[str, Any]]) -> Tuple[str, ...]:
+    """
+    Tool names of a tools list, in order.
+    
+    Remembered for the last list seen (by identity, holding a reference);
+    the names tuple keys the cached call patterns, whose dict doubles as
+    the O(1) name-membership index.
+    """
+    global _last_tool_names
+    last_tools, last_names = _last_tool_names
+    if last_tools is tools:
+        return last_names
+    names = tuple(t["function"]["name"] for t in tools)
+    _last_tool_names = (tools, names)
+    return names
+
+
+def parse_tool_calls_batch(
+    responses: List[str],
+    tools: List[Dict[str, Any]],
+) -> List[Optional[List[Dict[str, Any]]]]:
+    """
+    Parse tool calls from several LLM responses against the same tools.
+    
+    The tool-name patterns and keyword automaton are resolved once for the
+    whole batch (e.g. retries or self-consistency samples); results are in
+    input order, each as parse_tool_call_from_response would return it.
+    """
+    tool_names = _tool_names(tools)
+    call_patterns = _tool_call_patterns(tool_names)
+    automaton = _keyword_automaton(tool_names)
+    return [_parse_tool_calls(response, call_patterns, automaton) for response in responses]
+
+
+def _parse_tool_calls(
+    response: str,
+    call_patterns: Dict[str, "re.Pattern[str]"],
+    automaton: Any,
+) -> Optional[List[Dict[str, Any]]]:
+    """Parse one response given the prepared patterns and automaton."""
+    tool_calls: List[Dict[str, Any]] = []
+    
+    # Cheap substring gates: prose without these skips the regex branches
+    maybe_json = '"name"' in response and '"args"' in response
+    maybe_call = "(" in response
+    
+    # Check for JSON tool call format (args may contain nested objects)
+    for blob in (_iter_json_objects(response) if maybe_json else ()):
+        if '"name"' not in blob:
+            continue
+        try:
+            obj = orjson.loads(blob)
+        except orjson.JSONDecodeError:
+            continue
+        name = obj.get("name")
+        args = obj.get("args")
+        if isinstance(name, str) and name in call_patterns and isinstance(args, dict):
+            return [{
+                "id": f"call_{name}",
+                "function": {
+                    "name": name,
+                    "arguments": args,
+                }
+            }]
+    
+    # Lowercased once here, only after the JSON branch has missed
+    response_lower = response.lower()
+    
+    # Single pass over the response for every tool name and intent keyword
+    tool_hits: Optional[Set[str]] = None
+    intent_hits: Optional[List[Tuple[int, int, int]]] = None
+    if automaton:
+        tool_hits, intent_hits = _scan_keywords(automaton, response_lower)
+    
+    # Chit-chat short-circuit: without call syntax or an intent keyword
+    # nothing below can produce a tool call
+    if not maybe_call:
+        if intent_hits is not None:
+            if not intent_hits:
+                return None
+        elif not any(keyword in response_lower for keyword in _INTENT_KEYWORDS):
+            return None
+    
+    # Check for function call pattern: tool_name(args)
+    for tool_name, pattern in (call_patterns.items() if maybe_call else ()):
+        if tool_hits is not None and tool_name not in tool_hits:
+            continue
+        match = pattern.search(response)
+        if match:
+            args_str = match.group(1)
+            args = parse_args_string(args_str)
+            return [{
+                "id": f"call_{tool_name}",
+                "function": {
+                    "name": tool_name,
+                    "arguments": args,
+                }
+            }]
+    
+    # Check for intent keywords - support multiple intents
+    # Track which tools we've added to avoid duplicates
+    added_tools: Set[str] = set()
+    
+    # For multi-intent messages (e.g., "subscription AND bill")
+    # Split by "and" to process each part separately
+    if " and " in response_lower:
+        parts = response.split(" and ")
+    else:
+        parts = [response]
+    
+    # Parts map onto slices of response_lower unless lower() changed the
+    # length (a few non-ASCII characters expand when lowercased)
+    aligned = len(response_lower) == len(response)
+    offset = 0
+    for part in parts:
+        start, end = offset, offset + len(part)
+        offset = end + len(" and ")
+        part_lower = response_lower[start:end] if aligned else part.lower()
+        
+        if intent_hits is not None and aligned:
+            # Attribute hits from the single scan to this part by offset
+            candidates = _intents_between(intent_hits, start, end)
+        elif automaton:
+            candidates = _intents_between(_scan_keywords(automaton, part_lower)[1], 0, len(part_lower))
+        else:
+            candidates = [(kw, tool) for kw, tool in _INTENT_TO_TOOL if kw in part_lower]
+        for keyword, tool_name in candidates:
+            if tool_name in call_patterns and tool_name not in added_tools:
+                # Extract potential arguments from context
+                args = extract_args_from_context(part, tool_name, part_lower)
+                if args:
+                    tool_calls.append({
+                        "id": f"call_{tool_name}_{len(tool_calls)}",
+                        "function": {
+                            "name": tool_name,
+                            "arguments": args,
+                        }
+                    })
+                    added_tools.add(tool_name)
+                    break  # Move to next part after finding a match
+    
+    return tool_calls if tool_calls else None
+
+
+def parse_relative_date(text: str, text_lower: Optional[str] = None) -> Optional[str]:
+    """Parse relative date expressions to YYYY-MM-DD format."""
+    today = date.today()
+    if text_lower is None:
+        text_lower = text.lower()
+    
+    # "tomorrow"
+    if "tomorrow" in text_lower:
+        return (today + timedelta(days=1)).isoformat()
+    
+    # "next week"
+    if "next week" in text_lower:
+        return (today + timedelta(weeks=1)).isoformat()
+    
+    # "in X days" / "X days later" / "X days from now", then the same for
+    # weeks; one scan, with any day count taking precedence over weeks
+    weeks = None
+    for match in _REL_DAYS_WEEKS_RE.finditer(text_lower):
+        if match.group(2).startswith("day"):
+            return (today + timedelta(days=int(match.group(1)))).isoformat()
+        if weeks is None:
+            weeks = int(match.group(1))
+    if weeks is not None:
+        return (today + timedelta(weeks=weeks)).isoformat()
+    
+    # "next month"
+    if "next month" in text_lower:
+        next_month = today.replace(day=1)
+        if today.month == 12:
+            next_month = next_month.replace(year=today.year + 1, month=1)
+        else:
+            next_month = next_month.replace(month=today.month + 1)
+        return next_month.isoformat()
+    
+    return None
+
+
+def parse_args_string(args_str: str) -> Dict[str, Any]:
+    """Parse arguments from string like 'arg1=value1, arg2=value2'."""
+    args: Dict[str, Any] = {}
+    for part in args_str.split(","):
+        if "=" in part:
+            key, value = part.split("=", 1)
+            key = key.strip()
+            value = value.strip().strip('"\'')
+            try:
+                args[key] = float(value)
+            except ValueError:
+                args[key] = value
+    return args
+
+
+def extract_args_from_context(
+    text: str,
+    tool_name: str,
+    text_lower: Optional[str] = None,
+) -> Optional[Dict[str, Any]]:
+    """
+    Extract arguments from natural language context.
+    
+    Callers that already lowercased the text can pass it as text_lower.
+    """
+    if text_lower is None:
+        text_lower = text.lower()
+    
+    # One amount search shared by every tool that needs an amount
+    amount: Optional[float] = None
+    if tool_name in _AMOUNT_TOOLS:
+        amount_match = _AMOUNT_RE.search(text_lower)
+        if not amount_match:
+            return None
+        amount = float(amount_match.group(1))
+    
+    if tool_name == "convert_currency":
+        # Look for patterns like "100 USD to EUR"
+        match = _CONVERT_RE.search(text)
+        if match:
+            return {
+                "amount": float(match.group(1)),
+                "from_currency": match.group(2).upper(),
+                "to_currency": match.group(3).upper(),
+            }
+    
+    elif tool_name == "get_stock_price":
+        # Look for stock symbols
+        # Upper-case each short token rather than the whole text
+        for token in _TICKER_RE.findall(text):
+            sym = token.upper()
+            if sym in _COMMON_STOCKS:
+                return {"symbol": sym}
+    
+    elif tool_name == "create_expense":
+        # Improved expense parsing
+        # Extract currency
+        currency = "USD"
+        currency_match = _CURRENCY_RE.search(text_lower)
+        if currency_match:
+            curr_text = currency_match.group(0)
+            if curr_text in ['฿', 'thb']:
+                currency = "THB"
+            elif curr_text in ['€', 'eur']:
+                currency = "EUR"
+            else:
+                currency = "USD"
+        
+        # Extract merchant name - look for common patterns
+        merchant = "Unknown"
+        
+        # Pattern 1: "spent $X at MERCHANT"
+        at_match = _MERCHANT_AT_RE.search(text)
+        if at_match:
+            merchant = at_match.group(1).strip()
+        else:
+            # Pattern 2: "MERCHANT $X" or "$X MERCHANT"
+            # Look for capitalized words near the amount
+            words = text.split()
+            amount_idx = -1
+            for i, word in enumerate(words):
+                if _NUMBER_RE.search(word):
+                    amount_idx = i
+                    break
+            
+            if amount_idx >= 0:
+                # Check words around the amount
+                for offset in [-2, -1, 1, 2]:
+                    idx = amount_idx + offset
+                    if 0 <= idx < len(words):
+                        word = words[idx]
+                        # Skip common words
+                        if word.lower() not in _MERCHANT_STOPWORDS:
+                            # Clean the word
+                            clean_word = _NON_WORD_RE.sub('', word)
+                            if clean_word and len(clean_word) > 1:
+                                merchant = clean_word.title()
+                                break
+        
+        # Extract category - look for common expense categories
+        category = _first_group(_CATEGORY_AUTOMATON, _CATEGORY_KEYWORDS, text_lower) or "other"
+        
+        # Return parsed expense data
+        return {
+            "amount": amount,
+            "merchant": merchant,
+            "category": category,
+            "currency": currency,
+        }
+    
+    elif tool_name == "create_subscription":
+        # Pattern: "$50 gym subscription" or "gym subscription for $50"
+        # Extract name - look for subscription keywords
+        name = "Subscription"
+        for pattern in _SUBSCRIPTION_NAME_RES:
+            match = pattern.search(text_lower)
+            if match:
+                name = match.group(1).title()
+                break
+        
+        # Detect billing cycle
+        billing_cycle = "monthly"  # default
+        if any(w in text_lower for w in ["weekly", "every week", "per week"]):
+            billing_cycle = "weekly"
+        elif any(w in text_lower for w in ["yearly", "annual", "per year"]):
+            billing_cycle = "yearly"
+        elif any(w in text_lower for w in ["daily", "every day", "per day"]):
+            billing_cycle = "daily"
+        
+        # Get next billing date
+        next_billing_date = parse_relative_date(text, text_lower) or date.today().isoformat()
+        
+        return {
+            "name": name,
+            "amount": amount,
+            "billing_cycle": billing_cycle,
+            "next_billing_date": next_billing_date,
+        }
+    
+    elif tool_name == "create_bill":
+        # Pattern: "$40 bill to pay in 1 week" or "electric bill $100"
+        # Extract name
+        name = "Bill"
+        for pattern in _BILL_NAME_RES:
+            match = pattern.search(text_lower)
+            if match:
+                extracted = match.group(1)
+                # Skip common non-name words
+                if extracted not in _BILL_NAME_STOPWORDS:
+                    name = extracted.title()
+                    break
+        
+        # Get due date
+        due_date = parse_relative_date(text, text_lower) or date.today().isoformat()
+        
+        # Check if recurring
+        is_recurring = any(w in text_lower for w in ["recurring", "monthly", "every month", "each month"])
+        
+        return {
+            "name": name,
+            "amount": amount,
+            "due_date": due_date,
+            "is_recurring": is_recurring,
+        }
+    
+    elif tool_name == "create_income":
+        # Pattern: "add $5000 salary" or "received $1000 from freelance"
+        # Extract source
+        source = "Income"
+        
+        matched_source = _first_group(_SOURCE_AUTOMATON, _SOURCE_KEYWORDS, text_lower)
+        if matched_source:
+            source = matched_source.title()
+        
+        return {
+            "amount": amount,
+            "source": source,
+        }
+    
+    # No args extracted for this tool
+    return None
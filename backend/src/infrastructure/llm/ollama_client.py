@@ -2,13 +2,18 @@
 Ollama LLM Client
 Local LLM integration via Ollama
 """
-from typing import Optional, AsyncIterator, List, Dict, Any
-import httpx
+from typing import Optional, AsyncIterator, List, Dict, Any, Tuple
+import time
+import orjson
 from langchain_core.language_models import BaseChatModel
 from langchain_core.messages import BaseMessage, AIMessage, HumanMessage, SystemMessage
 from langchain_core.outputs import ChatResult, ChatGeneration
 
 from src.config.settings import settings
+from ._http import shared_async_client
+
+# Seconds an is_available() probe result is reused
+AVAILABILITY_TTL = 30.0
 
 
 class OllamaClient:
@@ -17,19 +22,29 @@ class OllamaClient:
     def __init__(self, base_url: str = None, model: str = None):
         self.base_url = base_url or settings.ollama_base_url
         self.model = model or settings.ollama_model
-        self._client = httpx.AsyncClient(timeout=120.0)
+        self._client = shared_async_client
+        self._availability: Optional[Tuple[float, bool]] = None
     
     async def close(self):
-        """Close HTTP client."""
-        await self._client.aclose()
+        """No-op: the shared HTTP client is closed at application shutdown."""
     
-    async def is_available(self) -> bool:
-        """Check if Ollama server is running."""
+    async def is_available(self, timeout: float = 2.0) -> bool:
+        """Check if Ollama server is running (cached for AVAILABILITY_TTL seconds)."""
+        now = time.monotonic()
+        if self._availability and now - self._availability[0] < AVAILABILITY_TTL:
+            return self._availability[1]
+        
         try:
-            response = await self._client.get(f"{self.base_url}/api/tags")
-            return response.status_code == 200
+            response = await self._client.get(
+                f"{self.base_url}/api/tags",
+                timeout=timeout,
+            )
+            available = response.status_code == 200
         except Exception:
-            return False
+            available = False
+        
+        self._availability = (now, available)
+        return available
     
     async def list_models(self) -> List[str]:
         """List available models."""
@@ -96,8 +111,7 @@ class OllamaClient:
         ) as response:
             async for line in response.aiter_lines():
                 if line:
-                    import json
-                    data = json.loads(line)
+                    data = orjson.loads(line)
                     if "response" in data:
                         yield data["response"]
     
@@ -143,10 +157,10 @@ class OllamaClient:
             f"{self.base_url}/api/chat",
             json=payload,
         ) as response:
+            response.raise_for_status()
             async for line in response.aiter_lines():
                 if line:
-                    import json
-                    data = json.loads(line)
+                    data = orjson.loads(line)
                     if "message" in data and "content" in data["message"]:
                         yield data["message"]["content"]
 
@@ -2,13 +2,88 @@
 Celery Application Configuration
 Background task processing with RabbitMQ
 """
-from celery import Celery
+import zlib
+from billiard.einfo import ExceptionWithTraceback
+from celery import Celery, Task, bootsteps
+from celery.exceptions import TimeLimitExceeded
+from celery.signals import worker_init
+from celery.worker.request import Request
+from kombu import Exchange, Queue
 
 from src.config.settings import settings
 
+# Messages rejected by a failed or timed-out task (acks_late with
+# task_acks_on_failure_or_timeout=False) are dead-lettered here for inspection
+DEAD_LETTER_EXCHANGE = Exchange("dlx.moneymind", type="fanout", durable=True)
+DEAD_LETTER_QUEUE = Queue("dead_letter", DEAD_LETTER_EXCHANGE)
+
+
+def _task_queue(name: str) -> Queue:
+    """Direct queue named like Celery's auto-created ones, with dead-lettering."""
+    return Queue(
+        name,
+        Exchange(name, type="direct"),
+        routing_key=name,
+        queue_arguments={"x-dead-letter-exchange": DEAD_LETTER_EXCHANGE.name},
+    )
+
+
+EMBEDDINGS_TASK = "src.infrastructure.queue.tasks.generate_embeddings_task"
+EMBEDDING_QUEUES = [f"embeddings.{shard}" for shard in range(settings.celery_embedding_shards)]
+
+
+def route_embeddings_by_user(name, args, kwargs, options, task=None, **kw):
+    """
+    Route generate_embeddings_task to a per-user shard queue.
+    
+    A stable hash (not the per-process randomized hash()) keeps a user on
+    one shard, so one user's large batch only delays that shard.
+    """
+    if name != EMBEDDINGS_TASK:
+        return None
+    user_id = (kwargs or {}).get("user_id")
+    if user_id is None and args and len(args) > 2:
+        user_id = args[2]
+    shard = zlib.crc32(str(user_id).encode()) % len(EMBEDDING_QUEUES)
+    return {"queue": EMBEDDING_QUEUES[shard]}
+
+
+
+class DeadLetterTimeoutRequest(Request):
+    """
+    Task request that dead-letters tasks killed by the hard time limit.
+    
+    With acks_late and task_acks_on_failure_or_timeout=False, Celery
+    requeues a TimeLimitExceeded task, so it would run again (for up to
+    another task_time_limit) forever. Rejecting without requeue first
+    sends it to DEAD_LETTER_EXCHANGE instead; the later requeue is a no-op
+    on an already rejected message. on_timeout has stored the failure.
+    """
+    
+    def on_timeout(self, soft, timeout):
+        super().on_timeout(soft, timeout)
+        if not soft and self.task.acks_late:
+            self.reject(requeue=False)
+    
+    def on_failure(self, exc_info, send_failed_event=True, return_ok=False):
+        exc = exc_info.exception
+        if isinstance(exc, ExceptionWithTraceback):
+            exc = exc.exc
+        if isinstance(exc, TimeLimitExceeded) and self.task.acks_late:
+            self.reject(requeue=False)
+        return super().on_failure(exc_info, send_failed_event, return_ok)
+
+
+class DeadLetterTask(Task):
+    """Base class of every task in this app (shared_task picks it up)."""
+    
+    Request = DeadLetterTimeoutRequest
+
+
 # Create Celery app
 celery_app = Celery(
     "moneymind",
+    task_cls=DeadLetterTask,
     broker=settings.rabbitmq_url,
     backend="redis://" + settings.redis_url.split("://")[1],  # Use Redis as result backend
     include=[
@@ -18,36 +93,62 @@ celery_app = Celery(
 
 # Celery configuration
 celery_app.conf.update(
-    # Task settings
-    task_serializer="json",
-    accept_content=["json"],
-    result_serializer="json",
+    # Task settings (msgpack; JSON still accepted from older producers)
+    task_serializer="msgpack",
+    accept_content=["msgpack", "json"],
+    result_serializer="msgpack",
+    result_accept_content=["msgpack", "json"],
+    # zstd (level 3) keeps large text payloads such as embedding batches small
+    task_compression="zstd",
+    result_compression="zstd",
     timezone="UTC",
     enable_utc=True,
     
     # Task execution
     task_track_started=True,
+    task_ignore_result=True,  # Fire-and-forget by default; opt in per task
     task_time_limit=3600,  # 1 hour max per task
     task_soft_time_limit=3300,  # Soft limit at 55 minutes
     
     # Retry settings
     task_acks_late=True,
     task_reject_on_worker_lost=True,
+    # Failed tasks are rejected (dead-lettered) rather than acked as done;
+    # hard time-limit kills are dead-lettered by DeadLetterTimeoutRequest,
+    # as Celery itself would requeue them
+    task_acks_on_failure_or_timeout=False,
+    
+    # Broker: wait for RabbitMQ publisher confirms so enqueued tasks are durable.
+    # The broker's consumer_timeout (docker-compose) sits just above task_time_limit.
+    broker_transport_options={"confirm_publish": True},
     
-    # Concurrency
+    # Concurrency (prefetch is the fallback; see QueuePrefetchStep)
     worker_prefetch_multiplier=1,
     worker_concurrency=4,
     
     # Result backend
-    result_expires=86400,  # Results expire after 24 hours
-    
-    # Task routes
-    task_routes={
-        "src.infrastructure.queue.tasks.process_document_task": {"queue": "documents"},
-        "src.infrastructure.queue.tasks.generate_embeddings_task": {"queue": "embeddings"},
-        "src.infrastructure.queue.tasks.sync_gmail_task": {"queue": "gmail"},
-        "src.infrastructure.queue.tasks.generate_report_task": {"queue": "reports"},
-    },
+    result_expires=3600,  # Results expire after 1 hour
+    result_backend_transport_options={"global_keyprefix": "mm:"},
+    redis_retry_on_timeout=True,
+    
+    # Task queues (existing queues without the dead-letter argument must be
+    # deleted once, as RabbitMQ refuses to redeclare them with new arguments).
+    # The unsharded "embeddings" queue is kept so older messages still drain.
+    task_queues=[
+        _task_queue(name)
+        for name in ("celery", "documents", "embeddings", *EMBEDDING_QUEUES, "gmail", "reports")
+    ],
+    
+    # Task routes (routers are tried in order)
+    task_routes=(
+        route_embeddings_by_user,
+        {
+            "src.infrastructure.queue.tasks.process_document_task": {"queue": "documents"},
+            "src.infrastructure.queue.tasks.finalize_document_task": {"queue": "documents"},
+            "src.infrastructure.queue.tasks.sync_gmail_task": {"queue": "gmail"},
+            "src.infrastructure.queue.tasks.generate_report_task": {"queue": "reports"},
+        },
+    ),
     
     # Beat schedule for periodic tasks
     beat_schedule={
@@ -55,15 +156,53 @@ celery_app.conf.update(
             "task": "src.infrastructure.queue.tasks.sync_gmail_task",
             "schedule": 3600.0,  # Every hour
             "args": (),
+            "options": {"ignore_result": True},
         },
         "generate-daily-reports": {
             "task": "src.infrastructure.queue.tasks.generate_report_task",
             "schedule": 86400.0,  # Every 24 hours
             "args": (),
+            "options": {"ignore_result": True},
         },
     },
 )
 
 
+class QueuePrefetchStep(bootsteps.Step):
+    """
+    Worker bootstep choosing the prefetch multiplier from the consumed queues.
+    
+    Runs after -Q has been applied and before the consumer is created. A
+    worker on several queues uses the smallest configured value, so a long
+    queue is never starved behind a deep prefetch of short tasks. Shard
+    queues ("embeddings.3") fall back to their base name's value; queues
+    missing from settings.celery_prefetch_per_queue keep the worker value.
+    """
+    
+    def create(self, worker):
+        per_queue = dict(settings.celery_prefetch_per_queue)
+        queues = worker.app.amqp.queues.consume_from
+        multipliers = [
+            per_queue.get(name, per_queue.get(name.partition(".")[0], worker.prefetch_multiplier))
+            for name in queues
+        ]
+        if multipliers:
+            worker.prefetch_multiplier = min(multipliers)
+
+
+celery_app.steps["worker"].add(QueuePrefetchStep)
+
+
+@worker_init.connect
+def declare_dead_letter_queue(sender=None, **kwargs):
+    """
+    Declare the dead-letter exchange and queue when a worker starts.
+    
+    Kept out of task_queues so that workers never consume dead letters.
+    """
+    with celery_app.connection_for_write() as connection:
+        DEAD_LETTER_QUEUE(connection.default_channel).declare()
+
+
 if __name__ == "__main__":
     celery_app.start()
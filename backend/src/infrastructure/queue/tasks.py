@@ -2,66 +2,202 @@
 Celery Background Tasks
 Long-running tasks for document processing, email sync, reports
 """
-from typing import Optional
-from celery import shared_task
+from typing import Any, Dict, Iterator, Optional
+from itertools import islice
+from celery import chord, shared_task
+import asyncio
+import httpx
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Only infrastructure hiccups are retried (exponential backoff with full
+# jitter); any other exception fails the task at once and, being rejected
+# under acks_late, is dead-lettered instead of re-running
+TRANSIENT_ERRORS = (httpx.TransportError, ConnectionError, TimeoutError)
+RETRY_OPTIONS = dict(
+    autoretry_for=TRANSIENT_ERRORS,
+    retry_jitter=True,
+    retry_backoff_max=600,
+)
 
-@shared_task(bind=True, max_retries=3)
-def process_document_task(self, document_id: str, user_id: str):
+# Chunks per generate_embeddings_task message
+EMBEDDING_BATCH_SIZE = 32
+
+
+def _batched(items: list, size: int) -> Iterator[list]:
+    """Yield successive lists of up to size items."""
+    iterator = iter(items)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def _run(coro):
+    """
+    Run a coroutine to completion on this worker process's event loop.
+    
+    One loop per process (created on first use, after the fork) keeps the
+    shared HTTP and Qdrant clients' pooled connections valid across tasks,
+    which a fresh asyncio.run() loop per task would not.
+    """
+    global _loop
+    if _loop is None:
+        _loop = asyncio.new_event_loop()
+    return _loop.run_until_complete(coro)
+
+
+def _update_document(document_id: str, **values: Any):
+    """Update a Document row from a (synchronous) worker task."""
+    _run(_update_document_async(document_id, values))
+
+
+async def _update_document_async(document_id: str, values: Dict[str, Any]):
+    from sqlalchemy import update
+    from sqlalchemy.ext.asyncio import create_async_engine
+    from sqlalchemy.pool import NullPool
+    from src.config.settings import settings
+    from src.domain.models.document import Document
+    
+    # Throwaway engine: the app's pooled engine may have been created (and
+    # its pool bound) before the worker forked
+    engine = create_async_engine(settings.database_url, poolclass=NullPool)
+    try:
+        async with engine.begin() as conn:
+            await conn.execute(
+                update(Document).where(Document.id == document_id).values(**values)
+            )
+    finally:
+        await engine.dispose()
+
+
+@shared_task(bind=True, max_retries=3, retry_backoff=60, **RETRY_OPTIONS)
+def process_document_task(
+    self,
+    document_id: str,
+    user_id: str,
+    file_path: str,
+    content_type: str,
+    filename: str,
+):
     """
     Process an uploaded document.
     
     Steps:
-    1. Load document from storage
-    2. Extract text (PDF, DOCX, TXT)
-    3. Chunk text for vector storage
-    4. Generate embeddings
-    5. Store in Qdrant
-    6. Update document status in PostgreSQL
+    1. Extract text from file_path (must be readable by the worker)
+    2. Chunk text for vector storage
+    3. Generate embeddings and store them in Qdrant (chord of batches)
+    4. Mark the document ready in PostgreSQL (chord callback)
+    
+    A file without usable text marks the document failed.
     """
+    from src.application.services.document_service import extract_and_chunk
+    
     try:
         logger.info(f"Processing document {document_id} for user {user_id}")
         
-        # TODO: Implement document processing
-        # from src.application.services.document_service import DocumentService
-        # service = DocumentService()
-        # service.process_document(document_id)
+        try:
+            _, chunks = extract_and_chunk(file_path, content_type)
+        except ValueError as exc:
+            logger.warning(f"Document {document_id} has no usable text: {exc}")
+            _update_document(document_id, status="failed")
+            return {"status": "failed", "document_id": document_id}
+        
+        if not chunks:
+            _update_document(document_id, status="ready", chunk_count=0)
+            return {"status": "completed", "document_id": document_id}
+        
+        # One message per batch of chunks rather than per chunk; the chord
+        # callback finalizes the document once every batch is embedded
+        chord(
+            generate_embeddings_task.s(
+                batch, document_id, user_id, filename, number * EMBEDDING_BATCH_SIZE
+            )
+            for number, batch in enumerate(_batched(chunks, EMBEDDING_BATCH_SIZE))
+        )(finalize_document_task.s(document_id))
         
-        return {"status": "completed", "document_id": document_id}
+        return {"status": "embedding", "document_id": document_id}
         
     except Exception as exc:
         logger.error(f"Document processing failed: {exc}")
-        self.retry(exc=exc, countdown=60)
+        raise
 
 
-@shared_task(bind=True, max_retries=3)
-def generate_embeddings_task(self, texts: list, document_id: str, user_id: str):
+# Results are kept: they feed the finalize_document_task chord callback
+@shared_task(bind=True, ignore_result=False, max_retries=3, retry_backoff=30, **RETRY_OPTIONS)
+def generate_embeddings_task(
+    self,
+    texts: list,
+    document_id: str,
+    user_id: str,
+    filename: str,
+    start_index: int = 0,
+):
     """
-    Generate embeddings for text chunks.
+    Generate embeddings for a batch of text chunks.
     
     Uses HuggingFace sentence-transformers for embedding generation.
-    Results are stored in Qdrant vector database.
+    Results are stored in Qdrant vector database; start_index is the
+    document-wide index of texts[0].
     """
     try:
         logger.info(f"Generating embeddings for {len(texts)} chunks")
         
-        # TODO: Implement embedding generation
-        # from src.infrastructure.llm.huggingface_client import huggingface_client
-        # embeddings = await huggingface_client.embeddings(texts)
-        # from src.infrastructure.database.qdrant_client import qdrant_client
-        # qdrant_client.upsert_vectors(...)
+        _run(_store_embeddings(texts, document_id, user_id, filename, start_index))
         
         return {"status": "completed", "chunk_count": len(texts)}
         
     except Exception as exc:
         logger.error(f"Embedding generation failed: {exc}")
-        self.retry(exc=exc, countdown=30)
+        raise
+
+
+async def _store_embeddings(
+    texts: list,
+    document_id: str,
+    user_id: str,
+    filename: str,
+    start_index: int,
+):
+    from src.application.services.document_service import DocumentService
+    from src.infrastructure.database.qdrant_client import qdrant_client
+    
+    if not qdrant_client.is_connected:
+        qdrant_client.connect()
+        await qdrant_client.ensure_collection()
+    
+    await DocumentService(user_id=user_id).store_embeddings(
+        document_id=document_id,
+        chunks=texts,
+        filename=filename,
+        start_index=start_index,
+    )
+
+
+@shared_task(bind=True, max_retries=3, retry_backoff=30, **RETRY_OPTIONS)
+def finalize_document_task(self, results: list, document_id: str):
+    """
+    Mark a document ready once all its embedding batches are done.
+    
+    Chord callback of process_document_task; results holds one
+    generate_embeddings_task result per batch.
+    """
+    try:
+        chunk_count = sum(result.get("chunk_count", 0) for result in results)
+        logger.info(f"Document {document_id} embedded: {chunk_count} chunks")
+        
+        _update_document(document_id, status="ready", chunk_count=chunk_count)
+        
+        return {"status": "completed", "document_id": document_id, "chunk_count": chunk_count}
+        
+    except Exception as exc:
+        logger.error(f"Document finalization failed: {exc}")
+        raise
 
 
-@shared_task(bind=True, max_retries=3)
+@shared_task(bind=True, max_retries=3, retry_backoff=120, **RETRY_OPTIONS)
 def sync_gmail_task(self, user_id: Optional[str] = None):
     """
     Sync emails from Gmail.
@@ -88,10 +224,10 @@ def sync_gmail_task(self, user_id: Optional[str] = None):
         
     except Exception as exc:
         logger.error(f"Gmail sync failed: {exc}")
-        self.retry(exc=exc, countdown=120)
+        raise
 
 
-@shared_task(bind=True, max_retries=3)
+@shared_task(bind=True, max_retries=3, retry_backoff=60, **RETRY_OPTIONS)
 def generate_report_task(self, user_id: Optional[str] = None, report_type: str = "monthly"):
     """
     Generate financial reports.
@@ -113,7 +249,7 @@ def generate_report_task(self, user_id: Optional[str] = None, report_type: str =
         
     except Exception as exc:
         logger.error(f"Report generation failed: {exc}")
-        self.retry(exc=exc, countdown=60)
+        raise
 
 
 @shared_task(bind=True)
@@ -138,7 +274,7 @@ def send_notification_task(self, user_id: str, notification_type: str, data: dic
         return {"status": "failed", "error": str(exc)}
 
 
-@shared_task(bind=True, max_retries=5)
+@shared_task(bind=True, max_retries=5, retry_backoff=30, **RETRY_OPTIONS)
 def process_stripe_webhook_task(self, event_type: str, event_data: dict):
     """
     Process Stripe webhook events asynchronously.
@@ -162,10 +298,10 @@ def process_stripe_webhook_task(self, event_type: str, event_data: dict):
         
     except Exception as exc:
         logger.error(f"Stripe webhook processing failed: {exc}")
-        self.retry(exc=exc, countdown=30)
+        raise
 
 
-@shared_task(bind=True)
+@shared_task(bind=True, ignore_result=False)
 def llm_inference_task(self, user_id: str, messages: list, context: dict = None):
     """
     Run long LLM inference tasks.
@@ -2,44 +2,76 @@
 API Dependencies
 Common dependencies for API routes
 """
-from typing import Optional
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple
+import hashlib
+import time
+from cachetools import TTLCache
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 
 from src.application.services.auth_service import AuthService
 
 security = HTTPBearer()
+auth_service = AuthService()
+
+
+@dataclass(frozen=True, slots=True)
+class AuthedUser:
+    """Authenticated user identity taken from the JWT claims."""
+    id: str
+    email: Optional[str] = None
+    name: Optional[str] = None
+
+
+# (token expiry, user) for verified tokens, keyed by a digest of the token
+# (not the token itself)
+_token_cache: TTLCache = TTLCache(maxsize=10_000, ttl=60)
+
+
+def _authenticate_token(token: str) -> Optional[AuthedUser]:
+    """Verify a JWT, reusing a recent verification of the same token."""
+    key = hashlib.blake2b(token.encode(), digest_size=16).digest()
+    cached: Optional[Tuple[float, AuthedUser]] = _token_cache.get(key)
+    # A cached user is only valid until the token itself expires
+    if cached is not None and cached[0] > time.time():
+        return cached[1]
+    
+    payload = AuthService.decode_token(token)
+    if not payload or not payload.get("sub"):
+        return None
+    
+    user = AuthedUser(
+        id=payload["sub"],
+        email=payload.get("email"),
+        name=payload.get("name"),
+    )
+    _token_cache[key] = (payload.get("exp", 0), user)
+    return user
 
 
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security)
-) -> dict:
+) -> AuthedUser:
     """
     Get current authenticated user from JWT token.
     
     Returns:
-        dict: User data with id, email, name
+        AuthedUser: User identity with id, email, name
     
     Raises:
         HTTPException: If token is invalid or expired
     """
     try:
-        token = credentials.credentials
-        payload = AuthService.decode_token(token)
-        
-        user_id = payload.get("sub")
-        if not user_id:
+        user = _authenticate_token(credentials.credentials)
+        if user is None:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Invalid authentication credentials",
                 headers={"WWW-Authenticate": "Bearer"},
             )
         
-        return {
-            "id": user_id,
-            "email": payload.get("email"),
-            "name": payload.get("name"),
-        }
+        return user
         
     except Exception as e:
         raise HTTPException(
@@ -49,14 +81,36 @@ async def get_current_user(
         )
 
 
+async def get_current_user_record(
+    user: AuthedUser = Depends(get_current_user)
+) -> Dict[str, Any]:
+    """
+    Get the authenticated user's full record from the database.
+    
+    Only for endpoints that need profile fields beyond the JWT claims;
+    the lookup is cached briefly by AuthService.
+    
+    Raises:
+        HTTPException: If the user no longer exists
+    """
+    record = await auth_service.get_user_by_id(user.id)
+    if not record:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="User not found",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return record
+
+
 async def get_optional_user(
     credentials: Optional[HTTPAuthorizationCredentials] = Depends(security)
-) -> Optional[dict]:
+) -> Optional[AuthedUser]:
     """
     Get current user if authenticated, None otherwise.
     
     Returns:
-        Optional[dict]: User data or None
+        Optional[AuthedUser]: User identity or None
     """
     if not credentials:
         return None
@@ -0,0 +1,29 @@
+"""
+API Responses
+Custom response classes shared by the API routes
+"""
+from decimal import Decimal
+from typing import Any
+
+import orjson
+from fastapi.responses import JSONResponse
+
+
+def _default(obj: Any) -> Any:
+    """Encode types orjson does not handle natively."""
+    if isinstance(obj, Decimal):
+        return float(obj)  # Same as FastAPI's jsonable_encoder
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+class ORJSONResponse(JSONResponse):
+    """
+    JSON response rendered by orjson in one C pass.
+    
+    Returned directly from routes without a response_model, it also skips
+    FastAPI's jsonable_encoder walk; dates and datetimes are encoded
+    natively and Decimals as floats.
+    """
+    
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
@@ -2,48 +2,71 @@
 Authentication Routes - REAL IMPLEMENTATION
 Google OAuth and JWT authentication
 """
-from typing import Optional
+from typing import Any, Dict, Optional, Tuple
 from datetime import datetime
 from urllib.parse import urlencode
+import re
+import time
 import httpx
+from google.auth import jwt as google_jwt
 
 from fastapi import APIRouter, HTTPException, Depends, Request, Response
 from fastapi.responses import RedirectResponse
-from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, ConfigDict, EmailStr
 
 from src.config.settings import settings
 from src.application.services.auth_service import AuthService
+from src.interfaces.api.dependencies import (
+    AuthedUser,
+    get_current_user,
+    get_current_user_record,
+)
 
 router = APIRouter()
-security = HTTPBearer(auto_error=False)
 auth_service = AuthService()
 
 
+TOKEN_TYPE = "bearer"
+
+# Request bodies are strict (no type coercion) and immutable. Whitespace is
+# not stripped, as it is significant in passwords and tokens.
+_REQUEST_CONFIG = ConfigDict(strict=True, frozen=True)
+
+
 # Request/Response Models
 class RegisterRequest(BaseModel):
+    model_config = _REQUEST_CONFIG
+    
     email: EmailStr
     password: str
     name: Optional[str] = None
 
 
 class LoginRequest(BaseModel):
+    model_config = _REQUEST_CONFIG
+    
     email: EmailStr
     password: str
 
 
 class TokenResponse(BaseModel):
+    model_config = ConfigDict(frozen=True, extra="ignore")
+    
     access_token: str
     refresh_token: str
-    token_type: str = "bearer"
+    token_type: str = TOKEN_TYPE
     expires_in: int = 3600
 
 
 class RefreshRequest(BaseModel):
+    model_config = _REQUEST_CONFIG
+    
     refresh_token: str
 
 
 class UserResponse(BaseModel):
+    model_config = ConfigDict(frozen=True, extra="ignore")
+    
     id: str
     email: str
     name: Optional[str] = None
@@ -52,29 +75,6 @@ class UserResponse(BaseModel):
     gmail_connected: bool = False
 
 
-# Dependency for getting current user
-async def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security)
-) -> dict:
-    """Get current authenticated user from JWT token."""
-    if not credentials:
-        raise HTTPException(status_code=401, detail="Not authenticated")
-    
-    payload = auth_service.decode_token(credentials.credentials)
-    if not payload:
-        raise HTTPException(status_code=401, detail="Invalid token")
-    
-    user_id = payload.get("sub")
-    if not user_id:
-        raise HTTPException(status_code=401, detail="Invalid token payload")
-    
-    user = await auth_service.get_user_by_id(user_id)
-    if not user:
-        raise HTTPException(status_code=401, detail="User not found")
-    
-    return user
-
-
 @router.post("/register", response_model=TokenResponse)
 async def register(request: RegisterRequest):
     """
@@ -156,7 +156,7 @@ async def refresh_token(request: RefreshRequest):
 
 @router.get("/me", response_model=UserResponse)
 async def get_current_user_profile(
-    current_user: dict = Depends(get_current_user)
+    current_user: Dict[str, Any] = Depends(get_current_user_record)
 ):
     """
     Get current authenticated user's profile.
@@ -171,6 +171,24 @@ async def get_current_user_profile(
 GOOGLE_AUTH_URL = "https://accounts.google.com/o/oauth2/v2/auth"
 GOOGLE_TOKEN_URL = "https://oauth2.googleapis.com/token"
 GOOGLE_USERINFO_URL = "https://www.googleapis.com/oauth2/v2/userinfo"
+GOOGLE_CERTS_URL = "https://www.googleapis.com/oauth2/v1/certs"
+GOOGLE_ISSUERS = ("accounts.google.com", "https://accounts.google.com")
+
+# Reused across callbacks so DNS, TLS and HTTP/2 setup to Google is paid once
+_GOOGLE_CLIENT = httpx.AsyncClient(
+    http2=True,
+    timeout=10.0,
+    limits=httpx.Limits(max_keepalive_connections=20, max_connections=100),
+)
+
+
+async def close_google_client():
+    """Close the Google OAuth client; called once at application shutdown."""
+    await _GOOGLE_CLIENT.aclose()
+
+# (expires_at, {key id: PEM certificate}) for Google's ID-token signing keys
+_google_certs: Optional[Tuple[float, Dict[str, str]]] = None
+_MAX_AGE_RE = re.compile(r"max-age=(\d+)")
 
 # OAuth scopes
 SCOPES = [
@@ -209,6 +227,32 @@ async def google_oauth_initiate():
     return {"auth_url": auth_url}
 
 
+async def _get_google_certs() -> Dict[str, str]:
+    """Get Google's signing certificates, cached for their Cache-Control max-age."""
+    global _google_certs
+    if _google_certs and _google_certs[0] > time.monotonic():
+        return _google_certs[1]
+    
+    response = await _GOOGLE_CLIENT.get(GOOGLE_CERTS_URL)
+    response.raise_for_status()
+    max_age = _MAX_AGE_RE.search(response.headers.get("cache-control", ""))
+    ttl = int(max_age.group(1)) if max_age else 3600
+    _google_certs = (time.monotonic() + ttl, response.json())
+    return _google_certs[1]
+
+
+async def _verify_google_id_token(token: str) -> Dict[str, Any]:
+    """Verify a Google ID token's signature, audience and issuer; return its claims."""
+    claims = google_jwt.decode(
+        token,
+        certs=await _get_google_certs(),
+        audience=settings.google_client_id,
+    )
+    if claims.get("iss") not in GOOGLE_ISSUERS:
+        raise ValueError(f"Wrong issuer: {claims.get('iss')}")
+    return claims
+
+
 @router.get("/google/callback")
 async def google_oauth_callback(
     request: Request,
@@ -233,31 +277,35 @@ async def google_oauth_callback(
         raise HTTPException(status_code=400, detail="Invalid state parameter")
     
     try:
-        async with httpx.AsyncClient() as client:
-            # Exchange code for tokens
-            token_response = await client.post(
-                GOOGLE_TOKEN_URL,
-                data={
-                    "client_id": settings.google_client_id,
-                    "client_secret": settings.google_client_secret,
-                    "code": code,
-                    "redirect_uri": settings.google_redirect_uri,
-                    "grant_type": "authorization_code",
-                },
+        # Exchange code for tokens
+        token_response = await _GOOGLE_CLIENT.post(
+            GOOGLE_TOKEN_URL,
+            data={
+                "client_id": settings.google_client_id,
+                "client_secret": settings.google_client_secret,
+                "code": code,
+                "redirect_uri": settings.google_redirect_uri,
+                "grant_type": "authorization_code",
+            },
+        )
+        
+        if token_response.status_code != 200:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Token exchange failed: {token_response.text}"
             )
-            
-            if token_response.status_code != 200:
-                raise HTTPException(
-                    status_code=400,
-                    detail=f"Token exchange failed: {token_response.text}"
-                )
-            
-            token_data = token_response.json()
-            google_access_token = token_data.get("access_token")
-            google_refresh_token = token_data.get("refresh_token")
-            
-            # Get user info
-            userinfo_response = await client.get(
+        
+        token_data = token_response.json()
+        google_access_token = token_data.get("access_token")
+        google_refresh_token = token_data.get("refresh_token")
+        
+        # Get user info: the openid scope returns a signed id_token carrying
+        # the profile claims, so the userinfo round-trip is only a fallback
+        if token_data.get("id_token"):
+            claims = await _verify_google_id_token(token_data["id_token"])
+            userinfo = {**claims, "id": claims["sub"]}
+        else:
+            userinfo_response = await _GOOGLE_CLIENT.get(
                 GOOGLE_USERINFO_URL,
                 headers={"Authorization": f"Bearer {google_access_token}"},
             )
@@ -269,43 +317,43 @@ async def google_oauth_callback(
                 )
             
             userinfo = userinfo_response.json()
-            
-            # Authenticate/create user
-            user = await auth_service.authenticate_google(
-                google_id=userinfo.get("id"),
-                email=userinfo.get("email"),
-                name=userinfo.get("name"),
-                picture=userinfo.get("picture"),
-                refresh_token=google_refresh_token,
-            )
-            
-            # Generate our tokens
-            access_token = auth_service.create_access_token(
-                data={"sub": user["id"], "email": user["email"], "type": "access"}
-            )
-            refresh_token = auth_service.create_refresh_token(user["id"])
-            
-            # Redirect to frontend callback page with tokens
-            from urllib.parse import urlencode
-            
-            # Determine frontend URL from request origin or use default
-            origin = request.headers.get("origin", "http://localhost:3010")
-            # Remove trailing slash if present
-            origin = origin.rstrip('/')
-            
-            # Frontend callback URL
-            frontend_callback = f"{origin}/auth/callback"
-            
-            # Add tokens as query parameters
-            params = {
-                "access_token": access_token,
-                "refresh_token": refresh_token,
-            }
-            
-            redirect_url = f"{frontend_callback}?{urlencode(params)}"
-            
-            return RedirectResponse(url=redirect_url)
-            
+        
+        # Authenticate/create user
+        user = await auth_service.authenticate_google(
+            google_id=userinfo.get("id"),
+            email=userinfo.get("email"),
+            name=userinfo.get("name"),
+            picture=userinfo.get("picture"),
+            refresh_token=google_refresh_token,
+        )
+        
+        # Generate our tokens
+        access_token = auth_service.create_access_token(
+            data={"sub": user["id"], "email": user["email"], "type": "access"}
+        )
+        refresh_token = auth_service.create_refresh_token(user["id"])
+        
+        # Redirect to frontend callback page with tokens
+        from urllib.parse import urlencode
+        
+        # Determine frontend URL from request origin or use default
+        origin = request.headers.get("origin", "http://localhost:3010")
+        # Remove trailing slash if present
+        origin = origin.rstrip('/')
+        
+        # Frontend callback URL
+        frontend_callback = f"{origin}/auth/callback"
+        
+        # Add tokens as query parameters
+        params = {
+            "access_token": access_token,
+            "refresh_token": refresh_token,
+        }
+        
+        redirect_url = f"{frontend_callback}?{urlencode(params)}"
+        
+        return RedirectResponse(url=redirect_url)
+        
     except httpx.RequestError as e:
         raise HTTPException(status_code=500, detail=f"OAuth request failed: {str(e)}")
     except Exception as e:
@@ -314,7 +362,7 @@ async def google_oauth_callback(
 
 @router.post("/logout")
 async def logout(
-    current_user: dict = Depends(get_current_user)
+    current_user: AuthedUser = Depends(get_current_user)
 ):
     """
     Logout user.
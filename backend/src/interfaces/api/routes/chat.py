@@ -3,65 +3,182 @@ WebSocket Chat Endpoint - REAL IMPLEMENTATION
 Real-time chat with LangGraph agent streaming
 """
 from typing import Optional, List, Dict, Any
+from datetime import datetime, timezone
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect, Depends, Query, Header
 from pydantic import BaseModel
-import json
 import asyncio
+import re
+import time
 import uuid
-from datetime import datetime
+import orjson
 from src.config.settings import settings
+from src.infrastructure.database.redis_client import redis_client
 
 router = APIRouter()
 
+# Chat history lives in Redis so any worker can serve a session
+HISTORY_MAX_MESSAGES = 50
+HISTORY_TTL = 3600  # seconds, refreshed on every write
+
+# Entries are stored as compact [role_code, epoch_seconds, content] arrays
+_ROLE_CODES = {"user": "u", "assistant": "a", "system": "s"}
+_CODE_ROLES = {code: role for role, code in _ROLE_CODES.items()}
+
+# Agent "stream" chunks are merged into one frame per STREAM_MAX_DELAY
+# seconds or STREAM_MAX_CHARS characters, whichever comes first
+STREAM_MAX_DELAY = 0.03
+STREAM_MAX_CHARS = 4096
+_STREAM_KEYS = frozenset({"type", "content"})
+
+CHART_MARKER = "```chart"
+_CHART_RE = re.compile(r'```chart\n(.*?)\n```', re.DOTALL)
+
+
+def _history_key(session_id: str) -> str:
+    """Redis list key holding a session's chat history."""
+    return f"chat:{session_id}"
+
 
 class ConnectionManager:
     """WebSocket connection manager for real-time chat."""
     
     def __init__(self):
+        # WebSocket objects are process-local; session history is in Redis
         self.active_connections: Dict[str, WebSocket] = {}
-        self.user_sessions: Dict[str, Dict[str, Any]] = {}
     
     async def connect(self, websocket: WebSocket, session_id: str, user_id: str):
-        """Accept connection and store session info."""
+        """Accept connection and register it for the session."""
         await websocket.accept()
         self.active_connections[session_id] = websocket
-        self.user_sessions[session_id] = {
-            "user_id": user_id,
-            "connected_at": datetime.utcnow(),
-            "messages": [],
-        }
     
     def disconnect(self, session_id: str):
-        """Remove connection and session."""
-        if session_id in self.active_connections:
-            del self.active_connections[session_id]
-        if session_id in self.user_sessions:
-            del self.user_sessions[session_id]
+        """Remove connection; its history expires from Redis after HISTORY_TTL."""
+        self.active_connections.pop(session_id, None)
     
     async def send_json(self, session_id: str, data: dict):
-        """Send JSON message to specific session."""
-        if session_id in self.active_connections:
-            await self.active_connections[session_id].send_json(data)
-    
-    def get_session_history(self, session_id: str) -> List[Dict]:
-        """Get conversation history for session."""
-        if session_id in self.user_sessions:
-            return self.user_sessions[session_id].get("messages", [])
-        return []
+        """Send JSON message to specific session (encoded with orjson)."""
+        websocket = self.active_connections.get(session_id)
+        if websocket is not None:
+            # Text frame: the browser client JSON.parse()s event.data as a string
+            await websocket.send_text(orjson.dumps(data).decode())
     
-    def add_message(self, session_id: str, role: str, content: str):
-        """Add message to session history."""
-        if session_id in self.user_sessions:
-            self.user_sessions[session_id]["messages"].append({
-                "role": role,
+    async def get_session_history(self, session_id: str) -> List[Dict]:
+        """
+        Get conversation history for session (last HISTORY_MAX_MESSAGES).
+        
+        Timestamps are stored as epoch seconds and returned as naive UTC
+        ISO-8601 strings, as before the compact encoding.
+        """
+        items = await redis_client.get_list(_history_key(session_id))
+        history = []
+        for item in items:
+            code, timestamp, content = orjson.loads(item)
+            history.append({
+                "role": _CODE_ROLES.get(code, code),
                 "content": content,
-                "timestamp": datetime.utcnow().isoformat(),
+                "timestamp": datetime.fromtimestamp(timestamp, timezone.utc)
+                .replace(tzinfo=None)
+                .isoformat(),
             })
+        return history
+    
+    async def add_message(self, session_id: str, role: str, content: str):
+        """Add message to session history."""
+        await redis_client.push_capped(
+            _history_key(session_id),
+            orjson.dumps(
+                [_ROLE_CODES.get(role, role), int(time.time()), content]
+            ).decode(),
+            max_length=HISTORY_MAX_MESSAGES,
+            expire=HISTORY_TTL,
+        )
+    
+    async def clear_history(self, session_id: str) -> bool:
+        """Clear session history; returns False if there was none."""
+        return await redis_client.delete(_history_key(session_id)) > 0
 
 
 manager = ConnectionManager()
 
 
+class _StreamCoalescer:
+    """
+    Merges consecutive agent stream chunks into fewer WebSocket frames.
+    
+    Plain {"type": "stream"} chunks are buffered for up to max_delay (or
+    max_chars); any other chunk flushes the buffer and is sent right away,
+    so message order is preserved.
+    """
+    
+    def __init__(
+        self,
+        session_id: str,
+        max_delay: float = STREAM_MAX_DELAY,
+        max_chars: int = STREAM_MAX_CHARS,
+    ):
+        self._session_id = session_id
+        self._max_delay = max_delay
+        self._max_chars = max_chars
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._task: Optional[asyncio.Task] = None
+    
+    async def __aenter__(self) -> "_StreamCoalescer":
+        self._task = asyncio.create_task(self._run())
+        return self
+    
+    async def __aexit__(self, *exc_info):
+        # Drain everything queued so far, then stop
+        self._queue.put_nowait(None)
+        await self._task
+    
+    def send(self, chunk: Dict[str, Any]):
+        """Queue a chunk for sending."""
+        self._queue.put_nowait(chunk)
+    
+    async def _flush(self, buffer: List[str]):
+        if buffer:
+            await manager.send_json(self._session_id, {
+                "type": "stream",
+                "content": "".join(buffer),
+            })
+            buffer.clear()
+    
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        buffer: List[str] = []
+        size = 0
+        deadline: Optional[float] = None
+        
+        while True:
+            timeout = None if deadline is None else max(0.0, deadline - loop.time())
+            try:
+                chunk = await asyncio.wait_for(self._queue.get(), timeout)
+            except asyncio.TimeoutError:
+                await self._flush(buffer)
+                size, deadline = 0, None
+                continue
+            
+            if chunk is None:
+                break
+            
+            if chunk.get("type") == "stream" and chunk.keys() <= _STREAM_KEYS:
+                if not buffer:
+                    deadline = loop.time() + self._max_delay
+                content = chunk.get("content", "")
+                buffer.append(content)
+                size += len(content)
+                if size >= self._max_chars:
+                    await self._flush(buffer)
+                    size, deadline = 0, None
+                continue
+            
+            await self._flush(buffer)
+            size, deadline = 0, None
+            await manager.send_json(self._session_id, chunk)
+        
+        await self._flush(buffer)
+
+
 @router.websocket("/chat")
 async def websocket_chat(
     websocket: WebSocket,
@@ -146,8 +263,8 @@ async def websocket_chat(
             data = await websocket.receive_text()
             
             try:
-                message = json.loads(data)
-            except json.JSONDecodeError:
+                message = orjson.loads(data)
+            except orjson.JSONDecodeError:
                 await manager.send_json(session_id, {
                     "type": "error",
                     "content": "Invalid JSON format. Please send valid JSON messages."
@@ -172,22 +289,23 @@ async def websocket_chat(
             
             if msg_type == "clear":
                 # Clear conversation history
-                if session_id in manager.user_sessions:
-                    manager.user_sessions[session_id]["messages"] = []
+                await manager.clear_history(session_id)
                 await manager.send_json(session_id, {
                     "type": "system",
                     "content": "Conversation cleared."
                 })
                 continue
             
-            # Process chat message with LangGraph
-            manager.add_message(session_id, "user", content)
+            # Process chat message with LangGraph; history is read before the
+            # new message is stored, so it already excludes it
+            history = await manager.get_session_history(session_id)
+            await manager.add_message(session_id, "user", content)
             
             await process_with_langgraph(
                 session_id=session_id,
                 user_id=user_id,
                 content=content,
-                history=manager.get_session_history(session_id),
+                history=history,
             )
             
     except WebSocketDisconnect:
@@ -209,37 +327,43 @@ async def process_with_langgraph(
     """
     Process user message with LangGraph agent and stream response.
     
-    This is the main integration point with the LangGraph agent.
+    This is the main integration point with the LangGraph agent. history
+    holds the prior turns, without the current message.
     """
     from src.langgraph import run_agent
     
     try:
         # Stream responses from agent
         full_response = []
+        has_chart = False
         
-        async for chunk in run_agent(
-            user_message=content,
-            user_id=user_id,
-            session_id=session_id,
-            conversation_history=history[:-1],  # Exclude current message
-        ):
-            chunk_type = chunk.get("type", "stream")
-            chunk_content = chunk.get("content", "")
-            
-            # Send chunk to client
-            await manager.send_json(session_id, chunk)
-            
-            # Collect response content
-            if chunk_type in ["stream", "complete"] and chunk_content:
-                full_response.append(chunk_content)
-            
-            # Check for chart data in content
-            if chunk_content and "```chart" in chunk_content:
-                await send_chart_data(session_id, chunk_content)
+        async with _StreamCoalescer(session_id) as stream:
+            async for chunk in run_agent(
+                user_message=content,
+                user_id=user_id,
+                session_id=session_id,
+                conversation_history=history,
+            ):
+                chunk_type = chunk.get("type", "stream")
+                chunk_content = chunk.get("content", "")
+                
+                # Send chunk to client (stream chunks are coalesced)
+                stream.send(chunk)
+                
+                # Collect response content
+                if chunk_type in ["stream", "complete"] and chunk_content:
+                    full_response.append(chunk_content)
+                
+                # Note chart blocks; they are extracted once the stream ends
+                if chunk_content and not has_chart and CHART_MARKER in chunk_content:
+                    has_chart = True
+        
+        if has_chart:
+            await send_chart_data(session_id, "".join(full_response))
         
         # Store assistant response in history
         if full_response:
-            manager.add_message(session_id, "assistant", "".join(full_response))
+            await manager.add_message(session_id, "assistant", "".join(full_response))
         
     except Exception as e:
         await manager.send_json(session_id, {
@@ -252,35 +376,31 @@ async def send_chart_data(session_id: str, content: str):
     """
     Extract and send chart data from response content.
     
-    Parses ```chart blocks and sends separate chart message.
+    Parses ```chart blocks and sends separate chart message. A block
+    repeated across chunks (e.g. streamed and then in the complete
+    message) is sent once.
     """
-    import re
-    
-    chart_pattern = r'```chart\n(.*?)\n```'
-    matches = re.findall(chart_pattern, content, re.DOTALL)
-    
-    for chart_json in matches:
+    for chart_json in dict.fromkeys(_CHART_RE.findall(content)):
         try:
-            chart_data = json.loads(chart_json)
-            await manager.send_json(session_id, {
-                "type": "chart",
-                "chart": chart_data,
-            })
-        except json.JSONDecodeError:
-            pass  # Skip invalid chart JSON
+            chart_data = orjson.loads(chart_json)
+        except orjson.JSONDecodeError:
+            continue  # Skip invalid chart JSON
+        await manager.send_json(session_id, {
+            "type": "chart",
+            "chart": chart_data,
+        })
 
 
 @router.get("/chat/history/{session_id}")
 async def get_chat_history(session_id: str):
     """Get chat history for a session."""
-    history = manager.get_session_history(session_id)
+    history = await manager.get_session_history(session_id)
     return {"session_id": session_id, "messages": history}
 
 
 @router.delete("/chat/history/{session_id}")
 async def clear_chat_history(session_id: str):
     """Clear chat history for a session."""
-    if session_id in manager.user_sessions:
-        manager.user_sessions[session_id]["messages"] = []
+    if await manager.clear_history(session_id):
         return {"message": "History cleared"}
     return {"message": "Session not found"}
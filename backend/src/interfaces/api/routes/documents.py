@@ -2,16 +2,46 @@
 Document Management Routes
 Upload, process, and query documents with LLM
 """
-from typing import Optional, List
+from typing import Callable, Optional, List
 from datetime import datetime
-from fastapi import APIRouter, HTTPException, UploadFile, File, Form, Query, Depends
+import logging
+import os
+import tempfile
+import httpx
+import orjson
+from cachetools import TTLCache
+from fastapi import APIRouter, HTTPException, UploadFile, File, Form, Query, Depends, Header
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
+from tenacity import retry, retry_if_exception, stop_after_attempt, wait_exponential_jitter
 
 from src.application.services.document_service import DocumentService
-from src.interfaces.api.dependencies import get_current_user
+from src.infrastructure.cache import query_cache
+from src.interfaces.api.dependencies import AuthedUser, get_current_user
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+MAX_UPLOAD_SIZE = 10 * 1024 * 1024  # 10MB
+UPLOAD_CHUNK_SIZE = 64 * 1024
+SNIFF_SIZE = 4096
+
+ANSWER_SYSTEM_PROMPT = "You are a helpful assistant that answers questions based on document content."
+
+# After an LLM failure, a user's queries get ANSWER_UNAVAILABLE without
+# calling the LLM for LLM_FAILURE_TTL seconds, so retries cannot pile up
+LLM_FAILURE_TTL = 5
+ANSWER_UNAVAILABLE = "Unable to generate an answer right now. Please try again shortly."
+_llm_failures: TTLCache = TTLCache(maxsize=10_000, ttl=LLM_FAILURE_TTL)
+
+
+def get_document_service(
+    current_user: AuthedUser = Depends(get_current_user),
+) -> DocumentService:
+    """DocumentService scoped to the authenticated user."""
+    return DocumentService(user_id=current_user.id)
+
 
 class DocumentResponse(BaseModel):
     """Document response model."""
@@ -59,7 +89,7 @@ class DocumentProcessResult(BaseModel):
 async def upload_document(
     file: UploadFile = File(...),
     description: Optional[str] = Form(None),
-    current_user: dict = Depends(get_current_user),
+    service: DocumentService = Depends(get_document_service),
 ):
     """
     Upload and process a document (PDF, DOCX, Excel, CSV, TXT).
@@ -79,8 +109,6 @@ async def upload_document(
     - CSV (.csv)
     - Text (.txt)
     """
-    service = DocumentService(user_id=current_user["id"])
-    
     # Validate file type
     if not service.is_supported(file.content_type):
         raise HTTPException(
@@ -89,42 +117,63 @@ async def upload_document(
                    f"Supported: PDF, DOCX, XLSX, XLS, CSV, TXT"
         )
     
-    # Read file content
-    file_content = await file.read()
-    
-    if len(file_content) == 0:
+    # Sniff the first bytes so content that does not match the declared
+    # type is rejected before anything is written or parsed
+    head = await file.read(SNIFF_SIZE)
+    if not head:
         raise HTTPException(status_code=400, detail="Empty file")
+    if not service.has_valid_signature(file.content_type, head):
+        raise HTTPException(
+            status_code=400,
+            detail=f"File content does not match type {file.content_type}"
+        )
     
-    if len(file_content) > 10 * 1024 * 1024:  # 10MB limit
-        raise HTTPException(status_code=400, detail="File too large (max 10MB)")
+    # Stream the upload to a temp file in chunks, so memory use stays flat
+    # and oversized files are rejected as soon as they pass the limit
+    suffix = service.SUPPORTED_TYPES[file.content_type]
+    tmp = tempfile.NamedTemporaryFile(suffix=suffix, delete=False)
     
     try:
+        size = 0
+        with tmp:
+            chunk = head
+            while chunk:
+                size += len(chunk)
+                if size > MAX_UPLOAD_SIZE:
+                    raise HTTPException(status_code=400, detail="File too large (max 10MB)")
+                tmp.write(chunk)
+                chunk = await file.read(UPLOAD_CHUNK_SIZE)
+        
         # Process document
         result = await service.process_document(
-            file_content=file_content,
+            file_path=tmp.name,
             filename=file.filename or "unknown",
             content_type=file.content_type,
             description=description,
         )
+        query_cache.invalidate_user(service.user_id)
         
         return DocumentProcessResult(**result)
         
+    except HTTPException:
+        raise
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Processing failed: {str(e)}")
+    finally:
+        os.unlink(tmp.name)
 
 
 @router.get("", response_model=DocumentListResponse)
 async def list_documents(
     skip: int = Query(0, ge=0),
     limit: int = Query(20, ge=1, le=100),
-    current_user: dict = Depends(get_current_user),
+    service: DocumentService = Depends(get_document_service),
 ):
     """
     List all documents for the current user.
     """
-    service = DocumentService(user_id=current_user["id"])
     documents = await service.list_documents(skip=skip, limit=limit)
     
     return DocumentListResponse(
@@ -136,12 +185,11 @@ async def list_documents(
 @router.get("/{document_id}", response_model=DocumentResponse)
 async def get_document(
     document_id: str,
-    current_user: dict = Depends(get_current_user),
+    service: DocumentService = Depends(get_document_service),
 ):
     """
     Get document details by ID.
     """
-    service = DocumentService(user_id=current_user["id"])
     document = await service.get_document(document_id)
     
     if not document:
@@ -153,17 +201,17 @@ async def get_document(
 @router.delete("/{document_id}")
 async def delete_document(
     document_id: str,
-    current_user: dict = Depends(get_current_user),
+    service: DocumentService = Depends(get_document_service),
 ):
     """
     Delete a document and its embeddings.
     """
-    service = DocumentService(user_id=current_user["id"])
     deleted = await service.delete_document(document_id)
     
     if not deleted:
         raise HTTPException(status_code=404, detail="Document not found")
     
+    query_cache.invalidate_user(service.user_id)
     return {"message": "Document deleted successfully"}
 
 
@@ -171,35 +219,40 @@ async def delete_document(
 async def query_document(
     document_id: str,
     request: DocumentQueryRequest,
-    current_user: dict = Depends(get_current_user),
+    service: DocumentService = Depends(get_document_service),
+    accept: Optional[str] = Header(None),
 ):
     """
     Query a document using natural language.
     Uses vector search + LLM to answer questions.
-    """
-    from src.infrastructure.llm import get_llm
+    Answers are cached briefly per user, document, query and top_k.
     
-    service = DocumentService(user_id=current_user["id"])
+    With "Accept: text/event-stream" the answer is streamed as server-sent
+    events: {"token": ...} per token, then {"sources": [...]}.
+    """
+    stream = _wants_stream(accept)
+    cache_key = query_cache.key(service.user_id, document_id, request.query, request.top_k)
+    cached = query_cache.get(cache_key)
+    if cached is not None:
+        return _respond(cached, stream)
     
     # Verify document exists
     document = await service.get_document(document_id)
     if not document:
         raise HTTPException(status_code=404, detail="Document not found")
     
-    # Search for relevant chunks
+    # Search for relevant chunks (filtered to this document by Qdrant)
     results = await service.search_documents(
         query=request.query,
         top_k=request.top_k,
+        document_id=document_id,
     )
     
-    # Filter by document_id
-    results = [r for r in results if r.get("payload", {}).get("document_id") == document_id]
-    
     if not results:
-        return DocumentQueryResponse(
+        return _respond(DocumentQueryResponse(
             answer=f"No relevant information found in {document['filename']}.",
             sources=[]
-        )
+        ), stream)
     
     # Build context from results
     context = "\n\n".join([
@@ -208,8 +261,6 @@ async def query_document(
     ])
     
     # Use LLM to generate answer
-    llm = await get_llm()
-    
     prompt = f"""Based on the following excerpts from the document "{document['filename']}", answer the question.
 
 Document excerpts:
@@ -219,53 +270,58 @@ Question: {request.query}
 
 Provide a clear, concise answer based only on the information in the document."""
     
-    try:
-        response = await llm.chat([
-            {"role": "system", "content": "You are a helpful assistant that answers questions based on document content."},
-            {"role": "user", "content": prompt}
-        ])
-        
-        answer = response.get("content", "Unable to generate answer.")
-        
-    except Exception as e:
-        answer = f"Error generating answer: {str(e)}"
-    
-    return DocumentQueryResponse(
-        answer=answer,
-        sources=[
-            {
-                "text": r["payload"]["text"][:200] + "...",
-                "score": r.get("score", 0),
-                "chunk_index": r["payload"]["chunk_index"],
-            }
-            for r in results
-        ]
-    )
+    sources = [
+        {
+            "text": payload["text"][:200] + "...",
+            "score": r["score"],
+            "chunk_index": payload["chunk_index"],
+        }
+        for r in results
+        for payload in (r["payload"],)
+    ]
+    
+    def on_answer(result: DocumentQueryResponse):
+        query_cache.set(cache_key, result)
+    
+    return await _answer_query(service.user_id, prompt, sources, stream, on_answer)
 
 
 @router.post("/query-all", response_model=DocumentQueryResponse)
 async def query_all_documents(
     request: DocumentQueryRequest,
-    current_user: dict = Depends(get_current_user),
+    service: DocumentService = Depends(get_document_service),
+    accept: Optional[str] = Header(None),
 ):
     """
     Query across all user documents.
+    
+    Answers are cached briefly, both by exact query and by near-identical
+    query embedding. Streams server-sent events like query_document when
+    the client accepts text/event-stream.
     """
-    from src.infrastructure.llm import get_llm
+    stream = _wants_stream(accept)
+    cache_key = query_cache.key(service.user_id, None, request.query, request.top_k)
+    cached = query_cache.get(cache_key)
+    if cached is not None:
+        return _respond(cached, stream)
     
-    service = DocumentService(user_id=current_user["id"])
+    query_vector = await service.embed_query(request.query)
+    cached = query_cache.get_similar(service.user_id, None, request.top_k, query_vector)
+    if cached is not None:
+        return _respond(cached, stream)
     
     # Search all user documents
     results = await service.search_documents(
         query=request.query,
         top_k=request.top_k,
+        query_vector=query_vector,
     )
     
     if not results:
-        return DocumentQueryResponse(
+        return _respond(DocumentQueryResponse(
             answer="No relevant information found in your documents.",
             sources=[]
-        )
+        ), stream)
     
     # Build context from results
     context = "\n\n".join([
@@ -274,8 +330,6 @@ async def query_all_documents(
     ])
     
     # Use LLM to generate answer
-    llm = await get_llm()
-    
     prompt = f"""Based on the following excerpts from the user's documents, answer the question.
 
 Document excerpts:
@@ -285,25 +339,116 @@ Question: {request.query}
 
 Provide a clear, concise answer based on the information in the documents."""
     
-    try:
-        response = await llm.chat([
-            {"role": "system", "content": "You are a helpful assistant that answers questions based on document content."},
-            {"role": "user", "content": prompt}
-        ])
+    sources = [
+        {
+            "filename": payload["filename"],
+            "text": payload["text"][:200] + "...",
+            "score": r["score"],
+        }
+        for r in results
+        for payload in (r["payload"],)
+    ]
+    
+    def on_answer(result: DocumentQueryResponse):
+        query_cache.set(cache_key, result)
+        query_cache.add_similar(service.user_id, None, request.top_k, query_vector, result)
+    
+    return await _answer_query(service.user_id, prompt, sources, stream, on_answer)
+
+
+def _wants_stream(accept: Optional[str]) -> bool:
+    """Whether the client asked for server-sent events."""
+    return bool(accept) and "text/event-stream" in accept
+
+
+def _sse_event(data: dict) -> bytes:
+    """Encode one server-sent event."""
+    return b"data: " + orjson.dumps(data) + b"\n\n"
+
+
+def _respond(result: DocumentQueryResponse, stream: bool):
+    """Return a finished answer as JSON, or as token + sources events."""
+    if not stream:
+        return result
+    
+    async def events():
+        yield _sse_event({"token": result.answer})
+        yield _sse_event({"sources": result.sources})
+    
+    return StreamingResponse(events(), media_type="text/event-stream")
+
+
+def _is_transient(error: BaseException) -> bool:
+    """Timeouts, connection errors, 429 and 5xx responses are worth retrying."""
+    if isinstance(error, httpx.HTTPStatusError):
+        status = error.response.status_code
+        return status == 429 or status >= 500
+    return isinstance(error, (httpx.TimeoutException, httpx.TransportError))
+
+
+@retry(
+    stop=stop_after_attempt(2),
+    wait=wait_exponential_jitter(initial=0.2, max=1.0),
+    retry=retry_if_exception(_is_transient),
+    reraise=True,
+)
+async def _chat_with_retry(llm, messages: List[dict]) -> str:
+    """llm.chat with one retry on transient errors."""
+    return await llm.chat(messages)
+
+
+async def _answer_query(
+    user_id: str,
+    prompt: str,
+    sources: List[dict],
+    stream: bool,
+    on_answer: Callable[[DocumentQueryResponse], None],
+):
+    """
+    Generate the LLM answer for a document query.
+    
+    Returns a DocumentQueryResponse, or a StreamingResponse of server-sent
+    events when stream is set. on_answer receives each successful answer.
+    LLM errors are logged and answered with ANSWER_UNAVAILABLE.
+    """
+    from src.infrastructure.llm import get_llm
+    
+    if user_id in _llm_failures:
+        return _respond(DocumentQueryResponse(answer=ANSWER_UNAVAILABLE, sources=sources), stream)
+    
+    llm = await get_llm()
+    messages = [
+        {"role": "system", "content": ANSWER_SYSTEM_PROMPT},
+        {"role": "user", "content": prompt},
+    ]
+    
+    if not stream:
+        try:
+            answer = await _chat_with_retry(llm, messages) or "Unable to generate answer."
+        except Exception:
+            logger.exception("Document query answer failed")
+            _llm_failures[user_id] = True
+            return DocumentQueryResponse(answer=ANSWER_UNAVAILABLE, sources=sources)
         
-        answer = response.get("content", "Unable to generate answer.")
+        result = DocumentQueryResponse(answer=answer, sources=sources)
+        on_answer(result)
+        return result
+    
+    async def events():
+        # Tokens are kept only to cache the finished answer
+        tokens = []
+        try:
+            async for token in llm.chat_stream(messages):
+                tokens.append(token)
+                yield _sse_event({"token": token})
+        except Exception:
+            logger.exception("Document query answer stream failed")
+            _llm_failures[user_id] = True
+            yield _sse_event({"error": ANSWER_UNAVAILABLE})
+            return
         
-    except Exception as e:
-        answer = f"Error generating answer: {str(e)}"
-    
-    return DocumentQueryResponse(
-        answer=answer,
-        sources=[
-            {
-                "filename": r["payload"]["filename"],
-                "text": r["payload"]["text"][:200] + "...",
-                "score": r.get("score", 0),
-            }
-            for r in results
-        ]
-    )
+        yield _sse_event({"sources": sources})
+        if tokens:
+            on_answer(DocumentQueryResponse(answer="".join(tokens), sources=sources))
+    
+    return StreamingResponse(events(), media_type="text/event-stream")
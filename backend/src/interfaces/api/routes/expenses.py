@@ -2,24 +2,38 @@
 Expense Management Routes
 CRUD operations for expenses, subscriptions, bills, goals, income
 """
-from typing import Optional, List
+from typing import Annotated, List, Literal, Optional
 from datetime import datetime, date
 from decimal import Decimal
 from fastapi import APIRouter, HTTPException, Query, Depends
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field, StringConstraints
 from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 # Import authentication dependency
-from .auth import get_current_user
+from src.application.services.balance_service import BalanceService
+from src.infrastructure.database.postgres import get_db
+from src.interfaces.api.dependencies import AuthedUser, get_current_user
+from src.interfaces.api.responses import ORJSONResponse
 
 router = APIRouter()
 
+# Request and response models are immutable, and unknown fields are dropped
+# rather than rejected. Amounts and dates keep pydantic's built-in validators.
+_MODEL_CONFIG = ConfigDict(frozen=True, extra="ignore")
+
+# ISO 4217 style code, upper-cased on input ("usd" -> "USD")
+CurrencyCode = Annotated[str, StringConstraints(min_length=3, max_length=3, to_upper=True)]
+BillingCycle = Literal["daily", "weekly", "monthly", "yearly"]
+
 
 # ============== Expense Models ==============
 class ExpenseCreate(BaseModel):
     """Create expense request."""
+    model_config = _MODEL_CONFIG
+    
     amount: Decimal = Field(..., gt=0)
-    currency: str = Field(default="USD", max_length=3)
+    currency: CurrencyCode = "USD"
     category: str
     merchant: str
     description: Optional[str] = None
@@ -28,6 +42,8 @@ class ExpenseCreate(BaseModel):
 
 class ExpenseResponse(BaseModel):
     """Expense response model."""
+    model_config = _MODEL_CONFIG
+    
     id: str
     amount: Decimal
     currency: str
@@ -40,6 +56,8 @@ class ExpenseResponse(BaseModel):
 
 class ExpenseListResponse(BaseModel):
     """List of expenses response."""
+    model_config = _MODEL_CONFIG
+    
     expenses: List[ExpenseResponse]
     total: int
     total_amount: Decimal
@@ -48,24 +66,25 @@ class ExpenseListResponse(BaseModel):
 # ============== Subscription Models ==============
 class SubscriptionCreate(BaseModel):
     """Create subscription request."""
+    model_config = _MODEL_CONFIG
+    
     name: str
     amount: Decimal = Field(..., gt=0)
-    currency: str = Field(default="USD", max_length=3)
-    billing_cycle: str = Field(
-        ...,
-        pattern="^(daily|weekly|monthly|yearly)$"
-    )
+    currency: CurrencyCode = "USD"
+    billing_cycle: BillingCycle
     next_billing_date: date
     category: Optional[str] = None
 
 
 class SubscriptionResponse(BaseModel):
     """Subscription response model."""
+    model_config = _MODEL_CONFIG
+    
     id: str
     name: str
     amount: Decimal
     currency: str
-    billing_cycle: str
+    billing_cycle: BillingCycle
     next_billing_date: date
     category: Optional[str]
     is_active: bool
@@ -75,9 +94,11 @@ class SubscriptionResponse(BaseModel):
 # ============== Bill Models ==============
 class BillCreate(BaseModel):
     """Create bill request."""
+    model_config = _MODEL_CONFIG
+    
     name: str
     amount: Decimal = Field(..., gt=0)
-    currency: str = Field(default="USD", max_length=3)
+    currency: CurrencyCode = "USD"
     due_date: date
     is_recurring: bool = False
     recurrence_pattern: Optional[str] = None
@@ -85,6 +106,8 @@ class BillCreate(BaseModel):
 
 class BillResponse(BaseModel):
     """Bill response model."""
+    model_config = _MODEL_CONFIG
+    
     id: str
     name: str
     amount: Decimal
@@ -98,8 +121,10 @@ class BillResponse(BaseModel):
 # ============== Income Models ==============
 class IncomeCreate(BaseModel):
     """Create income request."""
+    model_config = _MODEL_CONFIG
+    
     amount: Decimal = Field(..., gt=0)
-    currency: str = Field(default="USD", max_length=3)
+    currency: CurrencyCode = "USD"
     source: str
     category: Optional[str] = None
     description: Optional[str] = None
@@ -108,6 +133,8 @@ class IncomeCreate(BaseModel):
 
 class IncomeResponse(BaseModel):
     """Income response model."""
+    model_config = _MODEL_CONFIG
+    
     id: str
     amount: Decimal
     currency: str
@@ -121,15 +148,19 @@ class IncomeResponse(BaseModel):
 # ============== Goal Models ==============
 class GoalCreate(BaseModel):
     """Create financial goal request."""
+    model_config = _MODEL_CONFIG
+    
     name: str
     target_amount: Decimal = Field(..., gt=0)
-    currency: str = Field(default="USD", max_length=3)
+    currency: CurrencyCode = "USD"
     deadline: date
     category: Optional[str] = None
 
 
 class GoalResponse(BaseModel):
     """Goal response model."""
+    model_config = _MODEL_CONFIG
+    
     id: str
     name: str
     target_amount: Decimal
@@ -160,55 +191,51 @@ async def create_expense(expense: ExpenseCreate):
 
 @router.get("")
 async def list_expenses(
-    current_user: dict = Depends(get_current_user),
+    current_user: AuthedUser = Depends(get_current_user),
     start_date: Optional[date] = None,
     end_date: Optional[date] = None,
     category: Optional[str] = None,
     skip: int = Query(0, ge=0),
-    limit: int = Query(50, ge=1, le=100)
+    limit: int = Query(50, ge=1, le=100),
+    session: AsyncSession = Depends(get_db),
 ):
     """List expenses with optional filters."""
-    from src.infrastructure.database.postgres import async_session_factory
     from src.domain.models import Expense
     
-    async with async_session_factory() as session:
-        user_id = current_user["id"]
-        query = select(Expense).where(Expense.user_id == user_id)
-        
-        if start_date:
-            query = query.where(Expense.expense_date >= start_date)
-        if end_date:
-            query = query.where(Expense.expense_date <= end_date)
-        if category:
-            query = query.where(Expense.category == category)
-        
-        query = query.offset(skip).limit(limit).order_by(Expense.expense_date.desc())
-        
-        result = await session.execute(query)
-        expenses = result.scalars().all()
-        
-        return [
-            {
-                "id": exp.id,
-                "amount": float(exp.amount),
-                "currency": exp.currency,
-                "merchant": exp.merchant,
-                "category": exp.category,
-                "description": exp.description,
-                "expense_date": exp.expense_date.isoformat(),
-                "created_at": exp.created_at.isoformat() if exp.created_at else None
-            }
-            for exp in expenses
-        ]
+    query = select(Expense).where(Expense.user_id == current_user.id)
+    
+    if start_date:
+        query = query.where(Expense.expense_date >= start_date)
+    if end_date:
+        query = query.where(Expense.expense_date <= end_date)
+    if category:
+        query = query.where(Expense.category == category)
+    
+    query = query.offset(skip).limit(limit).order_by(Expense.expense_date.desc())
+    
+    result = await session.execute(query)
+    expenses = result.scalars().all()
+    
+    return ORJSONResponse([
+        {
+            "id": exp.id,
+            "amount": float(exp.amount),
+            "currency": exp.currency,
+            "merchant": exp.merchant,
+            "category": exp.category,
+            "description": exp.description,
+            "expense_date": exp.expense_date,
+            "created_at": exp.created_at,
+        }
+        for exp in expenses
+    ])
 
 
 @router.get("/balance")
-async def get_balance(current_user: dict = Depends(get_current_user)):
+async def get_balance(current_user: AuthedUser = Depends(get_current_user)):
     """Get current account balance using centralized BalanceService."""
-    from src.application.services.balance_service import BalanceService
-    
     try:
-        user_id = current_user["id"]
+        user_id = current_user.id
         
         # Use centralized balance service (with caching)
         result = await BalanceService.get_balance(user_id)
@@ -236,83 +263,78 @@ async def get_balance(current_user: dict = Depends(get_current_user)):
 @router.post("/income", response_model=IncomeResponse)
 async def create_income(
     income: IncomeCreate,
-    current_user: dict = Depends(get_current_user)
+    current_user: AuthedUser = Depends(get_current_user),
+    session: AsyncSession = Depends(get_db),
 ):
     """Create a new income record."""
-    from src.infrastructure.database.postgres import async_session_factory
     from src.domain.models import Income
     import uuid
     
-    async with async_session_factory() as session:
-        user_id = current_user["id"]
-        
-        income_record = Income(
-            id=str(uuid.uuid4()),
-            user_id=user_id,
-            amount=income.amount,
-            currency=income.currency,
-            source=income.source,
-            category=income.category,
-            description=income.description,
-            income_date=income.income_date,
-            created_at=datetime.utcnow()
-        )
-        
-        session.add(income_record)
-        await session.commit()
-        await session.refresh(income_record)
-        
-        return IncomeResponse(
-            id=income_record.id,
-            amount=income_record.amount,
-            currency=income_record.currency,
-            source=income_record.source,
-            category=income_record.category,
-            description=income_record.description,
-            income_date=income_record.income_date,
-            created_at=income_record.created_at
-        )
+    income_record = Income(
+        id=str(uuid.uuid4()),
+        user_id=current_user.id,
+        amount=income.amount,
+        currency=income.currency,
+        source=income.source,
+        category=income.category,
+        description=income.description,
+        income_date=income.income_date
+    )
+    
+    session.add(income_record)
+    await session.commit()
+    await session.refresh(income_record)
+    await BalanceService.invalidate_cache(current_user.id)
+    
+    return IncomeResponse(
+        id=income_record.id,
+        amount=income_record.amount,
+        currency=income_record.currency,
+        source=income_record.source,
+        category=income_record.category,
+        description=income_record.description,
+        income_date=income_record.income_date,
+        created_at=income_record.created_at
+    )
 
 
 @router.get("/income")
 async def list_income(
-    current_user: dict = Depends(get_current_user),
+    current_user: AuthedUser = Depends(get_current_user),
     start_date: Optional[date] = None,
     end_date: Optional[date] = None,
     skip: int = Query(0, ge=0),
-    limit: int = Query(50, ge=1, le=100)
+    limit: int = Query(50, ge=1, le=100),
+    session: AsyncSession = Depends(get_db),
 ):
     """List income records with optional filters."""
-    from src.infrastructure.database.postgres import async_session_factory
     from src.domain.models import Income
     
-    async with async_session_factory() as session:
-        user_id = current_user["id"]
-        query = select(Income).where(Income.user_id == user_id)
-        
-        if start_date:
-            query = query.where(Income.income_date >= start_date)
-        if end_date:
-            query = query.where(Income.income_date <= end_date)
-        
-        query = query.offset(skip).limit(limit).order_by(Income.income_date.desc())
-        
-        result = await session.execute(query)
-        income_records = result.scalars().all()
-        
-        return [
-            {
-                "id": record.id,
-                "amount": float(record.amount),
-                "currency": record.currency,
-                "source": record.source,
-                "category": record.category,
-                "description": record.description,
-                "income_date": record.income_date.isoformat(),
-                "created_at": record.created_at.isoformat() if record.created_at else None
-            }
-            for record in income_records
-        ]
+    query = select(Income).where(Income.user_id == current_user.id)
+    
+    if start_date:
+        query = query.where(Income.income_date >= start_date)
+    if end_date:
+        query = query.where(Income.income_date <= end_date)
+    
+    query = query.offset(skip).limit(limit).order_by(Income.income_date.desc())
+    
+    result = await session.execute(query)
+    income_records = result.scalars().all()
+    
+    return ORJSONResponse([
+        {
+            "id": record.id,
+            "amount": float(record.amount),
+            "currency": record.currency,
+            "source": record.source,
+            "category": record.category,
+            "description": record.description,
+            "income_date": record.income_date,
+            "created_at": record.created_at,
+        }
+        for record in income_records
+    ])
 
 
 # ============== Subscription Endpoints (MUST BE BEFORE /{expense_id}) ==============
@@ -333,7 +355,7 @@ async def create_subscription(subscription: SubscriptionCreate):
 
 
 @router.get("/subscriptions")
-async def list_subscriptions(current_user: dict = Depends(get_current_user)):
+async def list_subscriptions(current_user: AuthedUser = Depends(get_current_user)):
     """List all subscriptions."""
     # TODO: Query PostgreSQL - for now return empty array
     return []
@@ -357,7 +379,7 @@ async def create_bill(bill: BillCreate):
 
 @router.get("/bills")
 async def list_bills(
-    current_user: dict = Depends(get_current_user),
+    current_user: AuthedUser = Depends(get_current_user),
     include_paid: bool = False,
     upcoming_days: Optional[int] = Query(None, ge=1)
 ):
@@ -390,7 +412,7 @@ async def create_goal(goal: GoalCreate):
 
 
 @router.get("/goals")
-async def list_goals(current_user: dict = Depends(get_current_user)):
+async def list_goals(current_user: AuthedUser = Depends(get_current_user)):
     """List all financial goals."""
     # TODO: Query PostgreSQL - for now return empty array
     return []
@@ -424,18 +446,18 @@ async def delete_expense(expense_id: str):
 # ============== Analytics Endpoints ==============
 @router.get("/analytics/summary")
 async def get_spending_summary(
+    current_user: AuthedUser = Depends(get_current_user),
     start_date: Optional[date] = None,
     end_date: Optional[date] = None
 ):
     """Get spending summary with totals and breakdowns."""
-    return {
-        "total_spent": Decimal("0"),
-        "total_income": Decimal("0"),
-        "net": Decimal("0"),
-        "by_category": {},
-        "by_merchant": {},
-        "trends": []
-    }
+    from src.application.services.analytics_service import AnalyticsService
+    
+    return ORJSONResponse(await AnalyticsService.get_spending_summary(
+        current_user.id,
+        start_date=start_date,
+        end_date=end_date,
+    ))
 
 
 @router.get("/analytics/forecast")
@@ -7,7 +7,7 @@ from fastapi import APIRouter, HTTPException, Depends, Query
 from pydantic import BaseModel, EmailStr
 
 from src.application.services.gmail_service import GmailService
-from src.interfaces.api.dependencies import get_current_user
+from src.interfaces.api.dependencies import AuthedUser, get_current_user
 
 router = APIRouter()
 
@@ -63,22 +63,22 @@ class SendEmailResponse(BaseModel):
 
 @router.get("/status")
 async def get_gmail_status(
-    current_user: dict = Depends(get_current_user),
+    current_user: AuthedUser = Depends(get_current_user),
 ):
     """Check if Gmail is connected for the user."""
-    service = GmailService(user_id=current_user["id"])
+    service = GmailService(user_id=current_user.id)
     is_connected = await service.is_connected()
     
     return {
         "connected": is_connected,
-        "user_id": current_user["id"],
+        "user_id": current_user.id,
     }
 
 
 @router.post("/search")
 async def search_emails(
     request: EmailSearchRequest,
-    current_user: dict = Depends(get_current_user),
+    current_user: AuthedUser = Depends(get_current_user),
 ):
     """
     Search Gmail inbox.
@@ -89,7 +89,7 @@ async def search_emails(
     - "after:2024/01/01"
     - "is:unread"
     """
-    service = GmailService(user_id=current_user["id"])
+    service = GmailService(user_id=current_user.id)
     
     if not await service.is_connected():
         raise HTTPException(
@@ -124,10 +124,10 @@ async def search_emails(
 @router.get("/recent")
 async def get_recent_emails(
     max_results: int = Query(10, ge=1, le=50),
-    current_user: dict = Depends(get_current_user),
+    current_user: AuthedUser = Depends(get_current_user),
 ):
     """Get most recent emails."""
-    service = GmailService(user_id=current_user["id"])
+    service = GmailService(user_id=current_user.id)
     
     if not await service.is_connected():
         raise HTTPException(status_code=400, detail="Gmail not connected")
@@ -156,10 +156,10 @@ async def get_recent_emails(
 @router.get("/unread")
 async def get_unread_emails(
     max_results: int = Query(10, ge=1, le=50),
-    current_user: dict = Depends(get_current_user),
+    current_user: AuthedUser = Depends(get_current_user),
 ):
     """Get unread emails."""
-    service = GmailService(user_id=current_user["id"])
+    service = GmailService(user_id=current_user.id)
     
     if not await service.is_connected():
         raise HTTPException(status_code=400, detail="Gmail not connected")
@@ -188,10 +188,10 @@ async def get_unread_emails(
 @router.get("/{message_id}")
 async def get_email(
     message_id: str,
-    current_user: dict = Depends(get_current_user),
+    current_user: AuthedUser = Depends(get_current_user),
 ):
     """Get full email details."""
-    service = GmailService(user_id=current_user["id"])
+    service = GmailService(user_id=current_user.id)
     
     if not await service.is_connected():
         raise HTTPException(status_code=400, detail="Gmail not connected")
@@ -219,10 +219,10 @@ async def get_email(
 @router.post("/send")
 async def send_email(
     request: SendEmailRequest,
-    current_user: dict = Depends(get_current_user),
+    current_user: AuthedUser = Depends(get_current_user),
 ):
     """Send an email via Gmail."""
-    service = GmailService(user_id=current_user["id"])
+    service = GmailService(user_id=current_user.id)
     
     if not await service.is_connected():
         raise HTTPException(status_code=400, detail="Gmail not connected")
@@ -247,10 +247,10 @@ async def send_email(
 async def reply_to_email(
     message_id: str,
     request: ReplyEmailRequest,
-    current_user: dict = Depends(get_current_user),
+    current_user: AuthedUser = Depends(get_current_user),
 ):
     """Reply to an email."""
-    service = GmailService(user_id=current_user["id"])
+    service = GmailService(user_id=current_user.id)
     
     if not await service.is_connected():
         raise HTTPException(status_code=400, detail="Gmail not connected")
@@ -276,10 +276,10 @@ async def reply_to_email(
 @router.post("/{message_id}/read")
 async def mark_as_read(
     message_id: str,
-    current_user: dict = Depends(get_current_user),
+    current_user: AuthedUser = Depends(get_current_user),
 ):
     """Mark email as read."""
-    service = GmailService(user_id=current_user["id"])
+    service = GmailService(user_id=current_user.id)
     
     if not await service.is_connected():
         raise HTTPException(status_code=400, detail="Gmail not connected")
@@ -295,10 +295,10 @@ async def mark_as_read(
 @router.post("/{message_id}/unread")
 async def mark_as_unread(
     message_id: str,
-    current_user: dict = Depends(get_current_user),
+    current_user: AuthedUser = Depends(get_current_user),
 ):
     """Mark email as unread."""
-    service = GmailService(user_id=current_user["id"])
+    service = GmailService(user_id=current_user.id)
     
     if not await service.is_connected():
         raise HTTPException(status_code=400, detail="Gmail not connected")
@@ -314,10 +314,10 @@ async def mark_as_unread(
 @router.post("/{message_id}/archive")
 async def archive_email(
     message_id: str,
-    current_user: dict = Depends(get_current_user),
+    current_user: AuthedUser = Depends(get_current_user),
 ):
     """Archive email (remove from inbox)."""
-    service = GmailService(user_id=current_user["id"])
+    service = GmailService(user_id=current_user.id)
     
     if not await service.is_connected():
         raise HTTPException(status_code=400, detail="Gmail not connected")
@@ -333,10 +333,10 @@ async def archive_email(
 @router.delete("/{message_id}")
 async def delete_email(
     message_id: str,
-    current_user: dict = Depends(get_current_user),
+    current_user: AuthedUser = Depends(get_current_user),
 ):
     """Delete email (move to trash)."""
-    service = GmailService(user_id=current_user["id"])
+    service = GmailService(user_id=current_user.id)
     
     if not await service.is_connected():
         raise HTTPException(status_code=400, detail="Gmail not connected")
@@ -352,10 +352,10 @@ async def delete_email(
 @router.post("/{message_id}/star")
 async def star_email(
     message_id: str,
-    current_user: dict = Depends(get_current_user),
+    current_user: AuthedUser = Depends(get_current_user),
 ):
     """Star an email."""
-    service = GmailService(user_id=current_user["id"])
+    service = GmailService(user_id=current_user.id)
     
     if not await service.is_connected():
         raise HTTPException(status_code=400, detail="Gmail not connected")
@@ -371,10 +371,10 @@ async def star_email(
 @router.delete("/{message_id}/star")
 async def unstar_email(
     message_id: str,
-    current_user: dict = Depends(get_current_user),
+    current_user: AuthedUser = Depends(get_current_user),
 ):
     """Remove star from email."""
-    service = GmailService(user_id=current_user["id"])
+    service = GmailService(user_id=current_user.id)
     
     if not await service.is_connected():
         raise HTTPException(status_code=400, detail="Gmail not connected")
@@ -390,10 +390,10 @@ async def unstar_email(
 @router.get("/banking/emails")
 async def get_banking_emails(
     days: int = Query(30, ge=1, le=365),
-    current_user: dict = Depends(get_current_user),
+    current_user: AuthedUser = Depends(get_current_user),
 ):
     """Get banking and financial emails."""
-    service = GmailService(user_id=current_user["id"])
+    service = GmailService(user_id=current_user.id)
     
     if not await service.is_connected():
         raise HTTPException(status_code=400, detail="Gmail not connected")
@@ -413,10 +413,10 @@ async def get_banking_emails(
 
 @router.get("/banking/insights")
 async def get_banking_insights(
-    current_user: dict = Depends(get_current_user),
+    current_user: AuthedUser = Depends(get_current_user),
 ):
     """Get transaction insights from banking emails."""
-    service = GmailService(user_id=current_user["id"])
+    service = GmailService(user_id=current_user.id)
     
     if not await service.is_connected():
         raise HTTPException(status_code=400, detail="Gmail not connected")
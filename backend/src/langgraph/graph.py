@@ -4,6 +4,7 @@ Complete agent with LLM tool calling, database operations, and streaming
 """
 from typing import Dict, Any, AsyncIterator, Literal, List, Sequence
 from datetime import datetime
+from functools import lru_cache
 import json
 import uuid
 
@@ -154,6 +155,27 @@ def get_all_tools() -> List[BaseTool]:
     ]
 
 
+@lru_cache(maxsize=1)
+def get_tool_schemas() -> List[Dict[str, Any]]:
+    """
+    Get tool-calling schemas for all tools.
+    
+    The tool set is static, so the schemas (and the pydantic JSON-schema
+    generation behind them) are built once and the same list is reused.
+    """
+    return [
+        {
+            "type": "function",
+            "function": {
+                "name": tool.name,
+                "description": tool.description,
+                "parameters": tool.args_schema.schema() if hasattr(tool, 'args_schema') and tool.args_schema else {},
+            }
+        }
+        for tool in get_all_tools()
+    ]
+
+
 def create_agent_graph():
     """
     Create the LangGraph agent graph for MoneyMind.
@@ -230,18 +252,7 @@ async def agent_node(state: AgentState) -> Dict[str, Any]:
         llm = await get_llm()
         
         # Get available tools for tool calling
-        tools = get_all_tools()
-        tool_schemas = [
-            {
-                "type": "function",
-                "function": {
-                    "name": tool.name,
-                    "description": tool.description,
-                    "parameters": tool.args_schema.schema() if hasattr(tool, 'args_schema') and tool.args_schema else {},
-                }
-            }
-            for tool in tools
-        ]
+        tool_schemas = get_tool_schemas()
         
         # Call LLM with tool definitions
         response = await llm.chat_with_tools(